@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import HostelMonthlyStats
+
+
+@admin.register(HostelMonthlyStats)
+class HostelMonthlyStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'hostel', 'year', 'month', 'total_beds', 'occupied_beds', 'occupancy_rate',
+        'revenue', 'revenue_per_bed', 'utility_cost', 'utility_cost_per_occupied_bed', 'refreshed_at',
+    )
+    list_filter = ('year', 'month', 'hostel')
+    search_fields = ('hostel__name',)
+
+    def has_add_permission(self, request):
+        """Rows are only written by the refresh_analytics command"""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('hostel')
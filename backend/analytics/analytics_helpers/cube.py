@@ -0,0 +1,217 @@
+from decimal import Decimal
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.signals import post_delete, pre_save
+from django.utils import timezone
+from finance.models import HostelRevenue, UtilityExpense
+from hostel.models import Bed, OccupancyInterval
+from hostel.hostel_helpers.timeline import intervals_overlapping, month_bounds, monthly_occupancy
+from analytics.models import HostelMonthlyStats, StaleMonth
+
+STAT_FIELDS = [
+    'total_beds', 'occupied_beds', 'bed_days', 'occupancy_rate',
+    'revenue', 'rent_revenue', 'utility_cost', 'revenue_per_bed', 'utility_cost_per_occupied_bed',
+    'refreshed_at',
+]
+
+CENT = Decimal('0.01')
+
+
+def previous_month(year, month):
+    if month == 1:
+        return year - 1, 12
+    return year, month - 1
+
+
+def iter_months(start, end):
+    """(year, month) pairs from start to end inclusive"""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def stay_months(start_date, end_date, current):
+    """Every month a stay has bed-days in; open stays run to the current month"""
+    end = (end_date.year, end_date.month) if end_date else current
+    return iter_months((start_date.year, start_date.month), min(end, current))
+
+
+def mark_stale(months):
+    StaleMonth.objects.bulk_create(
+        [StaleMonth(year=year, month=month) for year, month in months],
+        ignore_conflicts=True,
+    )
+
+
+def _stay_deleted(sender, instance, **kwargs):
+    today = timezone.now().date()
+    mark_stale(stay_months(instance.start_date, instance.end_date, (today.year, today.month)))
+
+
+def track_deleted_stays():
+    """Deleted stays (e.g. a customer's CASCADE) leave nothing to compare; mark their months here"""
+    post_delete.connect(_stay_deleted, sender=OccupancyInterval, dispatch_uid='analytics:stay_deleted')
+
+
+# Ledger model -> its (year, month) fields
+LEDGER_PERIODS = {
+    HostelRevenue: ('year', 'month'),
+    UtilityExpense: ('billing_year', 'billing_month'),
+}
+
+
+def _ledger_period(instance):
+    return tuple(getattr(instance, field) for field in LEDGER_PERIODS[type(instance)])
+
+
+def _ledger_row_saving(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    stored = sender.objects.filter(pk=instance.pk).values_list(*LEDGER_PERIODS[sender]).first()
+    if stored and stored != _ledger_period(instance):
+        mark_stale([stored])
+
+
+def _ledger_row_deleted(sender, instance, **kwargs):
+    mark_stale([_ledger_period(instance)])
+
+
+def track_ledger_periods():
+    """
+    updated_at only points at a row's new period: a row moved to another month,
+    or deleted, would leave its amount in the old month. Mark that month here.
+    """
+    for model in LEDGER_PERIODS:
+        label = model._meta.label_lower
+        pre_save.connect(_ledger_row_saving, sender=model, dispatch_uid=f'analytics:{label}_saving')
+        post_delete.connect(_ledger_row_deleted, sender=model, dispatch_uid=f'analytics:{label}_deleted')
+
+
+def _revenue_by_hostel(year, month):
+    """Revenue rows carry no hostel; attribute each to where the customer stayed that month"""
+    first, last = month_bounds(year, month)
+    stay_hostel = Subquery(
+        intervals_overlapping(first, last)
+        .filter(customer=OuterRef('customer'))
+        .order_by('-start_date')
+        .values('hostel_id')[:1]
+    )
+    rows = (
+        HostelRevenue.objects.filter(year=year, month=month)
+        .annotate(stay_hostel=stay_hostel)
+        .filter(stay_hostel__isnull=False)
+        .values('stay_hostel')
+        .annotate(revenue=Sum('total_amount'), rent_revenue=Sum('total_amount', filter=Q(title='rent')))
+    )
+    return {row['stay_hostel']: row for row in rows}
+
+
+def _utility_cost_by_hostel(year, month):
+    rows = (
+        UtilityExpense.objects.filter(billing_year=year, billing_month=month)
+        .exclude(approval_status=UtilityExpense.ApprovalStatus.REJECTED)
+        .order_by()
+        .values('hostel_id')
+        .annotate(total=Sum('amount'))
+    )
+    return {row['hostel_id']: row['total'] for row in rows}
+
+
+def _beds_by_hostel():
+    # Current bed counts, the same capacity monthly_occupancy() rates against;
+    # bed created_at is no guide since history is often entered after the fact
+    rows = Bed.objects.values('unit__hostel_id').annotate(total=Count('pk'))
+    return {row['unit__hostel_id']: row['total'] for row in rows}
+
+
+def _per(amount, count):
+    return (amount / count).quantize(CENT) if count else Decimal('0')
+
+
+def refresh_month(year, month):
+    """
+    Rebuild the cube rows for one month: four aggregate reads and one upsert,
+    whatever the number of hostels. Returns the number of rows written.
+    """
+    # Cleared first, so a stay deleted while this runs marks the month again
+    StaleMonth.objects.filter(year=year, month=month).delete()
+    occupancy = {row['hostel_id']: row for row in monthly_occupancy(year, month)}
+    revenue = _revenue_by_hostel(year, month)
+    utility_cost = _utility_cost_by_hostel(year, month)
+    beds = _beds_by_hostel()
+
+    stats = []
+    for hostel_id in set(occupancy) | set(revenue) | set(utility_cost) | set(beds):
+        occ = occupancy.get(hostel_id, {})
+        rev = revenue.get(hostel_id, {})
+        total_beds = beds.get(hostel_id, 0)
+        occupied_beds = occ.get('occupied_beds', 0)
+        hostel_revenue = rev.get('revenue') or Decimal('0')
+        hostel_utility_cost = utility_cost.get(hostel_id) or Decimal('0')
+        stats.append(HostelMonthlyStats(
+            hostel_id=hostel_id,
+            year=year,
+            month=month,
+            total_beds=total_beds,
+            occupied_beds=occupied_beds,
+            bed_days=occ.get('bed_days', 0),
+            occupancy_rate=Decimal(str(occ.get('occupancy_rate', 0))),
+            revenue=hostel_revenue,
+            rent_revenue=rev.get('rent_revenue') or Decimal('0'),
+            utility_cost=hostel_utility_cost,
+            revenue_per_bed=_per(hostel_revenue, total_beds),
+            utility_cost_per_occupied_bed=_per(hostel_utility_cost, occupied_beds),
+        ))
+
+    HostelMonthlyStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=['hostel', 'year', 'month'],
+        update_fields=STAT_FIELDS,
+    )
+    HostelMonthlyStats.objects.filter(year=year, month=month).exclude(
+        hostel_id__in=[row.hostel_id for row in stats]
+    ).delete()
+    return len(stats)
+
+
+def first_month_with_data():
+    dates = [
+        OccupancyInterval.objects.aggregate(first=Min('start_date'))['first'],
+    ]
+    revenue = HostelRevenue.objects.order_by('year', 'month').values_list('year', 'month').first()
+    utility = UtilityExpense.objects.order_by('billing_year', 'billing_month').values_list('billing_year', 'billing_month').first()
+    periods = [(d.year, d.month) for d in dates if d] + [p for p in (revenue, utility) if p]
+    return min(periods) if periods else None
+
+
+def months_to_refresh(today):
+    """
+    Months whose cube rows are stale: the current and previous month (open
+    stays keep accruing bed-days), plus every month touched by revenue,
+    utility bills or bed assignments changed since the last refresh and
+    every month marked stale (deleted stays, deleted or moved ledger rows). On an empty cube this is every month with data.
+    """
+    current = (today.year, today.month)
+    last_refresh = HostelMonthlyStats.objects.aggregate(last=Max('refreshed_at'))['last']
+    if last_refresh is None:
+        start = first_month_with_data()
+        return list(iter_months(start, current)) if start else [current]
+
+    months = {current, previous_month(*current)}
+    months.update(
+        HostelRevenue.objects.filter(updated_at__gt=last_refresh)
+        .order_by().values_list('year', 'month').distinct()
+    )
+    months.update(
+        UtilityExpense.objects.filter(updated_at__gt=last_refresh)
+        .order_by().values_list('billing_year', 'billing_month').distinct()
+    )
+    # A stay has bed-days in every month it covers, not just its first and last
+    for start_date, end_date in (
+        OccupancyInterval.objects.filter(bed__updated_at__gt=last_refresh)
+        .order_by().values_list('start_date', 'end_date').distinct()
+    ):
+        months.update(stay_months(start_date, end_date, current))
+    months.update(StaleMonth.objects.values_list('year', 'month'))
+    return sorted(month for month in months if month <= current)
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
+    verbose_name = 'Hostel Analytics'
+
+    def ready(self):
+        from analytics.analytics_helpers.cube import track_deleted_stays, track_ledger_periods
+        track_deleted_stays()
+        track_ledger_periods()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from analytics.analytics_helpers.cube import first_month_with_data, iter_months, months_to_refresh, refresh_month
+
+
+class Command(BaseCommand):
+    help = "Refresh the monthly hostel analytics cube (only stale months unless --all or --month is given)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild every month that has data')
+        parser.add_argument('--month', help='Rebuild a single month, as YYYY-MM')
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+            except ValueError:
+                raise CommandError("--month must look like 2025-04")
+            periods = [(year, month)]
+        elif options['all']:
+            start = first_month_with_data()
+            periods = list(iter_months(start, (today.year, today.month))) if start else []
+        else:
+            periods = months_to_refresh(today)
+
+        rows = 0
+        for year, month in periods:
+            rows += refresh_month(year, month)
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(periods)} month(s), {rows} hostel row(s)."))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('hostel', '0004_occupancyinterval'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostelMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('total_beds', models.PositiveIntegerField(default=0)),
+                ('occupied_beds', models.PositiveIntegerField(default=0)),
+                ('bed_days', models.PositiveIntegerField(default=0)),
+                ('occupancy_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('rent_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('utility_cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('revenue_per_bed', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('utility_cost_per_occupied_bed', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('hostel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_stats', to='hostel.hostel')),
+            ],
+            options={
+                'verbose_name': 'Hostel Monthly Stats',
+                'verbose_name_plural': 'Hostel Monthly Stats',
+                'ordering': ['year', 'month', 'hostel'],
+                'indexes': [models.Index(fields=['year', 'month'], name='hostel_stats_period_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hostelmonthlystats',
+            constraint=models.UniqueConstraint(fields=('hostel', 'year', 'month'), name='unique_hostel_monthly_stats'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('marked_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['year', 'month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stalemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='unique_stale_month'),
+        ),
+    ]
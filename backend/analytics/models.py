@@ -0,0 +1,53 @@
+from django.db import models
+
+
+# One pre-aggregated row per hostel per month, rebuilt by the refresh_analytics
+# command. The dashboard and its JSON endpoints only ever read this table.
+class HostelMonthlyStats(models.Model):
+    hostel = models.ForeignKey('hostel.Hostel', on_delete=models.CASCADE, related_name='monthly_stats')
+    year = models.IntegerField()
+    month = models.IntegerField()
+
+    total_beds = models.PositiveIntegerField(default=0)
+    occupied_beds = models.PositiveIntegerField(default=0)
+    bed_days = models.PositiveIntegerField(default=0)
+    occupancy_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    rent_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    utility_cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue_per_bed = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    utility_cost_per_occupied_bed = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['year', 'month', 'hostel']
+        verbose_name = 'Hostel Monthly Stats'
+        verbose_name_plural = 'Hostel Monthly Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['hostel', 'year', 'month'], name='unique_hostel_monthly_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['year', 'month'], name='hostel_stats_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hostel} - {self.year}/{self.month:02d}"
+
+
+# Months to rebuild on the next refresh that no remaining row points at, e.g.
+# the span of a deleted stay. refresh_month() clears its month's marker.
+class StaleMonth(models.Model):
+    year = models.IntegerField()
+    month = models.IntegerField()
+    marked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['year', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='unique_stale_month'),
+        ]
+
+    def __str__(self):
+        return f"{self.year}/{self.month:02d}"
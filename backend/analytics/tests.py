@@ -0,0 +1,115 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from analytics.analytics_helpers.cube import months_to_refresh, refresh_month
+from analytics.models import HostelMonthlyStats, StaleMonth
+from customer.models import Customer
+from finance.models import HostelRevenue, UtilityExpense
+from hostel.models import Bed, Hostel, OccupancyInterval, Unit
+
+TODAY = datetime.date(2025, 10, 15)
+
+
+class MonthsToRefreshTests(TestCase):
+    def setUp(self):
+        hostel = Hostel.objects.create(
+            name='Alpha', hostel_type='boys', total_rooms=3, address='-',
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+        unit = Unit.objects.create(hostel=hostel, unit_type='bedroom', room_num='101', num_of_beds=2)
+        self.bed = Bed.objects.create(unit=unit, bed_num='1', rent=Decimal('50000'))
+        self.customer = Customer.objects.create(
+            name='Asha', date_of_birth=datetime.date(2000, 1, 1), email='asha@example.com',
+            phone_number='09012345678', nationality='NP', home_address='-', parent_phone_number='09012345678',
+            visa_type='Student', workplace_or_school_name='-', workplace_or_school_address='-',
+            workplace_or_school_phone='-', zairyu_card_number='-', zairyu_card_expire_date=datetime.date(2030, 1, 1),
+        )
+        refresh_month(TODAY.year, TODAY.month)
+
+    def add_backdated_stay(self):
+        OccupancyInterval.objects.create(
+            bed=self.bed, unit=self.bed.unit, hostel=self.bed.unit.hostel, customer=self.customer,
+            start_date=datetime.date(2025, 4, 1), end_date=datetime.date(2025, 8, 31),
+        )
+        self.bed.save()
+
+    def test_changed_stay_marks_every_month_it_covers(self):
+        self.add_backdated_stay()
+        months = months_to_refresh(TODAY)
+        self.assertTrue({(2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)} <= set(months))
+
+    def test_deleted_stay_marks_its_months_until_refreshed(self):
+        self.add_backdated_stay()
+        for year, month in months_to_refresh(TODAY):
+            refresh_month(year, month)
+        self.assertEqual(HostelMonthlyStats.objects.get(year=2025, month=6).bed_days, 30)
+
+        self.customer.delete()
+        self.assertEqual(
+            set(StaleMonth.objects.values_list('year', 'month')),
+            {(2025, 4), (2025, 5), (2025, 6), (2025, 7), (2025, 8)},
+        )
+        self.assertIn((2025, 6), months_to_refresh(TODAY))
+
+        refresh_month(2025, 6)
+        self.assertEqual(HostelMonthlyStats.objects.get(year=2025, month=6).bed_days, 0)
+        self.assertFalse(StaleMonth.objects.filter(year=2025, month=6).exists())
+
+    def refresh_all(self):
+        for year, month in months_to_refresh(TODAY):
+            refresh_month(year, month)
+
+    def stats(self, month):
+        return HostelMonthlyStats.objects.get(year=2025, month=month)
+
+    def add_june_rent(self):
+        self.add_backdated_stay()
+        revenue = HostelRevenue.objects.create(
+            title='rent', customer=self.customer, year=2025, month=6, rent=Decimal('50000'), rent_discount_percent=0,
+            internet=Decimal('0'), utilities=Decimal('0'),
+        )
+        self.refresh_all()
+        self.assertEqual(self.stats(6).revenue, Decimal('50000'))
+        return revenue
+
+    def add_june_utility(self):
+        utility = UtilityExpense.objects.create(
+            hostel=self.bed.unit.hostel, expense_type=UtilityExpense.ExpenseType.choices[0][0], amount=Decimal('8000'),
+            billing_year=2025, billing_month=6, date_from=datetime.date(2025, 6, 1),
+            date_to=datetime.date(2025, 6, 30), paid_date=datetime.date(2025, 7, 5),
+        )
+        self.refresh_all()
+        self.assertEqual(self.stats(6).utility_cost, Decimal('8000'))
+        return utility
+
+    def test_deleted_revenue_marks_its_month(self):
+        self.add_june_rent().delete()
+        self.assertIn((2025, 6), months_to_refresh(TODAY))
+        self.refresh_all()
+        self.assertEqual(self.stats(6).revenue, Decimal('0'))
+
+    def test_revenue_moved_to_another_month_refreshes_the_old_one(self):
+        revenue = self.add_june_rent()
+        revenue.month = 7
+        revenue.save()
+        self.assertTrue({(2025, 6), (2025, 7)} <= set(months_to_refresh(TODAY)))
+        self.refresh_all()
+        self.assertEqual(self.stats(6).revenue, Decimal('0'))
+        self.assertEqual(self.stats(7).revenue, Decimal('50000'))
+
+    def test_deleted_utility_marks_its_month(self):
+        self.add_june_utility().delete()
+        self.assertIn((2025, 6), months_to_refresh(TODAY))
+        self.refresh_all()
+        self.assertEqual(self.stats(6).utility_cost, Decimal('0'))
+
+    def test_utility_moved_to_another_month_refreshes_the_old_one(self):
+        utility = self.add_june_utility()
+        utility.billing_year, utility.billing_month = 2025, 5
+        utility.save()
+        self.assertTrue({(2025, 5), (2025, 6)} <= set(months_to_refresh(TODAY)))
+        self.refresh_all()
+        self.assertEqual(self.stats(6).utility_cost, Decimal('0'))
+        self.assertEqual(self.stats(5).utility_cost, Decimal('8000'))
@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+app_name = 'analytics'
+
+urlpatterns = [
+    path('', views.dashboard, name='dashboard'),
+    path('api/portfolio/', views.portfolio_series, name='portfolio_series'),
+    path('api/hostels/', views.hostel_breakdown, name='hostel_breakdown'),
+    path('api/hostels/<int:hostel_id>/', views.hostel_series, name='hostel_series'),
+]
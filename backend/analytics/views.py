@@ -0,0 +1,139 @@
+import calendar
+from django.contrib.auth.decorators import login_required, permission_required
+from django.db.models import Q, Sum
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from hostel.models import Hostel
+from .analytics_helpers.cube import previous_month
+from .models import HostelMonthlyStats
+
+VIEW_PERMISSION = 'analytics.view_hostelmonthlystats'
+
+# Default chart window when no ?start= is given
+DEFAULT_MONTHS = 12
+
+
+def _parse_period(value, default):
+    """'2025-04' -> (2025, 4); anything unparsable falls back to default"""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return default
+    if not 1 <= month <= 12:
+        return default
+    return year, month
+
+
+def _period_range(request):
+    today = timezone.now().date()
+    end = _parse_period(request.GET.get('end'), (today.year, today.month))
+    start = end
+    for _ in range(DEFAULT_MONTHS - 1):
+        start = previous_month(*start)
+    start = _parse_period(request.GET.get('start'), start)
+    return start, end
+
+
+def _in_range(start, end):
+    (start_year, start_month), (end_year, end_month) = start, end
+    return (
+        (Q(year__gt=start_year) | Q(year=start_year, month__gte=start_month))
+        & (Q(year__lt=end_year) | Q(year=end_year, month__lte=end_month))
+    )
+
+
+def _label(year, month):
+    return f"{year}-{month:02d}"
+
+
+def _ratio(amount, count):
+    return round(float(amount) / count, 2) if count else 0
+
+
+def _chart(rows, label):
+    """Rows of cube figures -> {'labels': [...], 'datasets': {metric: [...]}} for Chart.js"""
+    datasets = {
+        'occupancy_rate': [],
+        'revenue': [],
+        'revenue_per_bed': [],
+        'utility_cost': [],
+        'utility_cost_per_occupied_bed': [],
+    }
+    labels = []
+    for row in rows:
+        labels.append(label(row))
+        if 'occupancy_rate' in row:
+            datasets['occupancy_rate'].append(float(row['occupancy_rate']))
+        else:
+            # Portfolio rows are summed across hostels, so recompute from bed-days
+            capacity = row['total_beds'] * calendar.monthrange(row['year'], row['month'])[1]
+            datasets['occupancy_rate'].append(_ratio(row['bed_days'] * 100, capacity))
+        datasets['revenue'].append(float(row['revenue']))
+        datasets['revenue_per_bed'].append(_ratio(row['revenue'], row['total_beds']))
+        datasets['utility_cost'].append(float(row['utility_cost']))
+        datasets['utility_cost_per_occupied_bed'].append(_ratio(row['utility_cost'], row['occupied_beds']))
+    return {'labels': labels, 'datasets': datasets}
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required(VIEW_PERMISSION, raise_exception=True)
+def dashboard(request):
+    start, end = _period_range(request)
+    last_refresh = HostelMonthlyStats.objects.order_by('-refreshed_at').values_list('refreshed_at', flat=True).first()
+    return render(request, 'analytics/dashboard.html', {
+        'hostels': Hostel.objects.order_by('name').values('id', 'name'),
+        'start': _label(*start),
+        'end': _label(*end),
+        'last_refresh': last_refresh,
+    })
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required(VIEW_PERMISSION, raise_exception=True)
+def portfolio_series(request):
+    """Whole-portfolio totals per month; occupancy is bed-day weighted across hostels"""
+    start, end = _period_range(request)
+    rows = (
+        HostelMonthlyStats.objects.filter(_in_range(start, end))
+        .values('year', 'month')
+        .annotate(
+            total_beds=Sum('total_beds'),
+            occupied_beds=Sum('occupied_beds'),
+            bed_days=Sum('bed_days'),
+            revenue=Sum('revenue'),
+            utility_cost=Sum('utility_cost'),
+        )
+        .order_by('year', 'month')
+    )
+    return JsonResponse(_chart(rows, lambda row: _label(row['year'], row['month'])))
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required(VIEW_PERMISSION, raise_exception=True)
+def hostel_breakdown(request):
+    """One bar per hostel for the ?end= month"""
+    _, (year, month) = _period_range(request)
+    rows = (
+        HostelMonthlyStats.objects.filter(year=year, month=month)
+        .order_by('hostel__name')
+        .values('hostel__name', 'total_beds', 'occupied_beds', 'occupancy_rate', 'revenue', 'utility_cost')
+    )
+    data = _chart(rows, lambda row: row['hostel__name'])
+    data['period'] = _label(year, month)
+    return JsonResponse(data)
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required(VIEW_PERMISSION, raise_exception=True)
+def hostel_series(request, hostel_id):
+    hostel = get_object_or_404(Hostel, pk=hostel_id)
+    start, end = _period_range(request)
+    rows = (
+        HostelMonthlyStats.objects.filter(_in_range(start, end), hostel=hostel)
+        .order_by('year', 'month')
+        .values('year', 'month', 'total_beds', 'occupied_beds', 'occupancy_rate', 'revenue', 'utility_cost')
+    )
+    data = _chart(rows, lambda row: _label(row['year'], row['month']))
+    data['hostel'] = hostel.name
+    return JsonResponse(data)
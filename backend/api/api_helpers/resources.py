@@ -0,0 +1,132 @@
+from customer.models import Customer
+from finance.models import HostelRevenue, UtilityExpense
+from hostel.models import Bed, Hostel, Unit
+from targets.models import RentalContract
+
+
+class Resource:
+    """
+    A model exposed read-only by the API. fields maps the public field name to
+    the ORM lookup it is read from; every page is a single values_list() query
+    over those lookups, so foreign keys are exposed as ids (joined lookups such
+    as unit__hostel_id are fine, they stay in the same query).
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+
+    @property
+    def permission(self):
+        return f'{self.model._meta.app_label}.view_{self.model._meta.model_name}'
+
+
+TIMESTAMPS = {'created_at': 'created_at', 'updated_at': 'updated_at'}
+
+RESOURCES = {
+    'hostels': Resource(Hostel, {
+        'id': 'id',
+        'name': 'name',
+        'common_name': 'common_name',
+        'hostel_type': 'hostel_type',
+        'status': 'status',
+        'total_rooms': 'total_rooms',
+        'address': 'address',
+        'latitude': 'latitude',
+        'longitude': 'longitude',
+        'contract_start_date': 'contract_start_date',
+        'contract_end_date': 'contract_end_date',
+        'deposit_fee': 'deposit_fee',
+        'initial_fee': 'initial_fee',
+        'hostel_manager_id': 'hostel_manager_id',
+        **TIMESTAMPS,
+    }),
+    'units': Resource(Unit, {
+        'id': 'id',
+        'hostel_id': 'hostel_id',
+        'unit_type': 'unit_type',
+        'room_num': 'room_num',
+        'unit_id': 'unit_id',
+        'num_of_beds': 'num_of_beds',
+        **TIMESTAMPS,
+    }),
+    'beds': Resource(Bed, {
+        'id': 'id',
+        'unit_id': 'unit_id',
+        'hostel_id': 'unit__hostel_id',
+        'bed_num': 'bed_num',
+        'rent': 'rent',
+        'internet_fee': 'internet_fee',
+        'utilities_fee': 'utilities_fee',
+        'customer_id': 'customer_id',
+        'assigned_date': 'assigned_date',
+        'released_date': 'released_date',
+        **TIMESTAMPS,
+    }),
+    # Contact and occupancy data only: card numbers and documents stay in the app
+    'customers': Resource(Customer, {
+        'id': 'id',
+        'name': 'name',
+        'email': 'email',
+        'phone_number': 'phone_number',
+        'nationality': 'nationality',
+        'visa_type': 'visa_type',
+        'status': 'status',
+        'zairyu_card_expire_date': 'zairyu_card_expire_date',
+        'workplace_or_school_name': 'workplace_or_school_name',
+        **TIMESTAMPS,
+    }),
+    'revenues': Resource(HostelRevenue, {
+        'id': 'id',
+        'customer_id': 'customer_id',
+        'title': 'title',
+        'year': 'year',
+        'month': 'month',
+        'deposit': 'deposit',
+        'deposit_after_discount': 'deposit_after_discount',
+        'initial_fee': 'initial_fee',
+        'initial_fee_after_discount': 'initial_fee_after_discount',
+        'rent': 'rent',
+        'rent_after_discount': 'rent_after_discount',
+        'internet': 'internet',
+        'utilities': 'utilities',
+        'payment_type': 'payment_type',
+        'prepaid_amount': 'prepaid_amount',
+        'collected_amount': 'collected_amount',
+        'total_amount': 'total_amount',
+        **TIMESTAMPS,
+    }),
+    'utility-expenses': Resource(UtilityExpense, {
+        'id': 'id',
+        'hostel_id': 'hostel_id',
+        'expense_type': 'expense_type',
+        'amount': 'amount',
+        'billing_year': 'billing_year',
+        'billing_month': 'billing_month',
+        'date_from': 'date_from',
+        'date_to': 'date_to',
+        'paid_date': 'paid_date',
+        'usage_amount': 'usage_amount',
+        'approval_status': 'approval_status',
+        'paid_by_id': 'paid_by_id',
+        'approved_by_id': 'approved_by_id',
+        **TIMESTAMPS,
+    }),
+    'contracts': Resource(RentalContract, {
+        'id': 'id',
+        'target_id': 'target_to_id',
+        'customer_name': 'customer_name',
+        'building_address': 'building_address',
+        'contract_date': 'contract_date',
+        'contract_type': 'contract_type',
+        'agent_fee': 'agent_fee',
+        'ad_fee': 'ad_fee',
+        'ad_fee_received_amount': 'ad_fee_received_amount',
+        'ad_fee_transfer_fee': 'ad_fee_transfer_fee',
+        'ad_fee_received_date': 'ad_fee_received_date',
+        'ad_fee_confirmed_at': 'ad_fee_confirmed_at',
+        'living_num_people': 'living_num_people',
+        'management_company_name': 'management_company_name',
+        **TIMESTAMPS,
+    }),
+}
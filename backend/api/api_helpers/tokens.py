@@ -0,0 +1,29 @@
+"""
+Bearer tokens for integrations, issued with `python manage.py api_token <email>`.
+
+A token is the signed user id plus the user's session auth hash, so nothing is
+stored server side: it expires after API_TOKEN_MAX_AGE and is revoked, like the
+user's sessions, by changing their password or deactivating them.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+
+SALT = 'api.tokens'
+
+
+def make_token(user):
+    return signing.dumps({'user': user.pk, 'auth': user.get_session_auth_hash()}, salt=SALT)
+
+
+def user_for_token(token):
+    """The active user the token was issued to, or None"""
+    try:
+        payload = signing.loads(token, salt=SALT, max_age=settings.API_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    user = get_user_model().objects.filter(pk=payload.get('user'), is_active=True).first()
+    if user is None or not constant_time_compare(user.get_session_auth_hash(), payload.get('auth', '')):
+        return None
+    return user
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.api_helpers.tokens import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a bearer token for the sync API (Authorization: Bearer <token>). "
+        "The token has the user's view permissions and stops working when their password changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help="Account the integration acts as")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options['email'], is_active=True).first()
+        if user is None:
+            raise CommandError(f"No active user with email {options['email']}")
+        self.stdout.write(make_token(user))
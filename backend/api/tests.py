@@ -0,0 +1,98 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from api.api_helpers.tokens import make_token
+from hostel.models import Hostel
+
+
+class SyncTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_superuser(email='sync@fishtail.jp', password='x')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {make_token(self.user)}'}
+
+    def add_hostels(self, count, age=datetime.timedelta(hours=1)):
+        for i in range(count):
+            Hostel.objects.create(
+                name=f'Hostel {Hostel.objects.count()}', hostel_type='boys', total_rooms=3, address='-',
+                deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+            )
+        Hostel.objects.filter(updated_at__gt=timezone.now() - age).update(updated_at=timezone.now() - age)
+
+    def get(self, auth=None, **params):
+        return self.client.get(reverse('api:resource', args=['hostels']), params, **(auth or self.auth))
+
+
+class SyncLagTests(SyncTestCase):
+    def test_recent_changes_wait_for_the_next_sync(self):
+        self.add_hostels(2)
+        cursor = self.get().json()['next_cursor']
+
+        self.add_hostels(1, age=datetime.timedelta(seconds=5))
+        page = self.get(cursor=cursor).json()
+        self.assertEqual(page['results'], [])
+        # Nothing new was handed out, so the cursor does not move past the held-back row
+        self.assertEqual(page['next_cursor'], cursor)
+
+        with self.settings(API_SYNC_LAG_SECONDS=0):
+            self.assertEqual(len(self.get(cursor=cursor).json()['results']), 1)
+
+
+class QueryCountTests(SyncTestCase):
+    """Every page is one query plus authentication, at any depth"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_hostels(5)
+        self.staff = CustomUser.objects.create_user(email='staff@fishtail.jp', password='x')
+        self.staff_auth = {'HTTP_AUTHORIZATION': f'Bearer {make_token(self.staff)}'}
+
+    def grant_view_hostel(self):
+        self.staff.user_permissions.add(Permission.objects.get(codename='view_hostel'))
+
+    def test_first_page(self):
+        # Token user, page
+        with self.assertNumQueries(2):
+            response = self.get(limit=2)
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_deep_cursor(self):
+        cursor = None
+        for _ in range(2):
+            cursor = self.get(limit=2, **({'cursor': cursor} if cursor else {})).json()['next_cursor']
+        with self.assertNumQueries(2):
+            response = self.get(limit=2, cursor=cursor)
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(2):
+            response = self.get(fields='id,name')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name'})
+
+    def test_invalid_cursor(self):
+        # Token user only; the page query never runs
+        with self.assertNumQueries(1):
+            response = self.get(cursor='not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unauthenticated(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api:resource', args=['hostels']))
+        self.assertEqual(response.status_code, 401)
+
+    def test_staff_page(self):
+        self.grant_view_hostel()
+        # Token user, the user's and the group permissions, page
+        with self.assertNumQueries(4):
+            response = self.get(self.staff_auth)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_staff_without_permission(self):
+        with self.assertNumQueries(3):
+            response = self.get(self.staff_auth)
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('', views.index, name='index'),
+    path('<slug:resource>/', views.resource_list, name='resource'),
+]
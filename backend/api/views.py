@@ -0,0 +1,143 @@
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_safe
+
+from .api_helpers.cursor import ORDERING, InvalidCursor, after_cursor, encode_cursor
+from .api_helpers.resources import RESOURCES
+from .api_helpers.tokens import user_for_token
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _api_user(request):
+    """Bearer token (integrations) or the logged-in session (browser, scripts sharing a session)"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() == 'bearer' and token:
+        return user_for_token(token.strip())
+    if request.user.is_authenticated:
+        return request.user
+    return None
+
+
+def api_view(view):
+    """Read-only JSON endpoint: GET/HEAD only, authenticated, errors as {"error": ...}"""
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        user = _api_user(request)
+        if user is None:
+            response = _error("Authentication required.", 401)
+            response['WWW-Authenticate'] = 'Bearer'
+            return response
+        request.user = user
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _page_size(value):
+    if value is None:
+        return settings.API_PAGE_SIZE
+    size = int(value)
+    if not 1 <= size <= settings.API_MAX_PAGE_SIZE:
+        raise ValueError(value)
+    return size
+
+
+def _updated_since(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@api_view
+def index(request):
+    """The resources this user may read, with their fields"""
+    return JsonResponse({
+        'resources': {
+            name: {
+                'url': request.build_absolute_uri(reverse('api:resource', args=[name])),
+                'fields': list(resource.fields),
+            }
+            for name, resource in RESOURCES.items()
+            if request.user.has_perm(resource.permission)
+        },
+    })
+
+
+@api_view
+def resource_list(request, resource):
+    """
+    One page of a resource, oldest change first.
+
+    ?fields=id,name       sparse fieldset (default: all fields)
+    ?updated_since=<ISO>  only rows changed at or after this time
+    ?cursor=<next_cursor> continue after the previous page
+    ?limit=<n>            page size, up to API_MAX_PAGE_SIZE
+
+    next_cursor is always returned; store it after the last page and pass it
+    on the next sync to receive only the rows changed since. Rows changed in
+    the last API_SYNC_LAG_SECONDS are held back until a later sync. Deleted
+    rows are not reported: compare a periodic ?fields=id sweep to find them.
+    """
+    spec = RESOURCES.get(resource)
+    if spec is None:
+        return _error(f"Unknown resource '{resource}'.", 404)
+    if not request.user.has_perm(spec.permission):
+        return _error("You do not have permission to read this resource.", 403)
+
+    fields = list(spec.fields)
+    if request.GET.get('fields'):
+        fields = [name.strip() for name in request.GET['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in spec.fields]
+        if unknown:
+            return _error(f"Unknown fields {', '.join(unknown)}. Available: {', '.join(spec.fields)}.", 400)
+    try:
+        limit = _page_size(request.GET.get('limit'))
+    except ValueError:
+        return _error(f"limit must be between 1 and {settings.API_MAX_PAGE_SIZE}.", 400)
+
+    # updated_at is stamped before commit, so a transaction still running can commit rows older
+    # than the newest one visible now; only hand out rows old enough that the cursor can't pass them
+    settled = timezone.now() - timedelta(seconds=settings.API_SYNC_LAG_SECONDS)
+    rows = spec.model.objects.filter(updated_at__lte=settled).order_by(*ORDERING)
+    if request.GET.get('updated_since'):
+        try:
+            rows = rows.filter(updated_at__gte=_updated_since(request.GET['updated_since']))
+        except ValueError:
+            return _error("updated_since must be an ISO 8601 date and time.", 400)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            rows = rows.filter(after_cursor(cursor))
+        except InvalidCursor:
+            return _error("Invalid cursor.", 400)
+
+    # The ordering columns ride along at the end of each row to build the cursor
+    lookups = [spec.fields[name] for name in fields] + list(ORDERING)
+    page = list(rows.values_list(*lookups)[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    if page:
+        cursor = encode_cursor(*page[-1][-2:])
+    next_url = None
+    if has_more:
+        query = request.GET.copy()
+        query['cursor'] = cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+    return JsonResponse({
+        'results': [dict(zip(fields, row)) for row in page],
+        'next': next_url,
+        'next_cursor': cursor or None,
+    })
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from backend.admin_performance import AdminPerformanceMixin
+from .models import AuditEntry
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(AdminPerformanceMixin, admin.ModelAdmin):
+    list_display = ('created_at', 'model', 'object_id', 'action', 'user')
+    list_filter = ('model', 'action')
+    search_fields = ('object_id',)
+    readonly_fields = ('model', 'object_id', 'action', 'changes', 'user', 'created_at')
+
+    # Append-only: entries are written by audit_helpers.trail
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'audit'
+    verbose_name = 'Audit Trail'
+
+    def ready(self):
+        from .audit_helpers.trail import connect_audit_signals
+        connect_audit_signals()
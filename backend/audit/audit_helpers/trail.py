@@ -0,0 +1,184 @@
+"""
+Field-level audit trail for financial records.
+
+Saves and deletes of the models in AUDITED_FIELDS record an AuditEntry with
+the changed fields' [old, new] values. Entries are kept only if the write
+commits. Inside audit_batch() (every request, via AuditTrailMiddleware) they
+are buffered and inserted with one bulk_create when the block ends; elsewhere
+(background threads, management commands) each one is inserted on commit.
+
+    with audit_batch(user=request.user):
+        ...
+
+queryset.update(), bulk_create() and raw SQL send no signals and are not audited.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from audit.models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+# Model -> fields whose changes are recorded (foreign keys are stored as ids)
+AUDITED_FIELDS = {
+    'finance.HostelRevenue': (
+        'title', 'customer', 'year', 'month',
+        'deposit', 'deposit_discount_percent', 'deposit_after_discount',
+        'initial_fee', 'initial_fee_discount_percent', 'initial_fee_after_discount',
+        'internet', 'utilities', 'rent', 'rent_discount_percent', 'rent_after_discount',
+        'payment_type', 'prepaid_amount', 'collected_amount', 'total_amount',
+    ),
+    'finance.HostelExpense': ('hostel', 'purchased_date', 'amount', 'status', 'approved_by'),
+    'finance.UtilityExpense': (
+        'hostel', 'expense_type', 'amount', 'billing_year', 'billing_month', 'approval_status', 'approved_by',
+    ),
+    'finance.StaffExpense': (
+        'employee', 'expense_type', 'start_date', 'end_date', 'amount', 'approval_status', 'approved_by', 'status_memo',
+    ),
+    'targets.RentalContract': (
+        'agent_fee', 'ad_fee', 'ad_fee_received_amount', 'ad_fee_transfer_fee', 'ad_fee_received_date',
+        'ad_fee_confirmed_by', 'ad_fee_confirmed_at',
+    ),
+}
+
+# Audited model -> field objects, filled by connect_audit_signals()
+_audited = {}
+
+_buffer = ContextVar('audit_buffer', default=None)
+_user = ContextVar('audit_user', default=None)
+
+
+def audited_models():
+    """(model, audited fields) for every model in AUDITED_FIELDS"""
+    for label, names in AUDITED_FIELDS.items():
+        model = apps.get_model(label)
+        yield model, [model._meta.get_field(name) for name in names]
+
+
+def _fields(sender, update_fields=None):
+    fields = _audited.get(sender, ())
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields or field.attname in update_fields]
+    return fields
+
+
+@contextmanager
+def audit_batch(user=None):
+    """
+    Buffer the audit entries of writes committed inside the block and insert
+    them in one query when it ends. user is recorded as the author of each change.
+    """
+    buffer_token = _buffer.set([])
+    user_token = _user.set(user)
+    try:
+        yield
+    finally:
+        entries = _buffer.get()
+        _buffer.reset(buffer_token)
+        _user.reset(user_token)
+        if entries:
+            try:
+                AuditEntry.objects.bulk_create(entries)
+            except Exception as e:
+                # The audited writes are already committed; don't turn the response into an error
+                logger.error(f"Writing {len(entries)} audit entries failed: {e}", exc_info=True)
+
+
+def _author_id(instance):
+    user = _user.get()
+    if user is not None and user.is_authenticated:
+        return user.pk
+    # Background jobs: fall back to who the row says changed it
+    return getattr(instance, 'updated_by_id', None) or getattr(instance, 'created_by_id', None)
+
+
+def _record(instance, action, changes, using):
+    entry = AuditEntry(
+        model=instance._meta.label_lower,
+        object_id=instance.pk,
+        action=action,
+        changes=changes,
+        user_id=_author_id(instance),
+        created_at=timezone.now(),
+    )
+
+    def keep():
+        buffer = _buffer.get()
+        if buffer is None:
+            entry.save()
+        else:
+            buffer.append(entry)
+
+    # Rolled-back writes leave no trace
+    transaction.on_commit(keep, using=using)
+
+
+def _stored_values(sender, instance, fields, using):
+    # The row as stored, not the instance, which may hold unsaved edits
+    if instance._state.adding or instance.pk is None:
+        return None
+    return sender._base_manager.using(using).filter(pk=instance.pk).values(*[field.attname for field in fields]).first()
+
+
+def _value(field, instance):
+    value = field.to_python(getattr(instance, field.attname))
+    # Compare and store amounts the way the database returns them (50000 -> 50000.00)
+    if isinstance(field, models.DecimalField) and isinstance(value, Decimal):
+        value = value.quantize(Decimal(1).scaleb(-field.decimal_places))
+    return value
+
+
+def remember_old_values(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    fields = _fields(sender, update_fields)
+    if raw or not fields:
+        return
+    instance._audit_old_values = _stored_values(sender, instance, fields, using)
+
+
+def record_save(sender, instance, created, raw=False, using=None, update_fields=None, **kwargs):
+    fields = _fields(sender, update_fields)
+    if raw or not fields:
+        return
+    old = instance.__dict__.pop('_audit_old_values', None)
+    changes = {}
+    for field in fields:
+        new = _value(field, instance)
+        if old is None:
+            if new is not None and new != '':
+                changes[field.name] = [None, new]
+        elif new != old[field.attname]:
+            changes[field.name] = [old[field.attname], new]
+    if changes:
+        _record(instance, 'create' if old is None else 'update', changes, using)
+
+
+def remember_deleted_values(sender, instance, using=None, **kwargs):
+    instance._audit_old_values = _stored_values(sender, instance, _fields(sender), using)
+
+
+def record_delete(sender, instance, using=None, **kwargs):
+    old = instance.__dict__.pop('_audit_old_values', None) or {}
+    changes = {}
+    for field in _fields(sender):
+        value = old.get(field.attname)
+        if value is not None and value != '':
+            changes[field.name] = [value, None]
+    _record(instance, 'delete', changes, using)
+
+
+def connect_audit_signals():
+    """Connect the audit handlers to every audited model. Called from AuditConfig.ready()"""
+    for model, fields in audited_models():
+        _audited[model] = fields
+        uid = f"audit:{model._meta.label_lower}"
+        pre_save.connect(remember_old_values, sender=model, dispatch_uid=uid)
+        post_save.connect(record_save, sender=model, dispatch_uid=uid)
+        pre_delete.connect(remember_deleted_values, sender=model, dispatch_uid=uid)
+        post_delete.connect(record_delete, sender=model, dispatch_uid=uid)
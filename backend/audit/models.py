@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class AuditEntry(models.Model):
+    """
+    One create/update/delete of an audited row (audit_helpers.trail.AUDITED_FIELDS).
+    changes maps each changed field to [old, new]. Entries are append-only.
+    """
+    ACTION_CHOICES = [
+        ('create', 'Created'),
+        ('update', 'Updated'),
+        ('delete', 'Deleted'),
+    ]
+
+    model = models.CharField(max_length=100)  # app_label.modelname
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    changes = models.JSONField(encoder=DjangoJSONEncoder)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_entries')
+    # When the change was made, not when the buffered entry was written
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = 'Audit entries'
+        # Per-object history, newest first
+        indexes = [models.Index(fields=['model', 'object_id', 'created_at'], name='audit_object_idx')]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Audit entries are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit entries are append-only")
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.model} #{self.object_id}"
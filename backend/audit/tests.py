@@ -0,0 +1,137 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from audit.models import AuditEntry
+from backend.middleware import AuditTrailMiddleware
+from finance.models import UtilityExpense
+from hostel.models import Hostel
+
+
+def make_hostel():
+    return Hostel.objects.create(
+        name='Alpha', hostel_type='boys', total_rooms=3, address='-',
+        deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+    )
+
+
+def make_utility(hostel, month=1, amount='1000'):
+    return UtilityExpense.objects.create(
+        hostel=hostel, expense_type=UtilityExpense.ExpenseType.choices[0][0], amount=Decimal(amount),
+        billing_year=2025, billing_month=month, date_from=datetime.date(2025, month, 1),
+        date_to=datetime.date(2025, month, 28), paid_date=datetime.date(2025, month, 28),
+    )
+
+
+class AuditTrailTests(TestCase):
+    def setUp(self):
+        self.hostel = make_hostel()
+
+    def entries(self, utility):
+        return list(AuditEntry.objects.filter(model='finance.utilityexpense', object_id=utility.pk).order_by('id'))
+
+    def test_create_records_the_set_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            utility = make_utility(self.hostel)
+        [entry] = self.entries(utility)
+        self.assertEqual(entry.action, 'create')
+        self.assertEqual(entry.changes['amount'], [None, '1000.00'])
+        self.assertEqual(entry.changes['billing_month'], [None, 1])
+        self.assertNotIn('approved_by', entry.changes)
+
+    def test_update_records_only_the_changed_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            utility = make_utility(self.hostel)
+        with self.captureOnCommitCallbacks(execute=True):
+            utility.amount = Decimal('1200')
+            utility.save()
+        entry = self.entries(utility)[-1]
+        self.assertEqual(entry.action, 'update')
+        self.assertEqual(entry.changes, {'amount': ['1000.00', '1200.00']})
+
+    def test_unchanged_save_records_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            utility = make_utility(self.hostel)
+        with self.captureOnCommitCallbacks(execute=True):
+            utility.save()
+        self.assertEqual(len(self.entries(utility)), 1)
+
+    def test_delete_records_the_stored_values(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            utility = make_utility(self.hostel)
+        pk = utility.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            # Unsaved edits are not what was deleted
+            utility.amount = Decimal('9999')
+            utility.delete()
+        entry = AuditEntry.objects.filter(model='finance.utilityexpense', object_id=pk).latest('id')
+        self.assertEqual(entry.action, 'delete')
+        self.assertEqual(entry.changes['amount'], ['1000.00', None])
+
+    def test_rolled_back_write_leaves_no_entry(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    make_utility(self.hostel)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertFalse(AuditEntry.objects.exists())
+
+
+class ObjectHistoryTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.utility = make_utility(make_hostel())
+        self.user = CustomUser.objects.create_user(email='staff@fishtail.jp', password='x')
+        self.client.force_login(self.user)
+        self.url = reverse('audit:object_history', args=['finance.utilityexpense', self.utility.pk])
+
+    def test_requires_the_view_permission(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.user.user_permissions.add(Permission.objects.get(codename='view_auditentry'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1000.00')
+
+    def test_unaudited_models_are_not_found(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='view_auditentry'))
+        url = reverse('audit:object_history', args=['hostel.hostel', self.utility.hostel_id])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class AuditBatchTests(TransactionTestCase):
+    """Writes of one request commit on their own; their entries are inserted together at the end"""
+
+    available_apps = [
+        'django.contrib.contenttypes', 'django.contrib.auth', 'accounts', 'customer', 'hostel', 'finance', 'audit',
+    ]
+
+    def test_one_insert_per_request(self):
+        hostel = make_hostel()
+        user = CustomUser.objects.create_user(email='staff@fishtail.jp', password='x')
+
+        def view(request):
+            make_utility(hostel, month=1)
+            make_utility(hostel, month=2)
+            return HttpResponse()
+
+        request = RequestFactory().post('/')
+        request.user = user
+        with CaptureQueriesContext(connection) as queries:
+            AuditTrailMiddleware(view)(request)
+        # Two utility INSERTs, then one bulk INSERT of both audit entries. bulk_create's
+        # BEGIN/COMMIT only show up as queries on SQLite, so they are left out.
+        statements = [query['sql'] for query in queries.captured_queries if query['sql'] not in ('BEGIN', 'COMMIT')]
+        self.assertEqual(len(statements), 3, statements)
+        self.assertEqual([sql.split('"')[1] for sql in statements], ['finance_utilityexpense'] * 2 + ['audit_auditentry'])
+        self.assertEqual(list(AuditEntry.objects.values_list('action', 'user')), [('create', user.pk)] * 2)
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'audit'
+
+urlpatterns = [
+    path('<str:model>/<int:pk>/', views.object_history, name='object_history'),
+]
@@ -0,0 +1,36 @@
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import render
+
+from .audit_helpers.trail import audited_models
+from .models import AuditEntry
+
+HISTORY_PAGE_SIZE = 50
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required('audit.view_auditentry', raise_exception=True)
+def object_history(request, model, pk):
+    """Every recorded change of one audited row, newest first"""
+    labels = {audited._meta.label_lower: (audited, fields) for audited, fields in audited_models()}
+    if model not in labels:
+        raise Http404("Not an audited model")
+    audited, fields = labels[model]
+    verbose_names = {field.name: field.verbose_name for field in fields}
+
+    # Served by audit_object_idx
+    entries = AuditEntry.objects.filter(model=model, object_id=pk).select_related('user').order_by('-created_at', '-id')
+    page = Paginator(entries, HISTORY_PAGE_SIZE).get_page(request.GET.get('page'))
+    for entry in page:
+        entry.rows = [
+            (verbose_names.get(name, name), old, new)
+            for name, (old, new) in entry.changes.items()
+        ]
+
+    return render(request, 'audit/object_history.html', {
+        'page': page,
+        'model_name': audited._meta.verbose_name,
+        'object': audited._base_manager.filter(pk=pk).first(),
+        'object_id': pk,
+    })
@@ -0,0 +1,61 @@
+import logging
+import threading
+import time
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Threads started by run_in_background() that have not finished yet
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run an I/O-bound callable (SMTP, file work) on a daemon thread once the
+    current transaction commits, so the request thread returns immediately.
+    Errors are logged, never raised to the caller. Gunicorn waits for running
+    tasks before a worker exits (wait_for_background_tasks); a killed worker
+    still loses them, so anything that must not be lost is persisted first
+    (ImportJob) or can be rebuilt (build_image_derivatives).
+    """
+    def target():
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {getattr(func, '__name__', func)} failed: {e}", exc_info=True)
+        finally:
+            # The thread may have touched the ORM; don't leak its connection
+            connections.close_all()
+            with _pending_lock:
+                _pending.discard(threading.current_thread())
+
+    def start():
+        thread = threading.Thread(target=target, daemon=True)
+        with _pending_lock:
+            _pending.add(thread)
+        thread.start()
+
+    transaction.on_commit(start)
+
+
+def wait_for_background_tasks(timeout):
+    """
+    Wait up to timeout seconds for running background tasks. Called from
+    gunicorn's worker_exit hook, so recycling a worker (max_requests) or a
+    deploy does not cut off emails being sent. Returns the number still running.
+    """
+    deadline = time.monotonic() + timeout
+    with _pending_lock:
+        threads = list(_pending)
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+    unfinished = sum(thread.is_alive() for thread in threads)
+    if unfinished:
+        logger.warning(f"Worker exiting with {unfinished} background task(s) still running; they are lost")
+    return unfinished
+
+
+def send_email_in_background(message):
+    """Send an EmailMessage without blocking the request on the SMTP round trip"""
+    run_in_background(message.send, fail_silently=False)
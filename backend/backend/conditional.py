@@ -0,0 +1,135 @@
+"""
+Conditional GET (ETag / Last-Modified) for pages rendered from TimeStampedUserModel rows.
+
+A page declares which rows it shows; one query returns their latest
+updated_at and row count (so deletes change it too). When the browser's cached
+copy is still current the view is skipped and a bodiless 304 is returned.
+
+    @login_required(login_url='/accounts/login/')
+    @conditional_page(lambda request, pk: rows_state(
+        Hostel.objects.filter(pk=pk),
+        Unit.objects.filter(hostel=OuterRef('pk')),
+    ))
+    def hostel_detail(request, pk):
+        ...
+
+Writes that bypass save() (queryset.update()) must set updated_at themselves
+for the page to notice them.
+"""
+import hashlib
+from functools import reduce, wraps
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.db.models import Count, DateTimeField, IntegerField, Max, OuterRef, Q, Subquery, Value
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from backend.data_versions import get_data_versions, versions_shared
+
+# Rendered into every page for non-superusers by targets.context_processors.current_target_context
+HEADER_MODELS = ('targets.Target', 'targets.RentalContract', 'targets.TargetProgressSnapshot')
+
+
+def rows_state(queryset, *related):
+    """
+    (latest updated_at, row count) over queryset's rows plus the related querysets,
+    in one query. Related querysets are correlated subqueries of the base rows,
+    e.g. Unit.objects.filter(hostel=OuterRef('pk')). latest is None when nothing matched.
+    """
+    queryset = queryset.order_by()
+    if not related:
+        state = queryset.aggregate(latest=Max('updated_at'), rows=Count('pk'))
+        return state['latest'], state['rows']
+
+    annotations = {}
+    for i, rows in enumerate(related):
+        # Constant values() keeps the subquery a single ungrouped aggregate
+        rows = rows.order_by().values(_all=Value(1))
+        annotations[f'latest_{i}'] = Subquery(rows.annotate(v=Max('updated_at')).values('v'), output_field=DateTimeField())
+        annotations[f'rows_{i}'] = Subquery(rows.annotate(v=Count('pk')).values('v'), output_field=IntegerField())
+    # One row per base object (detail pages: exactly one); aggregating over the
+    # subquery annotations instead loses them when Django wraps the query
+    states = list(queryset.annotate(**annotations).values('updated_at', *annotations))
+    if not states:
+        return None, 0
+
+    latest = max(
+        value for state in states for key, value in state.items()
+        if not key.startswith('rows_') and value is not None
+    )
+    rows = len(states) + sum(value or 0 for state in states for key, value in state.items() if key.startswith('rows_'))
+    return latest, rows
+
+
+def users_shown(*fields):
+    """
+    Correlated subquery of the users a base row points at, for rows_state(),
+    e.g. users_shown('hostel_manager_id'). created_by and updated_by are always included.
+    """
+    fields = ('created_by_id', 'updated_by_id', *fields)
+    return get_user_model().objects.filter(reduce(or_, (Q(pk=OuterRef(field)) for field in fields)))
+
+
+def merge_states(*states):
+    """Combine rows_state() results of unrelated querysets; latest is None if the first is"""
+    if states[0][0] is None:
+        return None, 0
+    latest = max(latest for latest, rows in states if latest is not None)
+    return latest, sum(rows for latest, rows in states)
+
+
+def _has_pending_messages(request):
+    # A 304 would show the cached page without them
+    return bool(len(get_messages(request)))
+
+
+def _page_etag(request, latest, rows):
+    user = request.user
+    parts = [
+        request.session.session_key or '',  # per user and per login (the CSRF token rotates with it)
+        user.pk,
+        timezone.localdate().isoformat(),
+        latest.isoformat(),
+        rows,
+    ]
+    if not user.is_superuser:
+        parts += get_data_versions(*HEADER_MODELS)
+    return quote_etag(hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest())
+
+
+def conditional_page(page_state):
+    """
+    Answer If-None-Match / If-Modified-Since before running the view.
+    page_state(request, *args, **kwargs) returns rows_state(...) for the rows the page shows.
+    The ETag varies per user session and day; responses are private and always revalidated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or _has_pending_messages(request):
+                return view(request, *args, **kwargs)
+            if not (request.user.is_superuser or versions_shared()):
+                # The header's data versions are per worker here and cannot prove the page unchanged
+                return view(request, *args, **kwargs)
+
+            latest, rows = page_state(request, *args, **kwargs)
+            if latest is None:
+                # Missing object: let the view raise its 404
+                return view(request, *args, **kwargs)
+
+            etag = _page_etag(request, latest, rows)
+            last_modified = int(latest.timestamp())
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers.setdefault('ETag', etag)
+                    response.headers.setdefault('Last-Modified', http_date(last_modified))
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,149 @@
+"""
+Per-model data versions for template fragment caching.
+
+Every tracked model has a version number in the cache that is bumped after
+each committed save/delete. {% versioned_cache %} keys rendered fragments on
+the versions of the models they show, so a fragment is reused by every staff
+member until one of those tables actually changes; stale entries are never
+read again and simply expire.
+
+    {% load data_versions %}
+    {% versioned_cache "hostel_table" "hostel.Hostel hostel.Bed" query %}
+        ... expensive table ...
+    {% endversioned_cache %}
+
+Signals do not fire for queryset.update() or bulk_create(); code that writes
+that way must call bump_data_version() for the models it touched.
+
+Versions are only meaningful in a cache shared by all workers (Redis). Without
+one (DATA_VERSIONS_SHARED is False) fragments are rendered on every request.
+"""
+import time
+
+from django import template
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from backend.db_routing import reading_from_replica
+
+register = template.Library()
+
+
+def _version_key(label):
+    return f"data-version:{label}"
+
+
+def _label(model):
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    return model._meta.label_lower
+
+
+def _initial_version():
+    # Start from the clock rather than 1, so a version that was evicted from the
+    # cache never comes back with a number that old fragments were stored under
+    return time.time_ns()
+
+
+def versions_shared():
+    """True when every worker reads the same versions, so they can key cached output"""
+    return settings.DATA_VERSIONS_SHARED
+
+
+def get_data_versions(*models):
+    """Current version of each model (Model class or "app_label.Model"), in order"""
+    labels = [_label(model) for model in models]
+    keys = [_version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(labels):
+    for label in labels:
+        key = _version_key(label)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), timeout=None)
+
+
+def bump_data_version(*models):
+    """
+    Invalidate cached fragments that depend on the given models. Runs after the
+    current transaction commits, so no request can cache the old rows under the
+    new version.
+    """
+    labels = {_label(model) for model in models}
+    transaction.on_commit(lambda: _bump(labels))
+
+
+def _bump_sender(sender, update_fields=None, **kwargs):
+    # Logging in saves only last_login, which no fragment shows
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_data_version(sender)
+
+
+def track_data_versions(app_config):
+    """Bump a model's version on every save/delete of the app's models. Call from AppConfig.ready()"""
+    for model in app_config.get_models():
+        uid = f"data_versions:{model._meta.label_lower}"
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=uid)
+
+
+class VersionedCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, models, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.models = models
+        self.vary_on = vary_on
+
+    def render(self, context):
+        if not versions_shared():
+            return self.nodelist.render(context)
+        fragment_name = self.fragment_name.resolve(context)
+        versions = get_data_versions(*self.models.resolve(context).split())
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        key = make_template_fragment_key(fragment_name, versions + vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            timeout = settings.FRAGMENT_CACHE_TIMEOUT
+            if reading_from_replica():
+                # A lagging replica can render rows older than the versions in the key
+                timeout = min(timeout, settings.REPLICA_FRAGMENT_CACHE_TIMEOUT)
+            cache.set(key, value, timeout)
+        return value
+
+
+@register.tag('versioned_cache')
+def do_versioned_cache(parser, token):
+    """
+    Cache the enclosed fragment until one of the listed models changes.
+
+        {% versioned_cache fragment_name "app.Model app.Other" [vary_on ...] %} ... {% endversioned_cache %}
+
+    vary_on values (filters, page number, today's date) are part of the key,
+    like Django's {% cache %}. Only cache markup that is the same for every user
+    allowed to see the page.
+    """
+    nodelist = parser.parse(('endversioned_cache',))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name and a list of models.")
+    return VersionedCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+    )
@@ -0,0 +1,97 @@
+"""
+Read-replica routing for reporting traffic.
+
+Writes always go to "default". Reads go to the "replica" database only inside
+use_replica() (background jobs, management commands) or a view decorated with
+@replica_reads, so rent posting and other read-modify-write code paths never
+see replication lag.
+
+    @login_required(login_url='/accounts/login/')
+    @replica_reads
+    def revenues(request):
+        ...
+
+    with use_replica():
+        build_report()
+
+After a browser submits a form, ReplicaStickinessMiddleware sets a short-lived
+cookie and @replica_reads keeps that browser's reads on the primary until it
+expires, so a user always sees their own writes. Without DATABASE_REPLICA_URL
+there is no "replica" alias and everything reads from the primary.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+STICKY_COOKIE_NAME = 'primary_until'
+
+_reading_from_replica = ContextVar('reading_from_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def reading_from_replica():
+    """True while reads in the current thread/context are routed to the replica"""
+    return _reading_from_replica.get() and replica_configured()
+
+
+@contextmanager
+def use_replica():
+    """Route ORM reads inside the block to the replica (a no-op when none is configured)"""
+    token = _reading_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+
+def _recently_wrote(request):
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE_NAME, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_reads(view):
+    """
+    Serve GET/HEAD requests of a reporting view from the replica, unless this
+    browser wrote something within the last REPLICA_STICKY_SECONDS.
+    Put it below login_required/permission_required so auth still reads the primary.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or _recently_wrote(request):
+            return view(request, *args, **kwargs)
+        with use_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send reads to the replica inside use_replica(); everything else uses the primary"""
+
+    def db_for_read(self, model, **hints):
+        if not reading_from_replica():
+            return None
+        # A read inside a primary transaction must see that transaction's writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so rows from either may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication
+        return db != REPLICA_DB_ALIAS
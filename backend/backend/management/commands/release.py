@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 72_460_042
+
+
+@contextmanager
+def migration_lock():
+    """Hold a PostgreSQL session advisory lock so concurrent releases apply migrations one at a time"""
+    if connection.vendor != 'postgresql':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+
+class Command(BaseCommand):
+    help = (
+        "Release phase: apply migrations under a database lock. Run once per deploy "
+        "(the release service in docker-compose.prod.yml) instead of on every web container start."
+    )
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+        with migration_lock():
+            call_command('migrate', interactive=False, verbosity=verbosity)
+        self.stdout.write(self.style.SUCCESS("Release complete."))
@@ -1,16 +1,24 @@
 import time
+from django.conf import settings
 from django.contrib.auth import logout
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.urls import reverse
+from audit.audit_helpers.trail import audit_batch
+from backend.db_routing import STICKY_COOKIE_NAME, replica_configured
 
 class SessionTimeoutMiddleware:
     """
     Middleware to handle session timeout after 20 minutes of inactivity.
+
+    The last activity timestamp is only refreshed once per
+    SESSION_ACTIVITY_WRITE_INTERVAL seconds, so requests inside that window
+    leave the session unmodified and trigger no session write.
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.write_interval = getattr(settings, 'SESSION_ACTIVITY_WRITE_INTERVAL', 60)
         
     def __call__(self, request):
         # Check if user is authenticated
@@ -19,17 +27,57 @@ class SessionTimeoutMiddleware:
             current_time = time.time()
             
             # Get last activity timestamp from session
-            last_activity = request.session.get('last_activity', current_time)
+            last_activity = request.session.get('last_activity')
             
             # Check if 20 minutes (1200 seconds) have passed since last activity
-            if current_time - last_activity > 1200:
+            if last_activity is not None and current_time - last_activity > 1200:
                 # Session expired, logout user
                 logout(request)
                 messages.warning(request, 'Your session has expired due to inactivity. Please log in again.')
                 return redirect(reverse('login'))
             
-            # Update last activity timestamp
-            request.session['last_activity'] = current_time
+            # Update last activity timestamp (coarsened to the write interval)
+            if last_activity is None or current_time - last_activity >= self.write_interval:
+                request.session['last_activity'] = current_time
             
         response = self.get_response(request)
         return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keep a browser's reporting reads on the primary database for
+    REPLICA_STICKY_SECONDS after it submits a write, so replication lag never
+    hides the user's own changes from pages decorated with @replica_reads.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE') and replica_configured():
+            response.set_cookie(
+                STICKY_COOKIE_NAME,
+                str(int(time.time()) + self.sticky_seconds),
+                max_age=self.sticky_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class AuditTrailMiddleware:
+    """
+    Collect the audit entries of everything a request changes and write them
+    in a single insert once the response is ready (see audit.audit_helpers.trail).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_batch(user=getattr(request, 'user', None)):
+            return self.get_response(request)
@@ -0,0 +1,36 @@
+import mimetypes
+import os
+from urllib.parse import quote
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.static import serve
+
+
+def serve_protected(request, field_file):
+    """
+    Send a private MEDIA_ROOT file once the caller has checked permissions.
+
+    Behind nginx the response is an empty X-Accel-Redirect to the `internal`
+    PROTECTED_MEDIA_ACCEL_PREFIX location, so nginx streams the file and
+    handles Range, ETag and Last-Modified itself with no Python I/O.
+    Without nginx (development) Django serves it, with Last-Modified/304 support.
+    """
+    if not field_file:
+        raise Http404("Document not found")
+
+    # FieldFile names are storage-relative; refuse anything that climbs out of MEDIA_ROOT
+    name = os.path.normpath(field_file.name).replace('\\', '/')
+    if name.startswith(('../', '/')) or name == '..':
+        raise Http404("Document not found")
+
+    if settings.PROTECTED_MEDIA_USE_ACCEL:
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.PROTECTED_MEDIA_ACCEL_PREFIX + name)
+    else:
+        response = serve(request, name, document_root=settings.MEDIA_ROOT)
+
+    response['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(os.path.basename(name))}"
+    # Browsers may keep a copy but must revalidate (ETag/Last-Modified); shared caches must not store it
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -43,11 +43,16 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'backend',  # Project-wide management commands (release)
     'accounts', #include custom app 
     'hostel',
     'customer',
     'finance',
     'targets',  # Target management app
+    'analytics',  # Monthly hostel occupancy/revenue cube
+    'api',  # Read-only JSON sync API
+    'imports',  # Bulk CSV/XLSX imports
+    'audit',  # Field-level change history of financial records
     'django_countries', # this is for display all the country name
     'send_mail',
 ]
@@ -67,6 +72,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'backend.middleware.SessionTimeoutMiddleware',  # Custom session timeout middleware
+    'backend.middleware.ReplicaStickinessMiddleware',  # Read-your-writes for replica-routed views
+    'backend.middleware.AuditTrailMiddleware',  # One audit-trail insert per request
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -84,6 +91,9 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'targets.context_processors.current_target_context',
             ],
+            'libraries': {
+                'data_versions': 'backend.data_versions',
+            },
         },
     },
 ]
@@ -97,16 +107,44 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Determine if we're in production
 IS_PRODUCTION = os.environ.get("DJANGO_DEBUG", "False") != "True"
 
+# Connection lifecycle
+# "persistent": keep each worker's connection open for DB_CONN_MAX_AGE seconds,
+#               health-checked before reuse (default)
+# "pgbouncer":  connect through the pgbouncer service (docker-compose.prod.yml,
+#               profile "pgbouncer") which pools server connections in transaction mode
+# "none":       open and close a connection per request (previous behaviour)
+DB_POOL_MODE = os.environ.get("DJANGO_DB_POOL_MODE", "persistent").lower()
+DB_CONN_MAX_AGE = int(os.environ.get("DJANGO_DB_CONN_MAX_AGE", "600"))
+DB_CONN_HEALTH_CHECKS = os.environ.get("DJANGO_DB_CONN_HEALTH_CHECKS", "True").lower() == "true"
+
+
+def database_from_url():
+    """Build the default database settings from DATABASE_URL for the configured pool mode"""
+    if DB_POOL_MODE == "none":
+        return dj_database_url.config(conn_max_age=0)
+
+    database = dj_database_url.config(
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
+    if DB_POOL_MODE == "pgbouncer" and database:
+        database['HOST'] = os.environ.get("DJANGO_DB_POOL_HOST", "pgbouncer")
+        database['PORT'] = os.environ.get("DJANGO_DB_POOL_PORT", "5432")
+        # Transaction pooling cannot keep server-side cursors open across statements
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return database
+
+
 # Check if DATABASE_URL is set (for both dev and prod)
 if os.environ.get("DATABASE_URL"):
     # Use DATABASE_URL if available
     DATABASES = {
-        'default': dj_database_url.config()
+        'default': database_from_url()
     }
 elif IS_PRODUCTION:
     # Use PostgreSQL or whatever is set in DATABASE_URL
     DATABASES = {
-        'default': dj_database_url.config()
+        'default': database_from_url()
     }
 else:
     # Use SQLite for local development (fallback)
@@ -116,6 +154,23 @@ else:
             'NAME': BASE_DIR / "db.sqlite3",
         }
     }
+
+# Optional streaming replica (docker-compose.prod.yml, profile "replica") for reporting
+# views and exports wrapped in backend.db_routing; writes always go to the primary.
+# Without it, every read uses the primary.
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES['replica'] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"],
+        conn_max_age=0 if DB_POOL_MODE == "none" else DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+    )
+    # Tests run against one database; reads routed to the replica see the same rows
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['backend.db_routing.ReplicaRouter']
+
+# How long a browser keeps reading from the primary after submitting a write
+REPLICA_STICKY_SECONDS = int(os.environ.get("DJANGO_REPLICA_STICKY_SECONDS", "10"))
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -156,20 +211,82 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 #for production
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Production collectstatic writes content-hashed names plus .gz/.br siblings, so nginx can serve
+# /static/ as immutable with gzip_static. Development serves the unhashed source files.
+STATICFILES_STORAGE_BACKEND = os.environ.get(
+    "DJANGO_STATICFILES_STORAGE",
+    "django.contrib.staticfiles.storage.StaticFilesStorage" if DEBUG else "backend.storage.CompressedManifestStaticFilesStorage",
+)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": STATICFILES_STORAGE_BACKEND},
+    # Customer documents: stored by SHA-256 so identical uploads share one file (see backend.storage)
+    "documents": {"BACKEND": "backend.storage.ContentAddressedStorage"},
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Unreferenced documents younger than this are kept, so gc_media never races an upload whose row
+# has not committed yet
+MEDIA_GC_GRACE_SECONDS = int(os.environ.get("DJANGO_MEDIA_GC_GRACE_SECONDS", "3600"))
+
+# Customer documents are never served from the public /media/ location. After the permission
+# check Django hands the transfer to nginx via X-Accel-Redirect to this `internal` location;
+# with the accel handoff off (development, no nginx) Django streams the file itself.
+PROTECTED_MEDIA_ACCEL_PREFIX = os.environ.get("DJANGO_PROTECTED_MEDIA_ACCEL_PREFIX", "/protected-media/")
+PROTECTED_MEDIA_USE_ACCEL = os.environ.get("DJANGO_PROTECTED_MEDIA_ACCEL", str(not DEBUG)).lower() == "true"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Shared Redis cache when REDIS_URL is set, per-process memory cache otherwise
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Session Configuration
 # Sessions expire after 30 minutes of inactivity
+# Sessions are read from the cache and only written through to the database when they change
+SESSION_ENGINE = os.environ.get("DJANGO_SESSION_ENGINE", "django.contrib.sessions.backends.cached_db")
 SESSION_COOKIE_AGE = 2000  # 30 minutes in seconds
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
-SESSION_SAVE_EVERY_REQUEST = True  # Extend session on each request
+SESSION_SAVE_EVERY_REQUEST = False  # Expiry is extended when SessionTimeoutMiddleware refreshes last_activity
 SESSION_IDLE_TIMEOUT = 2000  # 30 minutes in seconds
+SESSION_ACTIVITY_WRITE_INTERVAL = int(os.environ.get("DJANGO_SESSION_ACTIVITY_WRITE_INTERVAL", "60"))  # Refresh last_activity at most once per interval
+
+# Data versions must be seen by every worker: with the per-process fallback cache a write would only
+# invalidate the worker that handled it, so {% versioned_cache %} renders uncached without Redis
+DATA_VERSIONS_SHARED = bool(REDIS_URL)
+# {% versioned_cache %} fragments are keyed on data versions, so this only bounds how long unused ones linger
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("DJANGO_FRAGMENT_CACHE_TIMEOUT", "86400"))
+# Fragments rendered from the replica may predate the version they are stored under; keep them briefly
+REPLICA_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("DJANGO_REPLICA_FRAGMENT_CACHE_TIMEOUT", "60"))
+
+# Admin changelists above this many rows paginate on the PostgreSQL planner estimate instead of COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get("DJANGO_ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000"))
+
+# Read-only sync API (api/): page sizes and bearer token lifetime (python manage.py api_token)
+API_PAGE_SIZE = int(os.environ.get("DJANGO_API_PAGE_SIZE", "100"))
+API_MAX_PAGE_SIZE = int(os.environ.get("DJANGO_API_MAX_PAGE_SIZE", "1000"))
+API_TOKEN_MAX_AGE = int(os.environ.get("DJANGO_API_TOKEN_MAX_AGE", str(90 * 24 * 3600)))
+# Rows changed more recently than this are left for the next sync, so a slow transaction that commits
+# after a client received a later cursor is not skipped; keep it above the longest write transaction
+API_SYNC_LAG_SECONDS = int(os.environ.get("DJANGO_API_SYNC_LAG_SECONDS", "60"))
 
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import io
+import logging
+import os
+import posixpath
+import time
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; only .gz siblings are written without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+
+# Below this size the compressed file plus headers is rarely smaller
+MIN_COMPRESS_SIZE = 256
+
+# Names looked up per query when checking which files are still referenced
+REFERENCE_BATCH_SIZE = 1000
+
+
+def gzip_bytes(data):
+    buffer = io.BytesIO()
+    # mtime=0 keeps the output identical between builds of the same file
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9, mtime=0) as gz:
+        gz.write(data)
+    return buffer.getvalue()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest (content-hashed) static storage that also writes .gz and .br
+    siblings of each hashed text file during collectstatic, for nginx gzip_static.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = []
+        for original_name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.append(hashed_name)
+            yield original_name, hashed_name, processed
+
+        if dry_run:
+            return
+
+        compressed = 0
+        for name in dict.fromkeys(hashed_names):
+            compressed += self.compress(name)
+        logger.info(f"Wrote {compressed} precompressed static file(s)")
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return 0
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return 0
+
+        written = 0
+        encoders = [('.gz', gzip_bytes)]
+        if brotli is not None:
+            encoders.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+        for suffix, encode in encoders:
+            encoded = encode(data)
+            if len(encoded) >= len(data):
+                continue
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            self.save(target, ContentFile(encoded))
+            written += 1
+        return written
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Media storage that names each upload after the SHA-256 of its content,
+    inside the field's upload_to directory:
+
+        documents/passports/3f/3fa9...e1.pdf
+
+    Identical uploads share one file and are never written twice. Files are not
+    deleted when a row stops using them; release_unreferenced() and
+    manage.py gc_media remove them once no row refers to them.
+    """
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        directory, filename = posixpath.split(name)
+        hexdigest = digest.hexdigest()
+        name = posixpath.join(directory, hexdigest[:2], hexdigest + os.path.splitext(filename)[1].lower())
+        if self.exists(name):
+            # Restart the garbage-collection grace period: a row is about to refer to it
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
+
+
+def document_storage():
+    """Storage of private customer documents (STORAGES["documents"])"""
+    return storages['documents']
+
+
+def content_addressed_fields():
+    """(model, FileField) for every file field stored in a ContentAddressedStorage"""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage):
+                yield model, field
+
+
+def referenced_names(names):
+    """The subset of names that some row's content-addressed file field still refers to"""
+    names = list(names)
+    referenced = set()
+    for model, field in content_addressed_fields():
+        for start in range(0, len(names), REFERENCE_BATCH_SIZE):
+            batch = names[start:start + REFERENCE_BATCH_SIZE]
+            referenced.update(
+                model._base_manager.filter(**{f'{field.name}__in': batch}).values_list(field.name, flat=True)
+            )
+    return referenced
+
+
+def is_idle(storage, name, grace=None):
+    """True when the file has not been written or re-uploaded for the grace period"""
+    grace = settings.MEDIA_GC_GRACE_SECONDS if grace is None else grace
+    return time.time() - os.path.getmtime(storage.path(name)) >= grace
+
+
+def release_unreferenced(names):
+    """
+    Delete the given document files when no row refers to them any more.
+    Recently written files are left for gc_media, since an upload of the same
+    content may not have committed its row yet. Returns the number deleted.
+    """
+    names = {name for name in names if name}
+    storage = document_storage()
+    removed = 0
+    for name in names - referenced_names(names):
+        try:
+            if storage.exists(name) and is_idle(storage, name):
+                storage.delete(name)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Could not release {name}: {e}")
+    return removed
+
+
+def _release_deleted_files(sender, instance, **kwargs):
+    names = [
+        getattr(instance, field.attname).name
+        for field in sender._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+    if any(names):
+        transaction.on_commit(lambda: release_unreferenced(names))
+
+
+def track_content_addressed_files(app_config):
+    """Release a deleted row's content-addressed files. Call from AppConfig.ready()"""
+    for model in app_config.get_models():
+        post_delete.connect(_release_deleted_files, sender=model, dispatch_uid=f"documents:{model._meta.label_lower}")
@@ -0,0 +1,177 @@
+import datetime
+import threading
+import time
+import warnings
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.sessions.backends.cache import SessionStore
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from backend.admin_performance import EstimatedCountPaginator, estimated_count
+from backend.background import run_in_background, wait_for_background_tasks
+from backend.conditional import conditional_page
+from backend.data_versions import bump_data_version
+from backend.db_routing import STICKY_COOKIE_NAME, ReplicaRouter, reading_from_replica, replica_reads, use_replica
+from backend.middleware import ReplicaStickinessMiddleware
+from hostel.models import Hostel
+
+FRAGMENT = Template('{% load data_versions %}{% versioned_cache "test" "hostel.Hostel" %}{{ value }}{% endversioned_cache %}')
+
+
+class VersionedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def render(self, value):
+        return FRAGMENT.render(Context({'value': value}))
+
+    @override_settings(DATA_VERSIONS_SHARED=True)
+    def test_fragment_is_reused_until_a_listed_model_changes(self):
+        self.assertEqual(self.render('first'), 'first')
+        self.assertEqual(self.render('second'), 'first')
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version('hostel.Hostel')
+        self.assertEqual(self.render('third'), 'third')
+
+    @override_settings(DATA_VERSIONS_SHARED=False)
+    def test_fragment_is_not_cached_without_a_shared_cache(self):
+        self.assertEqual(self.render('first'), 'first')
+        self.assertEqual(self.render('second'), 'second')
+
+
+@conditional_page(lambda request: (timezone.make_aware(datetime.datetime(2026, 1, 1)), 1))
+def page(request):
+    return HttpResponse('page')
+
+
+class ConditionalPageTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='staff@fishtail.jp', password='x')
+
+    def get(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        request.user = self.user
+        request.session = SessionStore()
+        request._messages = []
+        return page(request)
+
+    @override_settings(DATA_VERSIONS_SHARED=True)
+    def test_current_copy_gets_304(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    @override_settings(DATA_VERSIONS_SHARED=False)
+    def test_staff_pages_are_rendered_without_shared_versions(self):
+        response = self.get()
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2027 00:00:00 GMT').status_code, 200)
+
+
+class EstimatedCountTests(TestCase):
+    def setUp(self):
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            Hostel.objects.create(
+                name=name, hostel_type='boys', total_rooms=3, address='-',
+                deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+            )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Hostel._meta.db_table}")
+
+    @skipUnless(connection.vendor == 'postgresql', 'Row estimates come from pg_class')
+    def test_unfiltered_list_uses_the_table_estimate(self):
+        self.assertEqual(estimated_count(Hostel.objects.all()), 3)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_searched_list_is_counted_exactly(self):
+        searched = Hostel.objects.filter(name__icontains='alp').order_by('pk')
+        self.assertIsNone(estimated_count(searched))
+        self.assertEqual(EstimatedCountPaginator(searched, 100).count, 1)
+
+
+# The replica alias as settings.py builds it from DATABASE_REPLICA_URL: a mirror of default under test.
+# Only the router reads these overrides; connections keep the databases set up by the test runner.
+PRIMARY_ONLY = {'default': settings.DATABASES['default']}
+WITH_REPLICA = {**PRIMARY_ONLY, 'replica': {**settings.DATABASES['default'], 'TEST': {'MIRROR': 'default'}}}
+warnings.filterwarnings('ignore', 'Overriding setting DATABASES', UserWarning)
+
+
+@replica_reads
+def report(request):
+    return HttpResponse('replica' if reading_from_replica() else 'primary')
+
+
+@override_settings(DATABASES=WITH_REPLICA)
+class ReplicaRoutingTests(SimpleTestCase):
+    # Queries are allowed, but not wrapped in a transaction the router would keep on the primary
+    databases = {'default'}
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_use_the_replica_only_inside_use_replica(self):
+        self.assertIsNone(self.router.db_for_read(Hostel))
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Hostel), 'replica')
+            self.assertEqual(self.router.db_for_write(Hostel), 'default')
+        self.assertIsNone(self.router.db_for_read(Hostel))
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+        with use_replica(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Hostel), 'default')
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'hostel'))
+        self.assertTrue(self.router.allow_migrate('default', 'hostel'))
+
+    def test_without_a_replica_everything_reads_the_primary(self):
+        with override_settings(DATABASES=PRIMARY_ONLY), use_replica():
+            self.assertIsNone(self.router.db_for_read(Hostel))
+
+    def test_reporting_views_read_the_replica(self):
+        factory = RequestFactory()
+        self.assertEqual(report(factory.get('/')).content, b'replica')
+        self.assertEqual(report(factory.post('/')).content, b'primary')
+
+    def test_recent_writers_stick_to_the_primary(self):
+        factory = RequestFactory()
+        request = factory.get('/')
+        request.COOKIES[STICKY_COOKIE_NAME] = str(int(time.time()) + 10)
+        self.assertEqual(report(request).content, b'primary')
+        request.COOKIES[STICKY_COOKIE_NAME] = str(int(time.time()) - 1)
+        self.assertEqual(report(request).content, b'replica')
+
+    @override_settings(REPLICA_STICKY_SECONDS=10)
+    def test_writes_set_the_sticky_cookie(self):
+        middleware = ReplicaStickinessMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+        cookie = middleware(factory.post('/')).cookies[STICKY_COOKIE_NAME]
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertAlmostEqual(int(cookie.value), time.time() + 10, delta=2)
+        self.assertNotIn(STICKY_COOKIE_NAME, middleware(factory.get('/')).cookies)
+
+
+class BackgroundTaskTests(TestCase):
+    def test_exiting_worker_waits_for_running_tasks(self):
+        release, done = threading.Event(), threading.Event()
+
+        def task():
+            release.wait(5)
+            done.set()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_in_background(task)
+        with self.assertLogs('backend.background', 'WARNING') as logs:
+            self.assertEqual(wait_for_background_tasks(timeout=0.05), 1)
+        self.assertIn('Worker exiting with 1 background task(s) still running', logs.output[0])
+        release.set()
+        self.assertEqual(wait_for_background_tasks(timeout=5), 0)
+        self.assertTrue(done.is_set())
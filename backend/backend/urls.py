@@ -27,6 +27,10 @@ urlpatterns = [
     path('finance/', include('finance.urls')),
     path('targets/', include('targets.urls')),
     path('send_mail/', include('send_mail.urls')),
+    path('analytics/', include('analytics.urls')),
+    path('api/v1/', include('api.urls')),
+    path('imports/', include('imports.urls')),
+    path('audit/', include('audit.urls')),
 ]
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
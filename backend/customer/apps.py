@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CustomerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'customer'
+
+    def ready(self):
+        from backend.data_versions import track_data_versions
+        from backend.storage import track_content_addressed_files
+        track_data_versions(self)
+        track_content_addressed_files(self)
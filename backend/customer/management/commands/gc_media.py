@@ -0,0 +1,71 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from backend.storage import REFERENCE_BATCH_SIZE, content_addressed_fields, document_storage, is_idle, referenced_names
+
+
+def walk_files(root):
+    """Yield every file under root as a path relative to it, one directory at a time"""
+    stack = ['']
+    while stack:
+        relative = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                name = f"{relative}/{entry.name}" if relative else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield name
+
+
+def batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete document files under MEDIA_ROOT that no row refers to any more "
+        "(replaced or cleared uploads, deleted customers). Run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+        parser.add_argument('--grace', type=int, help='Keep files written within this many seconds (default MEDIA_GC_GRACE_SECONDS)')
+
+    def handle(self, *args, **options):
+        storage = document_storage()
+        directories = sorted({field.upload_to for model, field in content_addressed_fields()})
+
+        scanned = removed = freed = 0
+        for directory in directories:
+            names = (f"{directory.rstrip('/')}/{name}" for name in walk_files(storage.path(directory)))
+            # Files are checked against the database a batch at a time, so memory stays flat
+            for batch in batches(names, REFERENCE_BATCH_SIZE):
+                scanned += len(batch)
+                live = referenced_names(batch)
+                for name in batch:
+                    if name in live or not is_idle(storage, name, options['grace']):
+                        continue
+                    freed += storage.size(name)
+                    removed += 1
+                    if options['dry_run']:
+                        self.stdout.write(f"  would delete {name}")
+                    else:
+                        storage.delete(name)
+
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} file(s) in {', '.join(directories)}. {verb} {removed} file(s), {freed / 1024 / 1024:.1f} MB."
+        ))
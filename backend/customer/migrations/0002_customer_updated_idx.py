@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['updated_at', 'id'], name='customer_updated_idx'),
+        ),
+    ]
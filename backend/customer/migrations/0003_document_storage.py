@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-19 17:00
+
+import backend.storage
+import customer.models
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0002_customer_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='passport_pdf',
+            field=models.FileField(blank=True, null=True, storage=backend.storage.document_storage, upload_to='documents/passports/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf']), customer.models.validate_file_size]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='student_card_pdf',
+            field=models.FileField(blank=True, null=True, storage=backend.storage.document_storage, upload_to='documents/student_cards/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf']), customer.models.validate_file_size]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='zairyu_card_pdf',
+            field=models.FileField(blank=True, null=True, storage=backend.storage.document_storage, upload_to='documents/zairyu_cards/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf']), customer.models.validate_file_size]),
+        ),
+    ]
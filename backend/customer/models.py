@@ -4,6 +4,7 @@ from django_countries.fields import CountryField  # type: ignore
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator
 from django.core.validators import RegexValidator
+from backend.storage import document_storage
 
 
 User = get_user_model()
@@ -76,6 +77,7 @@ class Customer(TimeStampedUserModel):
     zairyu_card_expire_date = models.DateField()
     zairyu_card_pdf = models.FileField(
         upload_to='documents/zairyu_cards/',
+        storage=document_storage,
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf']),
             validate_file_size
@@ -85,6 +87,7 @@ class Customer(TimeStampedUserModel):
     )
     passport_pdf = models.FileField(
         upload_to='documents/passports/',
+        storage=document_storage,
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf']),
             validate_file_size
@@ -94,6 +97,7 @@ class Customer(TimeStampedUserModel):
     )
     student_card_pdf = models.FileField(
         upload_to='documents/student_cards/',
+        storage=document_storage,
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf']),
             validate_file_size
@@ -114,6 +118,8 @@ class Customer(TimeStampedUserModel):
         return f"{self.name} - {self.date_of_birth}"
 
     class Meta:
+        # Keyset order of the sync API (api/)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='customer_updated_idx')]
         constraints = [
             models.UniqueConstraint(fields=['status','name', 'date_of_birth'], name='unique_customer_name_dob_status')
         ]
\ No newline at end of file
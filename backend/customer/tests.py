@@ -0,0 +1,137 @@
+import datetime
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from backend.storage import document_storage, release_unreferenced
+from customer.models import Customer
+
+PASSPORT = b'%PDF-1.4 passport'
+RENEWED = b'%PDF-1.4 renewed passport'
+
+
+def pdf(content, name='scan.PDF'):
+    return SimpleUploadedFile(name, content, content_type='application/pdf')
+
+
+def make_customer(n, **documents):
+    return Customer.objects.create(
+        name=f'Customer {n}', date_of_birth=datetime.date(2000, 1, 1), email=f'c{n}@example.com',
+        phone_number='09012345678', nationality='NP', home_address='-', parent_phone_number='09012345678',
+        visa_type='Student', workplace_or_school_name='-', workplace_or_school_address='-',
+        workplace_or_school_phone='-', zairyu_card_number='-', zairyu_card_expire_date=datetime.date(2030, 1, 1),
+        **documents,
+    )
+
+
+class DocumentStorageTestCase(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        # No grace period unless a test asks for one, so released files go at once
+        self.enterContext(override_settings(MEDIA_ROOT=media, MEDIA_GC_GRACE_SECONDS=0))
+        self.storage = document_storage()
+
+    def exists(self, name):
+        return self.storage.exists(name)
+
+
+class ContentAddressedStorageTests(DocumentStorageTestCase):
+    def test_files_are_named_after_their_content(self):
+        digest = hashlib.sha256(PASSPORT).hexdigest()
+        name = self.storage.save('documents/passports/scan.PDF', ContentFile(PASSPORT))
+        self.assertEqual(name, f'documents/passports/{digest[:2]}/{digest}.pdf')
+
+    def test_identical_uploads_share_one_file(self):
+        first = make_customer(1, passport_pdf=pdf(PASSPORT))
+        second = make_customer(2, passport_pdf=pdf(PASSPORT, name='other.pdf'))
+        self.assertEqual(first.passport_pdf.name, second.passport_pdf.name)
+        directory = os.path.dirname(self.storage.path(first.passport_pdf.name))
+        self.assertEqual(os.listdir(directory), [os.path.basename(first.passport_pdf.name)])
+
+    def test_reupload_restarts_the_grace_period(self):
+        name = self.storage.save('documents/passports/scan.pdf', ContentFile(PASSPORT))
+        os.utime(self.storage.path(name), (0, 0))
+        self.storage.save('documents/passports/scan.pdf', ContentFile(PASSPORT))
+        self.assertGreater(os.path.getmtime(self.storage.path(name)), 0)
+
+
+class ReleaseDocumentTests(DocumentStorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(CustomUser.objects.create_user(email='staff@fishtail.jp', password='x'))
+
+    def edit(self, customer, **files):
+        data = {
+            'name': customer.name, 'date_of_birth': '2000-01-01', 'email': customer.email,
+            'phone_number': '09012345678', 'nationality': 'NP', 'home_address': '-',
+            'parent_phone_number': '09012345678', 'visa_type': 'Student', 'workplace_or_school_name': '-',
+            'workplace_or_school_address': '-', 'workplace_or_school_phone': '-', 'zairyu_card_number': '-',
+            'zairyu_card_expire_date': '2030-01-01', 'status': 'on', **files,
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('customer:customer_edit', args=[customer.pk]), data)
+        self.assertRedirects(response, reverse('customer:dashboard'), fetch_redirect_response=False)
+
+    def test_replaced_document_is_released_once_unused(self):
+        first = make_customer(1, passport_pdf=pdf(PASSPORT))
+        second = make_customer(2, passport_pdf=pdf(PASSPORT))
+        old_name = first.passport_pdf.name
+
+        self.edit(first, passport_pdf=pdf(RENEWED))
+        # The second customer still refers to the same file
+        self.assertTrue(self.exists(old_name))
+
+        self.edit(second, passport_pdf=pdf(RENEWED))
+        self.assertFalse(self.exists(old_name))
+        second.refresh_from_db()
+        self.assertTrue(self.exists(second.passport_pdf.name))
+
+    def test_deleted_customer_releases_its_documents(self):
+        customer = make_customer(1, passport_pdf=pdf(PASSPORT))
+        name = customer.passport_pdf.name
+        with self.captureOnCommitCallbacks(execute=True):
+            customer.delete()
+        self.assertFalse(self.exists(name))
+
+    @override_settings(MEDIA_GC_GRACE_SECONDS=3600)
+    def test_recent_files_are_left_for_gc_media(self):
+        name = self.storage.save('documents/passports/scan.pdf', ContentFile(PASSPORT))
+        self.assertEqual(release_unreferenced([name]), 0)
+        self.assertTrue(self.exists(name))
+
+
+class GcMediaTests(DocumentStorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept = make_customer(1, passport_pdf=pdf(PASSPORT)).passport_pdf.name
+        self.orphan = self.storage.save('documents/student_cards/scan.pdf', ContentFile(RENEWED))
+
+    def gc_media(self, *args, **options):
+        out = io.StringIO()
+        call_command('gc_media', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_dry_run_only_lists_unreferenced_files(self):
+        output = self.gc_media('--dry-run', grace=0)
+        self.assertIn(f'would delete {self.orphan}', output)
+        self.assertNotIn(self.kept, output)
+        self.assertTrue(self.exists(self.orphan))
+
+    def test_files_within_the_grace_period_are_kept(self):
+        self.assertIn('Deleted 0 file(s)', self.gc_media(grace=3600))
+        self.assertTrue(self.exists(self.orphan))
+
+    def test_deletes_unreferenced_files(self):
+        self.assertIn('Deleted 1 file(s)', self.gc_media(grace=0))
+        self.assertFalse(self.exists(self.orphan))
+        self.assertTrue(self.exists(self.kept))
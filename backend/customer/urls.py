@@ -8,4 +8,5 @@ urlpatterns = [
      path('customers/create/', views.customer_create, name='customer_create'),
     path('customers/<int:pk>/edit/', views.customer_edit, name='customer_edit'),
     path('customers/<int:pk>/', views.customer_detail, name='customer_detail'),
+    path('customers/<int:pk>/documents/<slug:document>/', views.customer_document, name='customer_document'),
 ]
\ No newline at end of file
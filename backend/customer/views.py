@@ -1,15 +1,19 @@
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import OuterRef, Q
 from django_countries import countries #type: ignore
+from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from .models import Customer
-from hostel.models import BedAssignmentHistory
+from hostel.models import Bed, BedAssignmentHistory, Hostel, Unit
 from finance.models import HostelRevenue  # Assuming app name is `finance`
 from .forms import CustomerForm
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-import os
 from django.conf import settings
+from backend.conditional import conditional_page, rows_state, users_shown
+from backend.protected_media import serve_protected
+from backend.storage import release_unreferenced
 
 
 @login_required(login_url='/accounts/login/')
@@ -84,14 +88,9 @@ def customer_edit(request, pk):
             updated_customer.updated_by = request.user
             updated_customer.save()
 
-            # Delete old files if cleared
-            def delete_file_if_cleared(original_file, updated_file):
-                if original_file and not updated_file and original_file.path and os.path.isfile(original_file.path):
-                    os.remove(original_file.path)
-
-            delete_file_if_cleared(original_passport, updated_customer.passport_pdf)
-            delete_file_if_cleared(original_zairyu, updated_customer.zairyu_card_pdf)
-            delete_file_if_cleared(original_student, updated_customer.student_card_pdf)
+            # Cleared or replaced documents are deleted unless another customer uploaded the same file
+            old_names = [original.name for original in (original_passport, original_zairyu, original_student) if original]
+            transaction.on_commit(lambda: release_unreferenced(old_names))
 
             messages.success(request, "Customer updated successfully.")
             return redirect('customer:dashboard')
@@ -101,7 +100,23 @@ def customer_edit(request, pk):
     return render(request, 'customer/customer_form.html', {'form': form, 'is_edit': True, 'customer': customer})
 
 
+def customer_detail_state(request, pk):
+    # The assigned bed and every bed in the history, printed with their room and hostel
+    customer = OuterRef(OuterRef('pk'))
+    beds = Bed.objects.filter(Q(customer=customer) | Q(bedassignmenthistory__customer=customer))
+    return rows_state(
+        Customer.objects.filter(pk=pk),
+        Bed.objects.filter(pk__in=beds.values('pk')),
+        Unit.objects.filter(pk__in=beds.values('unit_id')),
+        Hostel.objects.filter(pk__in=beds.values('unit__hostel_id')),
+        HostelRevenue.objects.filter(customer=OuterRef('pk')),
+        BedAssignmentHistory.objects.filter(customer=OuterRef('pk')),
+        users_shown(),
+    )
+
+
 @login_required(login_url='/accounts/login/')
+@conditional_page(customer_detail_state)
 def customer_detail(request, pk):
     h_customer = get_object_or_404(Customer, pk=pk)
     c_id = h_customer.id
@@ -129,4 +144,22 @@ def customer_detail(request, pk):
         'registration_fee_paid': registration_fee_paid,
         'bed_history': assigned_bed_history,
     }
-    return render(request, 'customer/customer_detail.html', context)
\ No newline at end of file
+    return render(request, 'customer/customer_detail.html', context)
+
+
+# URL slug -> Customer document field
+DOCUMENT_FIELDS = {
+    'passport': 'passport_pdf',
+    'zairyu-card': 'zairyu_card_pdf',
+    'student-card': 'student_card_pdf',
+}
+
+
+@login_required(login_url='/accounts/login/')
+def customer_document(request, pk, document):
+    """Serve a customer's document to the same users who can open the customer detail page"""
+    field_name = DOCUMENT_FIELDS.get(document)
+    if field_name is None:
+        raise Http404("Unknown document")
+    customer = get_object_or_404(Customer.objects.only('pk', field_name), pk=pk)
+    return serve_protected(request, getattr(customer, field_name))
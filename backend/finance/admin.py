@@ -1,8 +1,9 @@
 from django.contrib import admin
+from backend.admin_performance import AdminPerformanceMixin
 from .models import HostelRevenue, HostelExpense, UtilityExpense, StaffExpense
 
 @admin.register(HostelRevenue)
-class HostelRevenueAdmin(admin.ModelAdmin):
+class HostelRevenueAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = [
         'title', 'customer','year','month',
         'deposit', 'deposit_discount_percent', 'deposit_after_discount',
@@ -11,7 +12,7 @@ class HostelRevenueAdmin(admin.ModelAdmin):
         'rent', 'rent_discount_percent', 'rent_after_discount',
         'memo', 'created_at'
     ]
-    search_fields = ['title', 'customer__id']  # Add customer ID or related field if needed
+    search_fields = ['title', '=customer__id', 'customer__name']  # Exact match on ID keeps the customer join index-friendly
     list_filter = ['title', 'created_at']
 
     readonly_fields = [
@@ -25,7 +26,7 @@ class HostelRevenueAdmin(admin.ModelAdmin):
         return qs.select_related('customer')
 
 @admin.register(HostelExpense)
-class HostelExpenseAdmin(admin.ModelAdmin):
+class HostelExpenseAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'get_hostel_name',
@@ -41,6 +42,7 @@ class HostelExpenseAdmin(admin.ModelAdmin):
     )
     list_filter = ('hostel', 'purchased_date', 'status')
     search_fields = ('purchased_by', 'memo', 'status', 'transaction_code')
+    list_select_related_extra = ('hostel', 'approved_by')
 
     readonly_fields = ('created_by', 'created_at', 'updated_by', 'updated_at')
 
@@ -57,7 +59,7 @@ class HostelExpenseAdmin(admin.ModelAdmin):
 
 
 @admin.register(UtilityExpense)
-class UtilityExpenseAdmin(admin.ModelAdmin):
+class UtilityExpenseAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'hostel',
@@ -146,7 +148,7 @@ class UtilityExpenseAdmin(admin.ModelAdmin):
 
 
 @admin.register(StaffExpense)
-class StaffExpenseAdmin(admin.ModelAdmin):
+class StaffExpenseAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = ("transaction_code", "employee", "expense_type", "start_date", "end_date", "amount", "approval_status", "status_memo", "approved_by", "created_by", "created_at")
     list_filter = ("expense_type", "approval_status", "start_date", "end_date", "created_at")
     search_fields = ("transaction_code", "employee__username", "employee__first_name", "employee__last_name", "approved_by__username")
@@ -0,0 +1,301 @@
+"""
+Yearly range partitions for the finance ledger tables (PostgreSQL only).
+
+Each table is partitioned by year on its partition key, plus a default
+partition that catches rows for years without their own partition, so inserts
+never fail. Queries that compare the key directly (purchased_date__gte,
+billing_year=, year=, ...) only scan the matching partitions.
+
+PostgreSQL requires every primary key and unique constraint of a partitioned
+table to contain the key, so the primary key becomes (id, key) and the
+database only enforces a transaction code's uniqueness per key value: per day
+(purchased_date, start_date) for hostel and staff expenses. The codes come
+from a sequence (transaction_codes.allocate_codes) and never repeat anyway.
+New unique constraints on these tables must include the key too.
+
+A year archived with archive_partitions() gets no new partition: late rows
+for it wait in the default partition until restore_partitions() moves them
+into the restored one.
+
+SQLite (local development) keeps plain tables: the migration skips them and
+partitioned_models() is empty there.
+"""
+import datetime
+import re
+from zoneinfo import ZoneInfo
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+
+# Model -> partition key. HostelRevenue uses the revenue year rather than
+# created_at because unique_revenue_transaction must contain the key; staff
+# expenses use start_date, which their dashboards filter on.
+PARTITION_KEYS = {
+    'finance.HostelRevenue': 'year',
+    'finance.HostelExpense': 'purchased_date',
+    'finance.UtilityExpense': 'billing_year',
+    'finance.StaffExpense': 'start_date',
+}
+
+# Detached partitions are moved here; they keep their rows but leave every app query
+ARCHIVE_SCHEMA = 'finance_archive'
+
+YEAR_PARTITION = re.compile(r'_y(\d{4})$')
+
+
+def partition_name(table, year):
+    return f"{table}_y{year}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def _bounds(field, year):
+    """SQL literals for the [start, end) range of a year on the key field"""
+    kind = field.get_internal_type()
+    if kind == 'DateTimeField':
+        tz = ZoneInfo(settings.TIME_ZONE)
+        start, end = (datetime.datetime(y, 1, 1, tzinfo=tz).isoformat() for y in (year, year + 1))
+        return f"'{start}'", f"'{end}'"
+    if kind == 'DateField':
+        return f"'{year}-01-01'", f"'{year + 1}-01-01'"
+    return str(year), str(year + 1)
+
+
+def _year_expression(field):
+    column = connection.ops.quote_name(field.column)
+    kind = field.get_internal_type()
+    if kind == 'DateTimeField':
+        return f"date_part('year', {column} AT TIME ZONE '{settings.TIME_ZONE}')::int"
+    if kind == 'DateField':
+        return f"date_part('year', {column})::int"
+    return column
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+    return cursor.fetchone() is not None
+
+
+def _row_years(cursor, table, field):
+    cursor.execute(f"SELECT DISTINCT {_year_expression(field)} FROM {connection.ops.quote_name(table)}")
+    return {year for year, in cursor.fetchall()}
+
+
+def attached_years(cursor, table):
+    """Years that have their own partition attached to table"""
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s)",
+        [table],
+    )
+    return sorted(
+        int(match.group(1))
+        for name, in cursor.fetchall()
+        if (match := YEAR_PARTITION.search(name))
+    )
+
+
+def archived_years(cursor, table):
+    """Years whose partitions of table were detached into ARCHIVE_SCHEMA"""
+    cursor.execute(
+        "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND c.relname LIKE %s",
+        [ARCHIVE_SCHEMA, f"{table}%"],
+    )
+    return {
+        int(match.group(1))
+        for name, in cursor.fetchall()
+        if (match := YEAR_PARTITION.search(name)) and name == partition_name(table, int(match.group(1)))
+    }
+
+
+def _attach_year_partition(cursor, table, field, year):
+    """Attach the existing table for year, first moving that year's rows out of the default partition"""
+    qn = connection.ops.quote_name
+    start, end = _bounds(field, year)
+    partition = qn(partition_name(table, year))
+    column = qn(field.column)
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(default_partition_name(table))} "
+        f"WHERE {column} >= {start} AND {column} < {end} RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved"
+    )
+    cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {partition} FOR VALUES FROM ({start}) TO ({end})")
+
+
+def _create_year_partition(cursor, table, field, year):
+    qn = connection.ops.quote_name
+    cursor.execute(
+        f"CREATE TABLE {qn(partition_name(table, year))} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    _attach_year_partition(cursor, table, field, year)
+
+
+def _reset_id_sequence(schema_editor, table):
+    """Continue the rebuilt table's id sequence after the copied rows, under its usual name"""
+    qn = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        sequence, = cursor.fetchone()
+        cursor.execute(f"SELECT setval(%s, coalesce(max(id), 0) + 1, false) FROM {qn(table)}", [sequence])
+    if sequence.split('.')[-1].strip('"') != f"{table}_id_seq":
+        schema_editor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {qn(f'{table}_id_seq')}")
+
+
+def partition_table(schema_editor, model, key):
+    """
+    Rebuild a plain table as a partitioned one (migration helper): copy its rows
+    into yearly partitions, then recreate its keys, foreign keys and indexes.
+    """
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    field = model._meta.get_field(key)
+    column = field.column
+    old_table = f"{table}_unpartitioned"
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+            [table],
+        )
+        indexes = [definition for definition, in cursor.fetchall()]
+        years = _row_years(cursor, table, field) | {datetime.date.today().year}
+
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}")
+    schema_editor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE ({qn(column)})"
+    )
+    schema_editor.execute(f"CREATE TABLE {qn(default_partition_name(table))} PARTITION OF {qn(table)} DEFAULT")
+    with schema_editor.connection.cursor() as cursor:
+        for year in sorted(years):
+            _create_year_partition(cursor, table, field, year)
+
+    schema_editor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old_table)}")
+    schema_editor.execute(f"DROP TABLE {qn(old_table)}")
+    _reset_id_sequence(schema_editor, table)
+
+    for name, kind, definition in constraints:
+        if kind in ('p', 'u') and not re.search(rf'\b{re.escape(column)}\b', definition):
+            definition = re.sub(r'\)$', f', {qn(column)})', definition)
+        schema_editor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+    for definition in indexes:
+        schema_editor.execute(definition)
+
+
+def unpartition_table(schema_editor, model):
+    """Reverse of partition_table: recreate the plain table from the model and copy the rows back"""
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    old_table = f"{table}_partitioned"
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')",
+            [table],
+        )
+        constraint_names = [name for name, in cursor.fetchall()]
+        cursor.execute(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid)",
+            [table],
+        )
+        index_names = [name for name, in cursor.fetchall()]
+
+    # Free the index names for the recreated table
+    for name in constraint_names:
+        schema_editor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(name)}")
+    for name in index_names:
+        schema_editor.execute(f"DROP INDEX {qn(name)}")
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}")
+
+    schema_editor.create_model(model)
+    columns = ', '.join(qn(f.column) for f in model._meta.concrete_fields)
+    schema_editor.execute(f"INSERT INTO {qn(table)} ({columns}) SELECT {columns} FROM {qn(old_table)}")
+    schema_editor.execute(f"DROP TABLE {qn(old_table)} CASCADE")
+    _reset_id_sequence(schema_editor, table)
+
+
+def partitioned_models():
+    """(model, key field) for every finance table that is partitioned in this database"""
+    if connection.vendor != 'postgresql':
+        return []
+    with connection.cursor() as cursor:
+        return [
+            (model, model._meta.get_field(key))
+            for model, key in ((apps.get_model(label), key) for label, key in PARTITION_KEYS.items())
+            if is_partitioned(cursor, model._meta.db_table)
+        ]
+
+
+def ensure_partitions(years_ahead=1):
+    """
+    Create missing partitions from the current year to years_ahead years on,
+    plus one for every year that has rows in a default partition, except
+    archived years. Returns the created partition names.
+    """
+    this_year = datetime.date.today().year
+    created = []
+    for model, field in partitioned_models():
+        table = model._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            wanted = set(range(this_year, this_year + years_ahead + 1))
+            wanted |= _row_years(cursor, default_partition_name(table), field)
+            # restore_partitions() brings an archived year back with its own table
+            wanted -= archived_years(cursor, table)
+            for year in sorted(wanted - set(attached_years(cursor, table))):
+                _create_year_partition(cursor, table, field, year)
+                created.append(partition_name(table, year))
+    return created
+
+
+def archive_partitions(before_year):
+    """Detach the partitions of years before before_year into ARCHIVE_SCHEMA. Returns their names"""
+    qn = connection.ops.quote_name
+    archived = []
+    for model, field in partitioned_models():
+        table = model._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {qn(ARCHIVE_SCHEMA)}")
+            for year in attached_years(cursor, table):
+                if year >= before_year:
+                    continue
+                partition = partition_name(table, year)
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(partition)}")
+                cursor.execute(f"ALTER TABLE {qn(partition)} SET SCHEMA {qn(ARCHIVE_SCHEMA)}")
+                archived.append(f"{ARCHIVE_SCHEMA}.{partition}")
+    return archived
+
+
+def restore_partitions(year):
+    """Re-attach a year's archived partitions. Returns their names"""
+    qn = connection.ops.quote_name
+    restored = []
+    for model, field in partitioned_models():
+        table = model._meta.db_table
+        partition = partition_name(table, year)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s), current_schema()", [f"{ARCHIVE_SCHEMA}.{partition}"])
+            archived, schema = cursor.fetchone()
+            if archived is None:
+                continue
+            if year in attached_years(cursor, table):
+                # A partition created for late rows before archived years were skipped: fold it into the archive
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(partition)}")
+                cursor.execute(f"INSERT INTO {qn(ARCHIVE_SCHEMA)}.{qn(partition)} SELECT * FROM {qn(partition)}")
+                cursor.execute(f"DROP TABLE {qn(partition)}")
+            cursor.execute(f"ALTER TABLE {qn(ARCHIVE_SCHEMA)}.{qn(partition)} SET SCHEMA {qn(schema)}")
+            # Rows written for that year since it was archived went to the default partition
+            _attach_year_partition(cursor, table, field, year)
+            restored.append(partition)
+    return restored
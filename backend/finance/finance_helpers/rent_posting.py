@@ -0,0 +1,92 @@
+import logging
+import time
+from django.db import IntegrityError, OperationalError, transaction
+from customer.models import Customer
+from finance.models import HostelRevenue
+
+logger = logging.getLogger(__name__)
+
+# Lock/serialization conflicts are retried this many times before giving up
+MAX_POSTING_ATTEMPTS = 3
+
+
+class RentPostingError(Exception):
+    """A rent payment that cannot be posted; carries the message shown to staff"""
+
+    def __init__(self, message, error_type, **extra):
+        super().__init__(message)
+        self.message = message
+        self.error_type = error_type
+        self.extra = extra
+
+
+def next_month(year, month):
+    if month == 12:
+        return year + 1, 1
+    return year, month + 1
+
+
+def check_rent_month(customer, year, month):
+    """
+    Check that (year, month) is the next postable rent month for the customer:
+    registration fee paid, no duplicate, first rent in the registration month
+    and no skipped or backdated months. Raises RentPostingError.
+    """
+    registration_payment = HostelRevenue.objects.filter(title='registration_fee', customer=customer).first()
+    if not registration_payment:
+        raise RentPostingError('Customer must pay registration fee before making rent payments.', 'registration_required')
+
+    last_payment = HostelRevenue.objects.filter(title='rent', customer=customer).order_by('-year', '-month').first()
+    if last_payment is None:
+        reg_year = registration_payment.year
+        reg_month = registration_payment.month
+        if year != reg_year or month != reg_month:
+            raise RentPostingError(
+                f'First rent payment must be in the registration month. Customer registered in {reg_year}-{reg_month:02d}. First rent payment should be for {reg_year}-{reg_month:02d}.',
+                'wrong_first_month', suggested_month=f'{reg_year}-{reg_month:02d}'
+            )
+        return
+
+    last_year, last_month = last_payment.year, last_payment.month
+    if (year, month) <= (last_year, last_month):
+        # Rent months are sequential, so any already-paid month is at or before the last one
+        if (year, month) == (last_year, last_month) or HostelRevenue.objects.filter(title='rent', customer=customer, year=year, month=month).exists():
+            raise RentPostingError(f'Payment for {year}-{month:02d} already exists. Please select a different month.', 'duplicate_payment')
+        raise RentPostingError(
+            f'Cannot pay rent for a month before the last payment. Last payment was for {last_year}-{last_month:02d}.',
+            'backward_payment', last_payment=f'{last_year}-{last_month:02d}'
+        )
+
+    expected_year, expected_month = next_month(last_year, last_month)
+    if (year, month) != (expected_year, expected_month):
+        raise RentPostingError(
+            f'Cannot skip months. Last payment was for {last_year}-{last_month:02d}. Next payment should be for {expected_year}-{expected_month:02d}.',
+            'skip_months', last_payment=f'{last_year}-{last_month:02d}', suggested_month=f'{expected_year}-{expected_month:02d}'
+        )
+
+
+def post_rent(customer, year, month, **fields):
+    """
+    Validate and insert a rent HostelRevenue in one short transaction.
+
+    The customer row is locked with SELECT ... FOR UPDATE, so concurrent postings
+    for the same tenant queue behind each other and the second one sees the
+    first one's row during validation. Lock and serialization conflicts are
+    retried; a lost race on unique_revenue_transaction becomes a duplicate error.
+    """
+    for attempt in range(1, MAX_POSTING_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                Customer.objects.select_for_update().only('pk').get(pk=customer.pk)
+                check_rent_month(customer, year, month)
+                return HostelRevenue.objects.create(title='rent', customer=customer, year=year, month=month, **fields)
+        except IntegrityError:
+            # Only a lost race on unique_revenue_transaction is a duplicate; other violations are real errors
+            if HostelRevenue.objects.filter(title='rent', customer=customer, year=year, month=month).exists():
+                raise RentPostingError(f'Payment for {year}-{month:02d} already exists. Please select a different month.', 'duplicate_payment')
+            raise
+        except OperationalError as e:
+            if attempt == MAX_POSTING_ATTEMPTS:
+                raise
+            logger.warning(f"Rent posting conflict for customer {customer.pk} ({year}-{month:02d}), retrying: {e}")
+            time.sleep(0.05 * attempt)
@@ -0,0 +1,90 @@
+import string
+from django.db import connection, transaction
+from finance.models import TransactionCodeCounter
+
+# Codes are 5 base36 characters plus 1 check character (fits the 6-char column)
+ALPHABET = string.digits + string.ascii_uppercase
+BODY_LENGTH = 5
+CODE_SPACE = len(ALPHABET) ** BODY_LENGTH
+
+# Coprime with 36, so multiplying by it permutes the code space: consecutive
+# counter values map to unrelated-looking codes without ever colliding
+SCRAMBLE_MULTIPLIER = 24036583
+
+# Each model draws from its own interleaved slice of the code space, so a hostel
+# expense and a staff expense never share a code
+CODE_STREAMS = ['finance.hostelexpense', 'finance.staffexpense']
+
+# Collision lookups against legacy random codes are chunked under SQLite's parameter limit
+LOOKUP_CHUNK_SIZE = 900
+
+
+def check_character(body):
+    """Luhn mod 36 check character for a code body"""
+    base = len(ALPHABET)
+    factor = 2
+    total = 0
+    for char in reversed(body):
+        addend = factor * ALPHABET.index(char)
+        factor = 1 if factor == 2 else 2
+        total += addend // base + addend % base
+    return ALPHABET[(base - total % base) % base]
+
+
+def encode(value, stream=0):
+    """Encode a counter value as a scrambled base36 body plus check character"""
+    scrambled = ((value * len(CODE_STREAMS) + stream) * SCRAMBLE_MULTIPLIER) % CODE_SPACE
+    body = ''
+    for _ in range(BODY_LENGTH):
+        scrambled, remainder = divmod(scrambled, len(ALPHABET))
+        body = ALPHABET[remainder] + body
+    return body + check_character(body)
+
+
+def sequence_name(counter_name):
+    """PostgreSQL sequence backing a counter, e.g. finance_hostelexpense_code_seq"""
+    return f"{counter_name.replace('.', '_')}_code_seq"
+
+
+def reserve_values(counter_name, count):
+    """
+    Reserve `count` counter values in one round trip.
+
+    PostgreSQL draws from a sequence, which never blocks concurrent writers;
+    other databases lock and bump a TransactionCodeCounter row.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [sequence_name(counter_name), count])
+            return [row[0] for row in cursor.fetchall()]
+
+    with transaction.atomic():
+        counter, _ = TransactionCodeCounter.objects.select_for_update().get_or_create(name=counter_name)
+        start = counter.value + 1
+        counter.value += count
+        if counter.value >= CODE_SPACE // len(CODE_STREAMS):
+            raise RuntimeError(f"Transaction code space exhausted for '{counter_name}'")
+        counter.save(update_fields=['value'])
+    return list(range(start, start + count))
+
+
+def allocate_codes(model, count=1):
+    """
+    Allocate `count` unused transaction codes for `model` (HostelExpense or StaffExpense).
+
+    One sequence/counter round trip reserves the whole batch, then a single lookup
+    per chunk skips any value that happens to match a legacy randomly generated code.
+    """
+    counter_name = model._meta.label_lower
+    stream = CODE_STREAMS.index(counter_name)
+    codes = []
+    while len(codes) < count:
+        needed = count - len(codes)
+        batch = [encode(value, stream) for value in reserve_values(counter_name, needed)]
+
+        taken = set()
+        for i in range(0, len(batch), LOOKUP_CHUNK_SIZE):
+            chunk = batch[i:i + LOOKUP_CHUNK_SIZE]
+            taken.update(model.objects.filter(transaction_code__in=chunk).values_list('transaction_code', flat=True))
+        codes.extend(code for code in batch if code not in taken)
+    return codes
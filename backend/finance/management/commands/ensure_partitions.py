@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from finance.finance_helpers.partitions import ARCHIVE_SCHEMA, archive_partitions, ensure_partitions, restore_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming yearly partitions of the finance ledger tables, and archive or restore old years"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years-ahead', type=int, default=1, help='Create partitions up to this many years after the current one (default 1)')
+        parser.add_argument('--archive-before', type=int, metavar='YEAR', help=f'Detach partitions of years before YEAR into the {ARCHIVE_SCHEMA} schema')
+        parser.add_argument('--restore', type=int, metavar='YEAR', help='Re-attach the archived partitions of YEAR')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write("Partitioning needs PostgreSQL; nothing to do.")
+            return
+        if options['years_ahead'] < 0:
+            raise CommandError("--years-ahead must be 0 or more")
+
+        created = ensure_partitions(options['years_ahead'])
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partition(s)."))
+        for name in created:
+            self.stdout.write(f"  {name}")
+
+        if options['archive_before']:
+            archived = archive_partitions(options['archive_before'])
+            self.stdout.write(self.style.SUCCESS(f"Archived {len(archived)} partition(s)."))
+            for name in archived:
+                self.stdout.write(f"  {name}")
+
+        if options['restore']:
+            restored = restore_partitions(options['restore'])
+            self.stdout.write(self.style.SUCCESS(f"Restored {len(restored)} partition(s)."))
+            for name in restored:
+                self.stdout.write(f"  {name}")
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+CODE_COUNTERS = ('finance.hostelexpense', 'finance.staffexpense')
+
+# Each stream owns half of the 36**5 code space
+CODE_SEQUENCE_MAXVALUE = 36 ** 5 // 2 - 1
+
+
+def create_counters(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in CODE_COUNTERS:
+            schema_editor.execute(
+                f"CREATE SEQUENCE IF NOT EXISTS {name.replace('.', '_')}_code_seq MAXVALUE {CODE_SEQUENCE_MAXVALUE}"
+            )
+        return
+
+    TransactionCodeCounter = apps.get_model('finance', 'TransactionCodeCounter')
+    for name in CODE_COUNTERS:
+        TransactionCodeCounter.objects.get_or_create(name=name)
+
+
+def drop_counters(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in CODE_COUNTERS:
+            schema_editor.execute(f"DROP SEQUENCE IF EXISTS {name.replace('.', '_')}_code_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_alter_travelexpense_memo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionCodeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_counters, drop_counters),
+    ]
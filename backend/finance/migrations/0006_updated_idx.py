@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_transactioncodecounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hostelrevenue',
+            index=models.Index(fields=['updated_at', 'id'], name='revenue_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='utilityexpense',
+            index=models.Index(fields=['updated_at', 'id'], name='utility_updated_idx'),
+        ),
+    ]
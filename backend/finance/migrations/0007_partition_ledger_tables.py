@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:00
+
+from django.db import migrations
+
+from finance.finance_helpers.partitions import PARTITION_KEYS, partition_table, unpartition_table
+
+
+def partition_tables(apps, schema_editor):
+    # SQLite keeps plain tables
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for label, key in PARTITION_KEYS.items():
+        partition_table(schema_editor, apps.get_model(label), key)
+
+
+def unpartition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for label in PARTITION_KEYS:
+        unpartition_table(schema_editor, apps.get_model(label))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
@@ -5,9 +5,6 @@ from django.core.exceptions import ValidationError
 from hostel.models import Hostel
 from customer.models import Customer
 import datetime
-import string
-import random
-import secrets
 
 User = get_user_model()
 
@@ -86,6 +83,8 @@ class HostelRevenue(TimeStampedUserModel):
     memo = models.TextField(blank=True, null=True)
 
     class Meta:
+        # Keyset order of the sync API (api/)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='revenue_updated_idx')]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'customer', 'year', 'month'],
@@ -128,7 +127,8 @@ class HostelRevenue(TimeStampedUserModel):
             elif self.payment_type and not self.prepaid_amount:
                 raise ValidationError('Prepaid/Postpaid amount is required when payment type is specified.')
 
-    def save(self, *args, **kwargs):
+    def compute_amounts(self):
+        """Discounted amounts, total_amount and the default collected_amount; save() and bulk imports call this"""
         if self.deposit and self.deposit_discount_percent is not None:
             self.deposit_after_discount = self.deposit * (Decimal(1) - self.deposit_discount_percent / Decimal(100))  # type: ignore
 
@@ -169,6 +169,8 @@ class HostelRevenue(TimeStampedUserModel):
         else:
             self.total_amount = Decimal("0")
 
+    def save(self, *args, **kwargs):
+        self.compute_amounts()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -199,11 +201,8 @@ class HostelExpense(TimeStampedUserModel):
         super().save(*args, **kwargs)
 
     def generate_unique_code(self):
-        chars = string.ascii_uppercase + string.digits
-        while True:
-            code = ''.join(random.choices(chars, k=6))
-            if not HostelExpense.objects.filter(transaction_code=code).exists(): # type: ignore
-                return code
+        from .finance_helpers.transaction_codes import allocate_codes
+        return allocate_codes(HostelExpense)[0]
     
     def __str__(self):
         hostel_name = self.hostel.name if self.hostel else "ALL"
@@ -240,6 +239,7 @@ class UtilityExpense(TimeStampedUserModel):
         ordering = ['-billing_year', '-billing_month']
         verbose_name = 'Utility Expense'
         verbose_name_plural = 'Utility Expenses'
+        indexes = [models.Index(fields=['updated_at', 'id'], name='utility_updated_idx')]
         constraints = [
             models.UniqueConstraint(
                 fields=['hostel', 'billing_year', 'billing_month', 'expense_type'],
@@ -295,13 +295,8 @@ class StaffExpense(TimeStampedUserModel):
 
     @staticmethod
     def generate_unique_code():
-        chars = string.ascii_uppercase + string.digits
-
-        while True:
-            code = "".join(secrets.choice(chars) for _ in range(6))
-
-            if not StaffExpense.objects.filter(transaction_code=code).exists():
-                return code
+        from .finance_helpers.transaction_codes import allocate_codes
+        return allocate_codes(StaffExpense)[0]
 
     def __str__(self):
         if self.employee:
@@ -313,3 +308,13 @@ class StaffExpense(TimeStampedUserModel):
     class Meta:
         verbose_name = "Staff Expense"
         verbose_name_plural = "Staff Expenses"
+
+
+class TransactionCodeCounter(models.Model):
+    """Per-model counter that transaction codes are allocated from (see finance_helpers.transaction_codes)"""
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -0,0 +1,215 @@
+import datetime
+import threading
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.db import IntegrityError, connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from backend.admin_performance import estimated_count
+from customer.models import Customer
+from finance.finance_helpers.partitions import (
+    PARTITION_KEYS, archive_partitions, attached_years, ensure_partitions, is_partitioned, restore_partitions,
+)
+from finance.finance_helpers import rent_posting
+from finance.finance_helpers.transaction_codes import allocate_codes, encode, reserve_values
+from finance.finance_helpers.rent_posting import RentPostingError, post_rent
+from finance.models import HostelExpense, HostelRevenue, StaffExpense, UtilityExpense
+from hostel.models import Hostel
+
+RENT = {'rent': 50000, 'internet': 0, 'utilities': 5000, 'rent_discount_percent': 0}
+
+
+def make_customer():
+    customer = Customer.objects.create(
+        name='Asha', date_of_birth=datetime.date(2000, 1, 1), email='asha@example.com',
+        phone_number='09012345678', nationality='NP', home_address='-', parent_phone_number='09012345678',
+        visa_type='Student', workplace_or_school_name='-', workplace_or_school_address='-',
+        workplace_or_school_phone='-', zairyu_card_number='-', zairyu_card_expire_date=datetime.date(2030, 1, 1),
+    )
+    HostelRevenue.objects.create(title='registration_fee', customer=customer, year=2025, month=1, deposit=0, initial_fee=0)
+    return customer
+
+
+class PostRentTests(TestCase):
+    def setUp(self):
+        self.customer = make_customer()
+
+    def test_second_posting_of_a_month_is_a_duplicate(self):
+        post_rent(self.customer, 2025, 1, **RENT)
+        with self.assertRaises(RentPostingError) as raised:
+            post_rent(self.customer, 2025, 1, **RENT)
+        self.assertEqual(raised.exception.error_type, 'duplicate_payment')
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        with self.assertRaises(IntegrityError):
+            post_rent(self.customer, 2025, 1, payment_type=None, **RENT)
+        self.assertFalse(HostelRevenue.objects.filter(title='rent').exists())
+
+
+class AllocateCodesTests(TestCase):
+    def test_streams_never_share_a_code(self):
+        hostel_codes = allocate_codes(HostelExpense, 300)
+        staff_codes = allocate_codes(StaffExpense, 300)
+        self.assertEqual(len(set(hostel_codes)), 300)
+        self.assertEqual(len(set(staff_codes)), 300)
+        self.assertFalse(set(hostel_codes) & set(staff_codes))
+        self.assertTrue(all(len(code) == 6 for code in hostel_codes + staff_codes))
+
+    def test_counter_moves_forward(self):
+        first = reserve_values('finance.hostelexpense', 3)
+        second = reserve_values('finance.hostelexpense', 2)
+        self.assertEqual(len(set(first + second)), 5)
+        self.assertGreater(min(second), max(first))
+
+    def test_codes_taken_by_legacy_rows_are_skipped(self):
+        legacy = HostelExpense.objects.create(
+            transaction_code=encode(1), purchased_date=datetime.date(2025, 1, 1), purchased_by='-', memo='-',
+            amount=1000,
+        )
+        with mock.patch('finance.finance_helpers.transaction_codes.reserve_values', side_effect=[[1, 2], [3]]):
+            codes = allocate_codes(HostelExpense, 2)
+        self.assertEqual(codes, [encode(2), encode(3)])
+        self.assertNotIn(legacy.transaction_code, codes)
+
+
+class ConcurrentPostRentTests(TransactionTestCase):
+    """Parallel postings of the same month for one tenant: exactly one wins, the rest are duplicates"""
+
+    # Flushing only these (with CASCADE) also clears tables of models that were removed from the code
+    available_apps = [
+        'django.contrib.contenttypes', 'django.contrib.auth', 'accounts', 'customer', 'hostel', 'finance', 'audit',
+    ]
+    THREADS = 6
+    ROUNDS = 4
+    # SQLite locks the whole database, so queued postings can need more than the default retries
+    ATTEMPTS = 30
+
+    def post_concurrently(self, customer, year, month):
+        barrier = threading.Barrier(self.THREADS)
+        outcomes = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                barrier.wait()
+                post_rent(customer, year, month, **RENT)
+                outcome = 'posted'
+            except RentPostingError as e:
+                outcome = e.error_type
+            except Exception as e:
+                outcome = f'error: {e.__class__.__name__}: {e}'
+            finally:
+                connections.close_all()
+            with lock:
+                outcomes.append(outcome)
+
+        workers = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return outcomes
+
+    def test_one_posting_per_month(self):
+        customer = make_customer()
+        with mock.patch.object(rent_posting, 'MAX_POSTING_ATTEMPTS', self.ATTEMPTS), \
+                mock.patch.object(rent_posting.logger, 'warning') as retried:
+            for month in range(1, self.ROUNDS + 1):
+                outcomes = self.post_concurrently(customer, 2025, month)
+                self.assertEqual(sorted(outcomes), ['duplicate_payment'] * (self.THREADS - 1) + ['posted'], outcomes)
+                self.assertEqual(HostelRevenue.objects.filter(title='rent', customer=customer, year=2025, month=month).count(), 1)
+        # Lock conflicts are expected here; only the retry warning may be logged
+        for call in retried.call_args_list:
+            self.assertIn('retrying', call.args[0])
+
+
+def make_utility(hostel, year, month=1):
+    return UtilityExpense.objects.create(
+        hostel=hostel, expense_type=UtilityExpense.ExpenseType.choices[0][0], amount=Decimal('1000'),
+        billing_year=year, billing_month=month, date_from=datetime.date(year, 1, 1),
+        date_to=datetime.date(year, 1, 31), paid_date=datetime.date(year, 2, 5),
+    )
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Ledger tables are only partitioned on PostgreSQL')
+class PartitionTests(TransactionTestCase):
+    available_apps = ConcurrentPostRentTests.available_apps
+    UTILITY = UtilityExpense._meta.db_table
+
+    def setUp(self):
+        self.hostel = Hostel.objects.create(
+            name='Partition', hostel_type='boys', total_rooms=3, address='-',
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+
+    def partitioned_tables(self):
+        with connection.cursor() as cursor:
+            return {label: is_partitioned(cursor, apps.get_model(label)._meta.db_table) for label in PARTITION_KEYS}
+
+    def utility_years(self):
+        with connection.cursor() as cursor:
+            return attached_years(cursor, self.UTILITY)
+
+    def test_migration_partitions_the_ledger_tables_and_reverses(self):
+        self.assertEqual(set(self.partitioned_tables().values()), {True})
+        make_utility(self.hostel, 2021)
+        ensure_partitions(0)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([('finance', '0006_updated_idx')])
+        try:
+            self.assertEqual(set(self.partitioned_tables().values()), {False})
+            self.assertEqual(UtilityExpense.objects.filter(billing_year=2021).count(), 1)
+        finally:
+            executor = MigrationExecutor(connection)
+            executor.migrate(executor.loader.graph.leaf_nodes())
+        self.assertEqual(set(self.partitioned_tables().values()), {True})
+        # The forward migration creates a partition for every year that has rows
+        self.assertIn(2021, self.utility_years())
+        make_utility(self.hostel, 2021, month=2)
+        self.assertEqual(UtilityExpense.objects.filter(billing_year=2021).count(), 2)
+
+    def test_late_rows_of_an_archived_year_are_restored_with_it(self):
+        make_utility(self.hostel, 2019)
+        ensure_partitions(0)
+        self.assertIn(f"finance_archive.{self.UTILITY}_y2019", archive_partitions(2020))
+
+        late = make_utility(self.hostel, 2019, month=2)
+        self.assertNotIn(f"{self.UTILITY}_y2019", ensure_partitions(0))
+        self.assertNotIn(2019, self.utility_years())
+        self.assertEqual(list(UtilityExpense.objects.filter(billing_year=2019)), [late])
+
+        self.assertIn(f"{self.UTILITY}_y2019", restore_partitions(2019))
+        self.assertIn(2019, self.utility_years())
+        self.assertEqual(UtilityExpense.objects.filter(billing_year=2019).count(), 2)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.UTILITY}_y2019")
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_restore_merges_a_partition_created_while_the_year_was_archived(self):
+        make_utility(self.hostel, 2019)
+        ensure_partitions(0)
+        archive_partitions(2020)
+        make_utility(self.hostel, 2019, month=2)
+        # Trees partitioned before archived years were skipped may already hold such a partition
+        with mock.patch('finance.finance_helpers.partitions.archived_years', return_value=set()):
+            self.assertIn(f"{self.UTILITY}_y2019", ensure_partitions(0))
+
+        restore_partitions(2019)
+        self.assertEqual(UtilityExpense.objects.filter(billing_year=2019).count(), 2)
+
+    def test_row_estimate_sums_the_partitions(self):
+        for month in range(1, 4):
+            make_utility(self.hostel, 2021, month=month)
+        make_utility(self.hostel, 2022)
+        ensure_partitions(0)
+        # Autovacuum analyzes partitions but never the parent, whose reltuples stays -1
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {self.UTILITY}_y2021")
+            cursor.execute(f"ANALYZE {self.UTILITY}_y2022")
+            cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [self.UTILITY])
+            self.assertEqual(cursor.fetchone()[0], -1)
+        self.assertEqual(estimated_count(UtilityExpense.objects.all()), 4)
@@ -3,6 +3,7 @@ from django.template.loader import render_to_string
 from django.urls import reverse
 from decimal import Decimal
 from django.conf import settings
+from backend.background import send_email_in_background
 import logging
 
 logger = logging.getLogger(__name__)
@@ -72,8 +73,8 @@ def send_revenue_email(request, revenue, subject):
         msg = EmailMultiAlternatives(subject, text_content, from_email, [to_email])
         msg.attach_alternative(html_content, "text/html")
 
-        # 🔥 Try sending email
-        msg.send(fail_silently=False)
+        # 🔥 Send after commit on a background thread; SMTP failures are logged there
+        send_email_in_background(msg)
 
     except Exception as e:
         # ✅ DO NOT crash app — just log and continue
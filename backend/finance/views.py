@@ -3,13 +3,14 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required, user_passes_test
 from django.utils import timezone
-from django.db.models import Q, Sum
+from django.db.models import OuterRef, Q, Sum
 from django.http import HttpResponse, JsonResponse
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
 from django.views.decorators.csrf import csrf_exempt
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+import functools
 import json
 from .models import HostelRevenue, HostelExpense, UtilityExpense, StaffExpense
 from .forms import HostelExpenseForm, UtilityExpenseForm, StaffExpenseForm, AdFeeReceiptForm
@@ -23,11 +24,16 @@ from .excel_exports import (
     export_unpaid_rent_to_excel,
 )
 from .finance_helpers.rent_defaulters import get_rent_defaulters
+from .finance_helpers.rent_posting import RentPostingError, check_rent_month, post_rent
 from hostel.models import Bed
 from targets.models import RentalContract
+from customer.models import Customer
+from backend.conditional import conditional_page, rows_state, users_shown
+from backend.db_routing import replica_reads
 
 
 @login_required(login_url='/accounts/login/')
+@replica_reads
 def revenues(request):
     name = request.GET.get('name')
     from_date = request.GET.get("from_date")
@@ -65,19 +71,23 @@ def revenues(request):
     else:  # record_type == 'rent' (default)
         registration_revenues = all_revenues.none()  # Empty queryset
         rent_revenues = all_revenues
-    registration_total = registration_revenues.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    rent_collection_total = rent_revenues.aggregate(total=Sum('collected_amount'))['total'] or Decimal('0')
-    rent_total_amount = rent_revenues.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
+    # Totals and the page are memoized callables, which templates call on first use: the
+    # tables are a versioned_cache fragment, so these queries only run when it is re-rendered
+    def total(field, revenues):
+        return functools.cache(lambda: revenues().aggregate(total=Sum(field))['total'] or Decimal('0'))
+    registration_total = total('total_amount', lambda: registration_revenues)
+    rent_collection_total = total('collected_amount', lambda: rent_revenues)
+    rent_total_amount = total('total_amount', lambda: rent_revenues)
     # No pagination for registration revenues - display all records
     registration_page_obj = registration_revenues
     # Pagination for rent revenues (limit 20)
     rent_page = request.GET.get('rent_page', 1)
     rent_paginator = Paginator(rent_revenues, 20)
-    rent_page_obj = rent_paginator.get_page(rent_page)
+    rent_page_obj = functools.cache(lambda: rent_paginator.get_page(rent_page))
     # Calculate page totals
-    registration_page_total = registration_revenues.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    rent_page_total_amount = rent_page_obj.object_list.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-    rent_page_collection_total = rent_page_obj.object_list.aggregate(total=Sum('collected_amount'))['total'] or Decimal('0')
+    registration_page_total = total('total_amount', lambda: registration_revenues)
+    rent_page_total_amount = total('total_amount', lambda: rent_page_obj().object_list)
+    rent_page_collection_total = total('collected_amount', lambda: rent_page_obj().object_list)
     # ✅ Only allow download if there are results
     if request.GET.get('download') == 'excel':
         if all_revenues.exists():
@@ -111,6 +121,7 @@ def revenues(request):
 
 
 @login_required(login_url='/accounts/login/')
+@replica_reads
 def real_estate_revenue(request):
     """Display real estate revenue generated by rental contracts."""
     if not (request.user.is_superuser or request.user.has_perm('targets.view_rentalcontract')):
@@ -197,7 +208,16 @@ def confirm_ad_fee_receipt(request, pk):
     return render(request, 'finance/confirm_ad_fee_receipt.html', {'contract': contract, 'form': form})
 
 
+def revenue_detail_state(request, pk):
+    return rows_state(
+        HostelRevenue.objects.filter(pk=pk),
+        Customer.objects.filter(pk=OuterRef('customer_id')),
+        users_shown(),
+    )
+
+
 @login_required(login_url='/accounts/login/')
+@conditional_page(revenue_detail_state)
 def revenue_detail(request, pk):
     revenue = get_object_or_404(HostelRevenue, pk=pk)
     return render(request, 'finance/revenue_detail.html', {'revenue': revenue})
@@ -250,41 +270,13 @@ def monthly_rent(request, customer_id):
             messages.error(request, "Payment month is required.")
             return redirect(request.path)
         year, month = map(int, month_input.split("-"))
-        # Stage 2: Validate registration fee payment requirement
-        registration_payment = HostelRevenue.objects.filter(title='registration_fee', customer=customer_details.customer).first()
-        if not registration_payment:
-            messages.error(request, "Customer must pay registration fee before making rent payments.")
-            return redirect(request.path)
-        # Stage 3: Check for duplicate payment
-        existing_rent_payments = HostelRevenue.objects.filter(title='rent', customer=customer_details.customer).order_by('year', 'month')
-        duplicate_payment = existing_rent_payments.filter(year=year, month=month).first()
-        if duplicate_payment:
-            messages.error(request, f"Payment for {year}-{month:02d} already exists. Please select a different month.")
+        # Stages 2-4: Registration fee paid, no duplicate, sequential months
+        # (checked again under the customer lock when the payment is posted)
+        try:
+            check_rent_month(customer_details.customer, year, month)
+        except RentPostingError as e:
+            messages.error(request, e.message)
             return redirect(request.path)
-        # Stage 4: Validate sequential month payment
-        if not existing_rent_payments.exists():
-            # First rent payment must be in registration month
-            reg_year = registration_payment.year
-            reg_month = registration_payment.month
-            if year != reg_year or month != reg_month:
-                messages.error(request, f"First rent payment must be in the registration month. Customer registered in {reg_year}-{reg_month:02d}. First rent payment should be for {reg_year}-{reg_month:02d}.")
-                return redirect(request.path)
-        else:
-            # Subsequent payments must follow previous payment sequentially
-            last_payment = existing_rent_payments.last()
-            last_year = last_payment.year
-            last_month = last_payment.month
-            expected_month = last_month + 1
-            expected_year = last_year
-            if expected_month > 12:
-                expected_month = 1
-                expected_year += 1
-            if year < last_year or (year == last_year and month < last_month):
-                messages.error(request, f"Cannot pay rent for a month before the last payment. Last payment was for {last_year}-{last_month:02d}.")
-                return redirect(request.path)
-            if year != expected_year or month != expected_month:
-                messages.error(request, f"Cannot skip months. Last payment was for {last_year}-{last_month:02d}. Next payment should be for {expected_year}-{expected_month:02d}.")
-                return redirect(request.path)
         # Stage 5: Parse and validate numeric payment amounts
         try:
             base_rent = Decimal(request.POST.get("rent", "0"))
@@ -356,13 +348,14 @@ def monthly_rent(request, customer_id):
         elif payment_type == '' and abs(collected_amount - adjusted_total) > Decimal("0.01"):
             messages.error(request, f"For normal payment, collected amount must equal amount to collect (¥{adjusted_total}).")
             return redirect(request.path)
-        # Stage 9: Create/update revenue record
-        revenue, created = HostelRevenue.objects.get_or_create(
-            title="rent", customer=customer_details.customer, year=year, month=month,
-            defaults={"rent": base_rent, "rent_discount_percent": rent_discount_percent, "rent_after_discount": rent_after_discount, "internet": internet_fee, "utilities": utilities_fee, "total_amount": total_amount, "payment_type": payment_type, "collected_amount": collected_amount, "prepaid_amount": prepaid_amount if payment_type else None, "memo": memo, "created_by": request.user, "updated_by": request.user,}
-        )
-        if not created:
-            messages.warning(request, "Rent payment for this month already exists.")
+        # Stage 9: Post the revenue record (locked re-validation + insert)
+        try:
+            revenue = post_rent(
+                customer_details.customer, year, month,
+                rent=base_rent, rent_discount_percent=rent_discount_percent, rent_after_discount=rent_after_discount, internet=internet_fee, utilities=utilities_fee, total_amount=total_amount, payment_type=payment_type, collected_amount=collected_amount, prepaid_amount=prepaid_amount if payment_type else None, memo=memo, created_by=request.user, updated_by=request.user,
+            )
+        except RentPostingError as e:
+            messages.warning(request, e.message)
         else:
             customer = revenue.customer
             if customer and customer.email:
@@ -450,39 +443,11 @@ def validate_rent_month(request, customer_id):
             month = int(data.get('month'))
             # Get customer
             customer = get_object_or_404(Bed.objects.select_related('customer'), customer=customer_id).customer
-            # 1. Registration Fee Validation
-            registration_payment = HostelRevenue.objects.filter(title='registration_fee', customer=customer).first()
-            if not registration_payment:
-                return JsonResponse({'success': False, 'error': 'Customer must pay registration fee before making rent payments.', 'error_type': 'registration_required'})
-            # 2. Get all existing rent payments for this customer
-            existing_rent_payments = HostelRevenue.objects.filter(title='rent', customer=customer).order_by('year', 'month')
-            # 3. Check for duplicate payment
-            duplicate_payment = existing_rent_payments.filter(year=year, month=month).first()
-            if duplicate_payment:
-                return JsonResponse({'success': False, 'error': f'Payment for {year}-{month:02d} already exists. Please select a different month.', 'error_type': 'duplicate_payment'})
-            # 4. First rent payment validation
-            if not existing_rent_payments.exists():
-                reg_year = registration_payment.year
-                reg_month = registration_payment.month
-                if year != reg_year or month != reg_month:
-                    return JsonResponse({'success': False, 'error': f'First rent payment must be in the registration month. Customer registered in {reg_year}-{reg_month:02d}. First rent payment should be for {reg_year}-{reg_month:02d}.', 'error_type': 'wrong_first_month', 'suggested_month': f'{reg_year}-{reg_month:02d}'})
-            else:
-                # Not first payment - validate sequential payment
-                last_payment = existing_rent_payments.last()
-                last_year = last_payment.year
-                last_month = last_payment.month
-                # Calculate expected next month
-                expected_month = last_month + 1
-                expected_year = last_year
-                if expected_month > 12:
-                    expected_month = 1
-                    expected_year += 1
-                # Check if trying to pay for a month before the last payment
-                if year < last_year or (year == last_year and month < last_month):
-                    return JsonResponse({'success': False, 'error': f'Cannot pay rent for a month before the last payment. Last payment was for {last_year}-{last_month:02d}.', 'error_type': 'backward_payment', 'last_payment': f'{last_year}-{last_month:02d}'})
-                # Check if trying to skip months
-                if year != expected_year or month != expected_month:
-                    return JsonResponse({'success': False, 'error': f'Cannot skip months. Last payment was for {last_year}-{last_month:02d}. Next payment should be for {expected_year}-{expected_month:02d}.', 'error_type': 'skip_months', 'last_payment': f'{last_year}-{last_month:02d}', 'suggested_month': f'{expected_year}-{expected_month:02d}'})
+            # Registration fee, duplicate, first-month and sequence checks
+            try:
+                check_rent_month(customer, year, month)
+            except RentPostingError as e:
+                return JsonResponse({'success': False, 'error': e.message, 'error_type': e.error_type, **e.extra})
             # If we get here, validation passed
             return JsonResponse({'success': True, 'message': 'Month selection is valid.'})
         except Exception as e:
@@ -556,25 +521,33 @@ def registration_fee(request, customer_id):
 
 
 @login_required(login_url='/accounts/login/')
+@replica_reads
 def notification(request):
     """
     Rent defaulters dashboard - shows customers with unpaid rent months.
     Allows searching by customer name and downloading unpaid rent report to Excel.
     """
     search_name = request.GET.get('name', '').strip().lower()
-    # Get all rent defaulters from helper function
-    defaulters = get_rent_defaulters()
-    # Filter by search name if provided
-    if search_name:
-        defaulters = [d for d in defaulters if search_name in d['customer'].name.lower()]
+
+    def find_defaulters():
+        # Get all rent defaulters from helper function
+        defaulters = get_rent_defaulters()
+        # Filter by search name if provided
+        if search_name:
+            defaulters = [d for d in defaulters if search_name in d['customer'].name.lower()]
+        return defaulters
+
     # Handle Excel export
     if 'download' in request.GET:
-        return export_unpaid_rent_to_excel(defaulters)
+        return export_unpaid_rent_to_excel(find_defaulters())
+    # Passed as a callable: only computed when the cached table fragment is stale
+    defaulters = functools.cache(find_defaulters)
     return render(request, 'finance/notification.html', {'defaulters': defaulters, 'search_name': request.GET.get('name', ''), 'today': date.today()})
 
 
 @login_required(login_url='/accounts/login/')
 @permission_required(('finance.view_hostelexpense', 'finance.view_utilityexpense'), raise_exception=True)
+@replica_reads
 def expenses(request):
     """
     Unified expenses dashboard combining hostel and utility expenses.
@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for the production backend service.
+
+Defaults to threaded workers (gthread): each of the N worker processes serves
+GUNICORN_THREADS requests concurrently, so a slow Excel export or SMTP call ties
+up one thread instead of a whole worker. Every thread keeps its own persistent
+database connection (see DB_POOL_MODE in settings), so expect up to
+workers * threads Postgres connections, or use the pgbouncer profile.
+
+Set GUNICORN_WORKER_CLASS=sync to fall back to the previous one-request-per-worker model.
+
+The app is imported once in the master before forking (preload_app), so workers
+start without re-importing Django and share its memory pages. Migrations and
+collectstatic are not run here; see the release service in docker-compose.prod.yml.
+"""
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True").lower() == "true"
+
+# Recycle workers periodically to bound memory growth from large exports
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = 100
+
+accesslog = "-"
+errorlog = "-"
+
+
+def worker_exit(server, worker):
+    """Let emails and other run_in_background tasks finish before the worker process ends"""
+    from backend.background import wait_for_background_tasks
+
+    # Leave a margin before the master's graceful_timeout kills the worker
+    wait_for_background_tasks(timeout=graceful_timeout - 5)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Hostel, Unit, Bed, BedAssignmentHistory
+from backend.admin_performance import AdminPerformanceMixin
+from .models import Hostel, Unit, Bed, BedAssignmentHistory, OccupancyInterval
 
 
 @admin.register(Hostel)
@@ -31,7 +32,7 @@ class HostelAdmin(admin.ModelAdmin):
         return qs.select_related('hostel_manager', 'created_by', 'updated_by')
 
 @admin.register(Unit)
-class UnitAdmin(admin.ModelAdmin):
+class UnitAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = (
         'hostel',
         'unit_type',
@@ -55,7 +56,7 @@ class UnitAdmin(admin.ModelAdmin):
 
 
 @admin.register(Bed)
-class BedAdmin(admin.ModelAdmin):
+class BedAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = (
         'unit',
         'bed_num',
@@ -72,6 +73,7 @@ class BedAdmin(admin.ModelAdmin):
     )
     list_filter = ('unit__hostel', 'unit', 'customer')
     search_fields = ('bed_num', 'unit__room_num', 'unit__hostel__name', 'customer__name')
+    list_select_related_extra = ('unit__hostel',)  # Unit.__str__ prints the hostel name
     autocomplete_fields = ('unit', 'customer', 'created_by', 'updated_by')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -91,4 +93,25 @@ class BedAssignmentHistoryAdmin(admin.ModelAdmin):
         'updated_at',
         'updated_by',
     )
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+
+    def delete_queryset(self, request, queryset):
+        """Delete one by one so each row's OccupancyInterval goes with it"""
+        for history in queryset:
+            history.delete()
+
+
+@admin.register(OccupancyInterval)
+class OccupancyIntervalAdmin(admin.ModelAdmin):
+    list_display = ('customer', 'hostel', 'unit', 'bed', 'start_date', 'end_date')
+    list_filter = ('hostel',)
+    search_fields = ('customer__name', 'hostel__name', 'bed__bed_num')
+    readonly_fields = ('bed', 'unit', 'hostel', 'customer', 'start_date', 'end_date')
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('customer', 'hostel', 'unit__hostel', 'bed')
+
+    def has_add_permission(self, request):
+        """Intervals are only written by the occupancy service"""
+        return False
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class HostelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hostel'
+
+    def ready(self):
+        from backend.data_versions import track_data_versions
+        track_data_versions(self)
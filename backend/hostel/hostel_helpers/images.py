@@ -0,0 +1,125 @@
+import hashlib
+import io
+import logging
+import posixpath
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+from backend.background import run_in_background
+from backend.data_versions import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+# Rendered widths; a source narrower than a width is not upscaled
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+
+# format key -> (Pillow format, file extension, save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def content_hash(field_file):
+    digest = hashlib.sha256()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()[:12]
+
+
+def build_derivatives(field_file):
+    """
+    Write resized WebP/JPEG copies of an image next to the original as
+    <stem>.<hash>.<width>w.<ext> and return the image_variants mapping:
+    {'source': name, 'width': w, 'height': h, 'webp': {width: name}, 'jpeg': {width: name}}.
+    Names carry the source content hash, so files that already exist are reused.
+    """
+    storage = field_file.storage
+    directory, filename = posixpath.split(field_file.name)
+    stem = filename.rsplit('.', 1)[0]
+    digest = content_hash(field_file)
+
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    finally:
+        field_file.close()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    widths = [w for w in DERIVATIVE_WIDTHS if w < image.width]
+    if image.width <= DERIVATIVE_WIDTHS[-1]:
+        # Small sources also get a full-width copy so the largest candidate loses no detail
+        widths.append(image.width)
+    variants = {'source': field_file.name, 'width': image.width, 'height': image.height}
+    for key, (pil_format, extension, options) in DERIVATIVE_FORMATS.items():
+        variants[key] = {}
+        for width in widths:
+            name = posixpath.join(directory, f"{stem}.{digest}.{width}w.{extension}")
+            if not storage.exists(name):
+                resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+                if pil_format == 'JPEG' and resized.mode != 'RGB':
+                    resized = resized.convert('RGB')
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                saved = storage.save(name, ContentFile(buffer.getvalue()))
+                if saved != name:
+                    # Another worker wrote the same content-hashed file first; keep theirs
+                    storage.delete(saved)
+            variants[key][str(width)] = name
+    return variants
+
+
+def variant_names(variants):
+    return {name for key in DERIVATIVE_FORMATS for name in (variants or {}).get(key, {}).values()}
+
+
+def process_image(model_label, pk):
+    """Build derivatives for one Hostel/Unit image and store them on the row"""
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('pk', 'image', 'image_variants').first()
+    if instance is None:
+        return
+
+    old_names = variant_names(instance.image_variants)
+    if instance.image:
+        try:
+            variants = build_derivatives(instance.image)
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Could not build derivatives for {model_label} {pk} ({instance.image.name}): {e}")
+            return
+    else:
+        variants = {}
+
+    # Only write if the image was not replaced again while we were resizing
+    rows = model.objects.filter(pk=pk)
+    if instance.image:
+        rows = rows.filter(image=instance.image.name)
+    else:
+        rows = rows.filter(Q(image='') | Q(image__isnull=True))
+    # updated_at moves too, so conditional detail pages stop answering 304 with the fallback <img>
+    updated = rows.update(image_variants=variants, updated_at=timezone.now())
+    if updated:
+        bump_data_version(model)
+        storage = instance.image.storage
+        for name in old_names - variant_names(variants):
+            storage.delete(name)
+
+
+def queue_image_derivatives(instance):
+    """
+    After save: resize on a background thread once the transaction commits,
+    but only when the image differs from the one the variants were built from.
+    """
+    source = (instance.image_variants or {}).get('source')
+    current = instance.image.name if instance.image else None
+    if source != current and (current or instance.image_variants):
+        run_in_background(process_image, instance._meta.label, instance.pk)
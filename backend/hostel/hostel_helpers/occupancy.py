@@ -0,0 +1,157 @@
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from backend.data_versions import bump_data_version
+from customer.models import Customer
+from hostel.models import Bed, BedAssignmentHistory, OccupancyInterval, Unit
+
+# Rows per INSERT when archiving a month-end batch
+HISTORY_BATCH_SIZE = 500
+
+
+class OccupancyError(Exception):
+    """A bed assignment, release or transfer that cannot be applied"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def _lock_bed(bed):
+    return Bed.objects.select_for_update(of=('self',)).select_related('unit').get(pk=bed.pk)
+
+
+def _touch_unit(unit_id, user):
+    if user is not None:
+        Unit.objects.filter(pk=unit_id).update(updated_by=user, updated_at=timezone.now())
+        bump_data_version(Unit)
+
+
+def record_move_outs(beds, released_date=None, deactivate_customers=True):
+    """
+    Write one BedAssignmentHistory row per occupied bed, close its open
+    OccupancyInterval and deactivate the customers.
+    Beds are not cleared here; callers clear them with their own save()/update().
+    """
+    history = [
+        BedAssignmentHistory(
+            bed_id=bed.pk,
+            customer_id=bed.customer_id,
+            assigned_date=bed.assigned_date,
+            released_date=released_date or bed.released_date,
+        )
+        for bed in beds
+    ]
+    # bulk_create skips BedAssignmentHistory.save(), customers are handled below in one UPDATE
+    BedAssignmentHistory.objects.bulk_create(history, batch_size=HISTORY_BATCH_SIZE)
+
+    # One UPDATE per distinct move-out date, month-end batches share a handful of dates
+    beds_by_end_date = defaultdict(list)
+    for row in history:
+        beds_by_end_date[row.released_date].append(row.bed_id)
+    for end_date, bed_ids in beds_by_end_date.items():
+        OccupancyInterval.objects.filter(bed_id__in=bed_ids, end_date__isnull=True).update(end_date=end_date)
+
+    if deactivate_customers:
+        Customer.objects.filter(pk__in=[bed.customer_id for bed in beds], status=True).update(status=False, updated_at=timezone.now())
+    bump_data_version(BedAssignmentHistory, OccupancyInterval, Customer)
+    return len(history)
+
+
+def _clear_beds(bed_ids, user=None):
+    fields = {'customer': None, 'assigned_date': None, 'released_date': None, 'updated_at': timezone.now()}
+    if user is not None:
+        fields['updated_by'] = user
+    bump_data_version(Bed)
+    return Bed.objects.filter(pk__in=bed_ids).update(**fields)
+
+
+def assign_bed(bed, customer, assigned_date, user=None):
+    """Put customer in an empty bed"""
+    with transaction.atomic():
+        bed = _lock_bed(bed)
+        if bed.customer_id:
+            raise OccupancyError(f"Bed {bed.bed_num} is already assigned.")
+        if Bed.objects.filter(customer=customer).exists():
+            raise OccupancyError(f"{customer.name} is already assigned to another bed.")
+
+        fields = {'customer': customer, 'assigned_date': assigned_date, 'released_date': None, 'updated_at': timezone.now()}
+        if user is not None:
+            fields['updated_by'] = user
+        Bed.objects.filter(pk=bed.pk).update(**fields)
+        bump_data_version(Bed)
+        OccupancyInterval.objects.create(
+            bed_id=bed.pk,
+            unit_id=bed.unit_id,
+            hostel_id=bed.unit.hostel_id,
+            customer=customer,
+            start_date=assigned_date,
+        )
+        _touch_unit(bed.unit_id, user)
+    return bed
+
+
+def release_bed(bed, released_date, user=None):
+    """
+    Set the bed's release date. A date on or before today moves the customer
+    out right away; a later date (or None) is left for process_move_outs.
+    """
+    today = timezone.now().date()
+    with transaction.atomic():
+        bed = _lock_bed(bed)
+        if not bed.customer_id or not bed.assigned_date:
+            raise OccupancyError(f"Bed {bed.bed_num} is not assigned.")
+
+        if released_date and released_date <= today:
+            record_move_outs([bed], released_date=released_date)
+            _clear_beds([bed.pk], user)
+        else:
+            fields = {'released_date': released_date, 'updated_at': timezone.now()}
+            if user is not None:
+                fields['updated_by'] = user
+            Bed.objects.filter(pk=bed.pk).update(**fields)
+            # A customer with an upcoming move-out is still living here
+            Customer.objects.filter(pk=bed.customer_id, status=False).update(status=True, updated_at=timezone.now())
+            bump_data_version(Bed, Customer)
+        _touch_unit(bed.unit_id, user)
+    return bed
+
+
+def transfer_bed(customer, to_bed, transfer_date, user=None):
+    """Move customer from their current bed to to_bed; the customer stays active"""
+    with transaction.atomic():
+        from_bed = Bed.objects.select_for_update().filter(customer=customer).first()
+        if from_bed is None:
+            raise OccupancyError(f"{customer.name} is not assigned to a bed.")
+        if from_bed.pk == to_bed.pk:
+            raise OccupancyError(f"{customer.name} is already in bed {to_bed.bed_num}.")
+        to_bed = _lock_bed(to_bed)
+        if to_bed.customer_id:
+            raise OccupancyError(f"Bed {to_bed.bed_num} is already assigned.")
+
+        record_move_outs([from_bed], released_date=transfer_date, deactivate_customers=False)
+        _clear_beds([from_bed.pk], user)
+        assign_bed(to_bed, customer, transfer_date, user=user)
+        if from_bed.unit_id != to_bed.unit_id:
+            _touch_unit(from_bed.unit_id, user)
+    return to_bed
+
+
+def process_move_outs(today=None):
+    """
+    Archive every bed whose released_date has passed: one bulk INSERT of
+    history rows, one UPDATE for customers and one UPDATE for beds.
+    Returns the number of beds released.
+    """
+    today = today or timezone.now().date()
+    with transaction.atomic():
+        beds = list(
+            Bed.objects.select_for_update()
+            .filter(customer__isnull=False, assigned_date__isnull=False, released_date__lte=today)
+            .only('pk', 'customer_id', 'assigned_date', 'released_date')
+        )
+        if not beds:
+            return 0
+        record_move_outs(beds)
+        _clear_beds([bed.pk for bed in beds])
+    return len(beds)
@@ -0,0 +1,79 @@
+import calendar
+import datetime
+from django.db.models import Count, DateField, DurationField, ExpressionWrapper, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from hostel.models import Bed, OccupancyInterval
+
+
+def month_bounds(year, month):
+    return datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def intervals_overlapping(start, end):
+    """Stays that touch [start, end], both ends inclusive; open stays run until today"""
+    return OccupancyInterval.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=start),
+        start_date__lte=end,
+    )
+
+
+def occupancy_at(day, **filters):
+    """
+    Who was in which bed on `day`, for the whole portfolio or narrowed with
+    filters such as hostel=..., bed=... or customer=...
+    """
+    return intervals_overlapping(day, day).filter(**filters).select_related('bed', 'unit', 'hostel', 'customer')
+
+
+def bed_occupants(bed, start, end):
+    """Every stay in `bed` between start and end, e.g. who occupied it in March"""
+    return intervals_overlapping(start, end).filter(bed=bed).select_related('customer')
+
+
+def monthly_occupancy(year, month):
+    """
+    Occupancy per hostel for one month in a single query:
+    occupied beds, customers, bed-days and the bed-day occupancy rate.
+    Hostels with no stays in the month are left out.
+    """
+    first, last = month_bounds(year, month)
+    days_in_month = (last - first).days + 1
+
+    clipped_end = Least(Coalesce('end_date', Value(last, output_field=DateField())), Value(last, output_field=DateField()))
+    clipped_start = Greatest('start_date', Value(first, output_field=DateField()))
+    total_beds = Subquery(
+        Bed.objects.filter(unit__hostel=OuterRef('hostel'))
+        .values('unit__hostel')
+        .annotate(count=Count('pk'))
+        .values('count'),
+        output_field=IntegerField()
+    )
+
+    rows = (
+        intervals_overlapping(first, last)
+        .values('hostel_id', 'hostel__name')
+        .annotate(
+            occupied_beds=Count('bed', distinct=True),
+            customers=Count('customer', distinct=True),
+            stays=Count('pk'),
+            # Stay length minus one per row; the inclusive end day is added back below
+            span=Sum(ExpressionWrapper(clipped_end - clipped_start, output_field=DurationField())),
+            total_beds=total_beds,
+        )
+        .order_by('hostel__name')
+    )
+
+    results = []
+    for row in rows:
+        bed_days = row['span'].days + row['stays']
+        capacity = (row['total_beds'] or 0) * days_in_month
+        results.append({
+            'hostel_id': row['hostel_id'],
+            'hostel_name': row['hostel__name'],
+            'occupied_beds': row['occupied_beds'],
+            'customers': row['customers'],
+            'total_beds': row['total_beds'] or 0,
+            'bed_days': bed_days,
+            'occupancy_rate': round(bed_days * 100 / capacity, 2) if capacity else 0,
+        })
+    return results
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from hostel.hostel_helpers.images import process_image
+from hostel.models import Hostel, Unit
+
+
+class Command(BaseCommand):
+    help = "Build resized WebP/JPEG derivatives for existing Hostel and Unit images"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Process every image, e.g. after changing DERIVATIVE_WIDTHS')
+
+    def handle(self, *args, **options):
+        for model in (Hostel, Unit):
+            built = 0
+            rows = model.objects.exclude(image='').exclude(image__isnull=True).values_list('pk', 'image', 'image_variants')
+            for pk, image, variants in rows.iterator():
+                if not options['force'] and (variants or {}).get('source') == image:
+                    continue
+                process_image(model._meta.label, pk)
+                built += 1
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {built} image(s) processed")
+
+        self.stdout.write(self.style.SUCCESS("Image derivatives are up to date."))
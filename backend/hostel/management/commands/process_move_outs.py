@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from hostel.hostel_helpers.occupancy import process_move_outs
+
+
+class Command(BaseCommand):
+    help = "Release every bed whose released_date is today or earlier and archive it to bed history"
+
+    def handle(self, *args, **options):
+        released = process_move_outs(timezone.now().date())
+        self.stdout.write(self.style.SUCCESS(f"Released {released} bed(s)."))
@@ -9,10 +9,14 @@ class Migration(migrations.Migration):
         ('hostel', '0001_initial'),
     ]
 
+    # 0001_initial already creates the column; record it in the state only so a
+    # fresh database (tests, new installs) migrates cleanly
     operations = [
-        migrations.AddField(
-            model_name='hostel',
-            name='status',
-            field=models.BooleanField(default=True),
-        ),
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AddField(
+                model_name='hostel',
+                name='status',
+                field=models.BooleanField(default=True),
+            ),
+        ]),
     ]
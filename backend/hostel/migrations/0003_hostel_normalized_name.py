@@ -0,0 +1,32 @@
+import re
+
+from django.db import migrations, models
+
+
+def fill_normalized_name(apps, schema_editor):
+    Hostel = apps.get_model('hostel', 'Hostel')
+    hostels = list(Hostel.objects.only('pk', 'name'))
+    for hostel in hostels:
+        hostel.normalized_name = re.sub(r'\s+', '', hostel.name.lower())
+    Hostel.objects.bulk_update(hostels, ['normalized_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0002_hostel_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hostel',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(fill_normalized_name, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='hostel',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, unique=True),
+        ),
+    ]
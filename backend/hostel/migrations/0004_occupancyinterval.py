@@ -0,0 +1,65 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_intervals(apps, schema_editor):
+    Bed = apps.get_model('hostel', 'Bed')
+    BedAssignmentHistory = apps.get_model('hostel', 'BedAssignmentHistory')
+    OccupancyInterval = apps.get_model('hostel', 'OccupancyInterval')
+
+    intervals = [
+        OccupancyInterval(
+            bed_id=history.bed_id,
+            unit_id=history.bed.unit_id,
+            hostel_id=history.bed.unit.hostel_id,
+            customer_id=history.customer_id,
+            start_date=history.assigned_date,
+            end_date=history.released_date,
+        )
+        for history in BedAssignmentHistory.objects.select_related('bed__unit')
+    ]
+    intervals += [
+        OccupancyInterval(
+            bed_id=bed.pk,
+            unit_id=bed.unit_id,
+            hostel_id=bed.unit.hostel_id,
+            customer_id=bed.customer_id,
+            start_date=bed.assigned_date,
+        )
+        for bed in Bed.objects.select_related('unit').filter(customer__isnull=False, assigned_date__isnull=False)
+    ]
+    OccupancyInterval.objects.bulk_create(intervals, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0001_initial'),
+        ('hostel', '0003_hostel_normalized_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OccupancyInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('bed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_intervals', to='hostel.bed')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_intervals', to='customer.customer')),
+                ('hostel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_intervals', to='hostel.hostel')),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy_intervals', to='hostel.unit')),
+            ],
+            options={
+                'ordering': ['start_date'],
+                'indexes': [models.Index(fields=['start_date', 'end_date'], name='occupancy_range_idx'), models.Index(fields=['hostel', 'start_date', 'end_date'], name='occupancy_hostel_range_idx'), models.Index(fields=['bed', 'end_date'], name='occupancy_bed_open_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='occupancyinterval',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_date__isnull', True)), fields=('bed',), name='one_open_interval_per_bed'),
+        ),
+        migrations.RunPython(backfill_intervals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0004_occupancyinterval'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hostel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='unit',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hostel',
+            index=models.Index(fields=['updated_at', 'id'], name='hostel_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['updated_at', 'id'], name='unit_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bed',
+            index=models.Index(fields=['updated_at', 'id'], name='bed_updated_idx'),
+        ),
+    ]
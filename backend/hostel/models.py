@@ -5,6 +5,7 @@ from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
+from backend.data_versions import bump_data_version
 from customer.models import Customer
 from django.utils import timezone
 
@@ -40,9 +41,13 @@ class Hostel(TimeStampedUserModel):
     ]
 
     name = models.CharField(max_length=255, unique=True)
+    # Lowercased, whitespace-free copy of name; the unique index rejects similar names
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)
     common_name = models.CharField(max_length=255, blank=True, null=True)
     hostel_type = models.CharField(max_length=20, choices=HOSTEL_TYPE_CHOICES)
     image = models.ImageField(upload_to='hostel_images/', blank=True, null=True)
+    # Resized WebP/JPEG copies of image, written by hostel_helpers.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     total_rooms = models.PositiveIntegerField()
     address = models.TextField()
     longitude = models.DecimalField(max_digits=15, decimal_places=10, blank=True, null=True)
@@ -63,6 +68,10 @@ class Hostel(TimeStampedUserModel):
         null=True,
         blank=True
     )   # 👇 ForeignKey to a staff user
+
+    class Meta:
+        # Keyset order of the sync API (api/)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='hostel_updated_idx')]
     
 
     def total_beds(self):
@@ -71,22 +80,28 @@ class Hostel(TimeStampedUserModel):
     def available_beds(self):
         return Bed.objects.filter(unit__hostel=self, customer__isnull=True).count()
 
-    def normalize_name(self, name):
+    SIMILAR_NAME_ERROR = 'A hostel with a similar name already exists (ignores case and spacing).'
+
+    @staticmethod
+    def normalize_name(name):
         # Lowercase and remove all spaces
         return re.sub(r'\s+', '', name.lower())
 
     def clean(self):
-        norm_new = self.normalize_name(self.name)
-        existing = Hostel.objects.exclude(pk=self.pk)
-        for hostel in existing:
-            if self.normalize_name(hostel.name) == norm_new:
-                raise ValidationError({'name': 'A hostel with a similar name already exists (ignores case and spacing).'})
+        self.normalized_name = self.normalize_name(self.name)
+        if Hostel.objects.filter(normalized_name=self.normalized_name).exclude(pk=self.pk).exists():
+            raise ValidationError({'name': self.SIMILAR_NAME_ERROR})
 
     def save(self, *args, **kwargs):
         self.name = self.name.strip()
-        self.full_clean()
+        self.normalized_name = self.normalize_name(self.name)
+        # clean() already checks normalized_name, skip the duplicate unique query
+        self.full_clean(exclude=['normalized_name'])
         super().save(*args, **kwargs)
 
+        from hostel.hostel_helpers.images import queue_image_derivatives
+        queue_image_derivatives(self)
+
     def __str__(self):
         return self.name
     
@@ -108,9 +123,11 @@ class Unit(TimeStampedUserModel):
     num_of_beds = models.PositiveIntegerField(null=True, blank=True)
     unit_id = models.CharField(max_length=50, null=True, blank=True)
     image = models.ImageField(upload_to='unit_images/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     memo = models.TextField(blank=True, null=True)
 
     class Meta:
+        indexes = [models.Index(fields=['updated_at', 'id'], name='unit_updated_idx')]
         constraints = [
             models.UniqueConstraint(
                 fields=['hostel', 'room_num'],
@@ -124,6 +141,12 @@ class Unit(TimeStampedUserModel):
             ),
         ]
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        from hostel.hostel_helpers.images import queue_image_derivatives
+        queue_image_derivatives(self)
+
     @property
     def available_beds(self):
         assigned_beds = self.beds.filter(customer__isnull=False).count()
@@ -166,30 +189,27 @@ class Bed(TimeStampedUserModel):
     assigned_date = models.DateField(blank=True, null=True)
     released_date = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['updated_at', 'id'], name='bed_updated_idx')]
+
     def save(self, *args, **kwargs):
         today = timezone.now().date()
+        stored = None
+        if self.pk:
+            stored = Bed.objects.filter(pk=self.pk).values('customer_id', 'assigned_date').first()
 
         # If existing bed and released_date is passed
         if (
             self.pk and
             self.released_date and
             self.released_date <= today and
-            self.customer and
+            self.customer_id and
             self.assigned_date
         ):
-            from .models import BedAssignmentHistory
-
-            # Move to history
-            BedAssignmentHistory.objects.create(
-                bed=self,
-                customer=self.customer,
-                assigned_date=self.assigned_date,
-                released_date=self.released_date
-            )
+            from hostel.hostel_helpers.occupancy import record_move_outs
 
-            # Mark customer inactive
-            self.customer.status = False
-            self.customer.save()
+            # Move to history and mark customer inactive
+            record_move_outs([self])
 
             # Clear bed assignment
             self.customer = None
@@ -197,7 +217,35 @@ class Bed(TimeStampedUserModel):
             self.released_date = None
 
         super().save(*args, **kwargs)
-    
+        self._sync_occupancy(stored, today)
+
+    def _sync_occupancy(self, stored, today):
+        """
+        Keep the bed's open OccupancyInterval in step with assignments saved
+        outside the occupancy service (admin, shell), which only writes beds
+        with update().
+        """
+        old_customer_id = stored['customer_id'] if stored else None
+        open_stay = OccupancyInterval.objects.filter(bed_id=self.pk, end_date__isnull=True)
+        if old_customer_id == self.customer_id:
+            if self.customer_id and self.assigned_date and self.assigned_date != stored['assigned_date']:
+                open_stay.update(start_date=self.assigned_date)
+                bump_data_version(OccupancyInterval)
+            return
+
+        if old_customer_id:
+            # A due move-out was already closed by record_move_outs(); this is a customer cleared or replaced by hand
+            open_stay.update(end_date=today)
+        if self.customer_id:
+            OccupancyInterval.objects.create(
+                bed_id=self.pk,
+                unit_id=self.unit_id,
+                hostel_id=self.unit.hostel_id,
+                customer_id=self.customer_id,
+                start_date=self.assigned_date or today,
+            )
+        bump_data_version(OccupancyInterval)
+
 class BedAssignmentHistory(TimeStampedUserModel):
     bed = models.ForeignKey(Bed, on_delete=models.CASCADE)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
@@ -207,9 +255,68 @@ class BedAssignmentHistory(TimeStampedUserModel):
     def save(self, *args, **kwargs):
         # On save, deactivate the customer
         if self.customer and self.customer.status:
+            Customer.objects.filter(pk=self.customer_id).update(status=False, updated_at=timezone.now())
+            bump_data_version(Customer)
             self.customer.status = False
-            self.customer.save()
+        stored = None
+        if self.pk:
+            stored = BedAssignmentHistory.objects.filter(pk=self.pk).values_list('bed_id', 'customer_id', 'assigned_date').first()
         super().save(*args, **kwargs)
 
+        # Rows added or corrected by hand (admin) carry their stay into the timeline;
+        # record_move_outs() bulk-creates its rows and closes the intervals itself
+        stay = {
+            'bed_id': self.bed_id,
+            'unit_id': self.bed.unit_id,
+            'hostel_id': self.bed.unit.hostel_id,
+            'customer_id': self.customer_id,
+            'start_date': self.assigned_date,
+            'end_date': self.released_date,
+        }
+        if not self._stays(*(stored or (self.bed_id, self.customer_id, self.assigned_date))).update(**stay):
+            OccupancyInterval.objects.create(**stay)
+        bump_data_version(OccupancyInterval)
+
+    def delete(self, *args, **kwargs):
+        self._stays(self.bed_id, self.customer_id, self.assigned_date).delete()
+        bump_data_version(OccupancyInterval)
+        return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def _stays(bed_id, customer_id, assigned_date):
+        """The closed OccupancyInterval recording a history row's stay"""
+        return OccupancyInterval.objects.filter(
+            bed_id=bed_id, customer_id=customer_id, start_date=assigned_date, end_date__isnull=False,
+        )
+
+    def __str__(self):
+        return f"{self.customer} - {self.bed} from {self.assigned_date} to {self.released_date}"
+
+# One row per stay in a bed: open (end_date is null) while the customer is
+# still there, closed with the released date once they move out. Unit and
+# hostel are copied from the bed so portfolio queries need no joins.
+class OccupancyInterval(models.Model):
+    bed = models.ForeignKey(Bed, on_delete=models.CASCADE, related_name='occupancy_intervals')
+    unit = models.ForeignKey(Unit, on_delete=models.CASCADE, related_name='occupancy_intervals')
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, related_name='occupancy_intervals')
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='occupancy_intervals')
+    start_date = models.DateField()
+    end_date = models.DateField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='occupancy_range_idx'),
+            models.Index(fields=['hostel', 'start_date', 'end_date'], name='occupancy_hostel_range_idx'),
+            models.Index(fields=['bed', 'end_date'], name='occupancy_bed_open_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bed'],
+                condition=models.Q(end_date__isnull=True),
+                name='one_open_interval_per_bed'
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.customer} - {self.bed} from {self.assigned_date} to {self.released_date}"
\ No newline at end of file
+        return f"{self.customer} - {self.bed} from {self.start_date} to {self.end_date or 'now'}"
@@ -0,0 +1,36 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _srcset(names):
+    return ', '.join(f"{default_storage.url(name)} {width}w" for width, name in sorted(names.items(), key=lambda item: int(item[0])))
+
+
+@register.simple_tag
+def responsive_image(obj, sizes='100vw', **attrs):
+    """
+    <picture> for a Hostel/Unit image with WebP and JPEG srcsets from image_variants.
+    Falls back to the original upload until the derivatives have been built.
+
+        {% responsive_image hostel sizes="(max-width: 768px) 100vw, 600px" class="img-fluid rounded" alt="Hostel Image" %}
+    """
+    image = getattr(obj, 'image', None)
+    if not image:
+        return ''
+
+    extra = format_html_join('', ' {}="{}"', ((key.replace('_', '-'), value) for key, value in attrs.items()))
+    variants = obj.image_variants or {}
+    if variants.get('source') != image.name or not variants.get('jpeg'):
+        return format_html('<img src="{}" loading="lazy"{}>', image.url, extra)
+
+    jpeg = variants['jpeg']
+    largest = max(jpeg, key=int)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" loading="lazy"{}></picture>',
+        _srcset(variants.get('webp', {})), sizes,
+        default_storage.url(jpeg[largest]), _srcset(jpeg), sizes, extra,
+    )
@@ -0,0 +1,170 @@
+import datetime
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from customer.models import Customer
+from customer.views import customer_detail_state
+from PIL import Image
+
+from hostel.hostel_helpers.images import build_derivatives, process_image
+from hostel.models import Bed, BedAssignmentHistory, Hostel, OccupancyInterval, Unit
+from hostel.templatetags.image_tags import responsive_image
+from hostel.views import hostel_detail_state
+
+
+def make_customer(n):
+    return Customer.objects.create(
+        name=f'Customer {n}', date_of_birth=datetime.date(2000, 1, 1), email=f'c{n}@example.com',
+        phone_number='09012345678', nationality='NP', home_address='-', parent_phone_number='09012345678',
+        visa_type='Student', workplace_or_school_name='-', workplace_or_school_address='-',
+        workplace_or_school_phone='-', zairyu_card_number='-', zairyu_card_expire_date=datetime.date(2030, 1, 1),
+    )
+
+
+class ManualOccupancyTests(TestCase):
+    """Beds and history rows saved outside the occupancy service (admin) keep the timeline"""
+
+    def setUp(self):
+        hostel = Hostel.objects.create(
+            name='Alpha', hostel_type='boys', total_rooms=3, address='-',
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+        unit = Unit.objects.create(hostel=hostel, unit_type='bedroom', room_num='101', num_of_beds=2)
+        self.bed = Bed.objects.create(unit=unit, bed_num='1', rent=Decimal('50000'))
+        self.customer = make_customer(1)
+        self.today = timezone.now().date()
+
+    def test_assigning_and_clearing_a_bed(self):
+        self.bed.customer = self.customer
+        self.bed.assigned_date = datetime.date(2025, 4, 1)
+        self.bed.save()
+        stay = OccupancyInterval.objects.get(bed=self.bed)
+        self.assertEqual((stay.customer_id, stay.start_date, stay.end_date), (self.customer.pk, datetime.date(2025, 4, 1), None))
+
+        self.bed.assigned_date = datetime.date(2025, 4, 3)
+        self.bed.save()
+        stay.refresh_from_db()
+        self.assertEqual(stay.start_date, datetime.date(2025, 4, 3))
+
+        self.bed.customer = None
+        self.bed.assigned_date = None
+        self.bed.save()
+        stay.refresh_from_db()
+        self.assertEqual(stay.end_date, self.today)
+
+    def test_due_move_out_closes_the_stay_once(self):
+        self.bed.customer = self.customer
+        self.bed.assigned_date = datetime.date(2025, 4, 1)
+        self.bed.save()
+        self.bed.released_date = datetime.date(2025, 6, 30)
+        self.bed.save()
+        stay = OccupancyInterval.objects.get(bed=self.bed)
+        self.assertEqual(stay.end_date, datetime.date(2025, 6, 30))
+
+    def test_history_rows_added_and_edited_by_hand(self):
+        history = BedAssignmentHistory.objects.create(
+            bed=self.bed, customer=self.customer,
+            assigned_date=datetime.date(2024, 4, 1), released_date=datetime.date(2024, 9, 30),
+        )
+        stay = OccupancyInterval.objects.get(bed=self.bed)
+        self.assertEqual((stay.start_date, stay.end_date), (datetime.date(2024, 4, 1), datetime.date(2024, 9, 30)))
+
+        history.assigned_date = datetime.date(2024, 5, 1)
+        history.save()
+        stay = OccupancyInterval.objects.get(bed=self.bed)
+        self.assertEqual((stay.start_date, stay.end_date), (datetime.date(2024, 5, 1), datetime.date(2024, 9, 30)))
+
+        history.delete()
+        self.assertFalse(OccupancyInterval.objects.exists())
+
+
+class PageStateTests(TestCase):
+    """The conditional-GET state of a detail page changes with everything the page prints"""
+
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(email='manager@fishtail.jp', password='x', is_staff=True)
+        self.hostel = Hostel.objects.create(
+            name='Alpha', hostel_type='boys', total_rooms=3, address='-', hostel_manager=self.manager,
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+        self.old_unit = Unit.objects.create(hostel=self.hostel, unit_type='bedroom', room_num='101', num_of_beds=1)
+        self.unit = Unit.objects.create(hostel=self.hostel, unit_type='bedroom', room_num='102', num_of_beds=1)
+        old_bed = Bed.objects.create(unit=self.old_unit, bed_num='1', rent=Decimal('50000'))
+        self.customer = make_customer(1)
+        BedAssignmentHistory.objects.create(
+            bed=old_bed, customer=self.customer,
+            assigned_date=datetime.date(2025, 1, 1), released_date=datetime.date(2025, 3, 31),
+        )
+        Bed.objects.create(unit=self.unit, bed_num='1', rent=Decimal('50000'), customer=self.customer,
+                           assigned_date=datetime.date(2025, 4, 1))
+
+    def assertStateChanges(self, state, change):
+        before = state()
+        change()
+        self.assertNotEqual(state(), before)
+
+    def customer_state(self):
+        return customer_detail_state(None, self.customer.pk)
+
+    def test_customer_page_follows_its_hostel_name(self):
+        self.hostel.name = 'Alpha House'
+        self.assertStateChanges(self.customer_state, self.hostel.save)
+
+    def test_customer_page_follows_room_numbers_in_its_history(self):
+        self.old_unit.room_num = '201'
+        self.assertStateChanges(self.customer_state, self.old_unit.save)
+
+    def test_hostel_page_follows_its_manager_name(self):
+        self.manager.first_name = 'Hari'
+        self.assertStateChanges(lambda: hostel_detail_state(None, self.hostel.pk), self.manager.save)
+
+
+def png(width, height):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), 'teal').save(buffer, 'PNG')
+    return SimpleUploadedFile('front.png', buffer.getvalue(), content_type='image/png')
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+        self.hostel = Hostel.objects.create(
+            name='Alpha', hostel_type='boys', total_rooms=3, address='-', image=png(800, 400),
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+
+    def test_build_derivatives_writes_each_width_and_format(self):
+        variants = build_derivatives(self.hostel.image)
+        self.assertEqual((variants['source'], variants['width'], variants['height']), (self.hostel.image.name, 800, 400))
+        # 1280 would upscale; the 800px source gets a full-width copy instead
+        self.assertEqual(sorted(variants['webp'], key=int), ['320', '640', '800'])
+        storage = self.hostel.image.storage
+        with storage.open(variants['jpeg']['320']) as jpeg, Image.open(jpeg) as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (320, 160)))
+        self.assertEqual(build_derivatives(self.hostel.image), variants)
+
+    def test_finished_derivatives_move_updated_at(self):
+        before = Hostel.objects.get(pk=self.hostel.pk).updated_at
+        process_image('hostel.Hostel', self.hostel.pk)
+        hostel = Hostel.objects.get(pk=self.hostel.pk)
+        self.assertEqual(hostel.image_variants['source'], hostel.image.name)
+        self.assertGreater(hostel.updated_at, before)
+
+    def test_responsive_image_falls_back_until_derivatives_exist(self):
+        html = responsive_image(self.hostel, sizes='600px', alt='Hostel')
+        self.assertHTMLEqual(html, f'<img src="{self.hostel.image.url}" loading="lazy" alt="Hostel">')
+
+        process_image('hostel.Hostel', self.hostel.pk)
+        html = responsive_image(Hostel.objects.get(pk=self.hostel.pk), sizes='600px', alt='Hostel')
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn('.320w.webp 320w', html)
+        self.assertIn('.800w.jpg 800w" sizes="600px"', html)
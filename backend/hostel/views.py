@@ -1,12 +1,15 @@
 from django.shortcuts import get_object_or_404, render,redirect
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from .models import Hostel, Unit, Bed, BedAssignmentHistory
-from customer.models import Customer
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Q
+from .models import Hostel, Unit, Bed
 from .forms import HostelForm, UnitForm, BedForm, BedAssignmentForm, EditReleasedDateForm
+from .hostel_helpers.occupancy import OccupancyError, assign_bed as assign_customer_to_bed, release_bed
 from django.contrib import messages
 from finance.models import UtilityExpense
+from customer.models import Customer
+from backend.conditional import conditional_page, rows_state, users_shown
 from datetime import datetime
 
 def get_utility_payment_status():
@@ -158,7 +161,16 @@ def dashboard(request):
     }
     return render(request, 'hostel/dashboard.html', context)
 
+def hostel_detail_state(request, pk):
+    return rows_state(
+        Hostel.objects.filter(pk=pk),
+        Unit.objects.filter(hostel=OuterRef('pk')),
+        Bed.objects.filter(unit__hostel=OuterRef('pk')),
+        users_shown('hostel_manager_id'),
+    )
+
 @login_required(login_url='/accounts/login/')
+@conditional_page(hostel_detail_state)
 def hostel_detail(request, pk):
     hostel = get_object_or_404(Hostel, pk=pk)
     units = hostel.units.all()  # related_name='units'
@@ -172,9 +184,15 @@ def hostel_create(request):
             hostel = form.save(commit=False)
             hostel.created_by = request.user
             hostel.updated_by = request.user
-            hostel.save()
-            messages.success(request, "Created successfully.")
-            return redirect('hostel:dashboard') # Change to your listing view name
+            try:
+                with transaction.atomic():
+                    hostel.save()
+            except IntegrityError:
+                # A similar name was committed concurrently; the unique index caught it
+                form.add_error('name', Hostel.SIMILAR_NAME_ERROR)
+            else:
+                messages.success(request, "Created successfully.")
+                return redirect('hostel:dashboard') # Change to your listing view name
     else:
         form = HostelForm()
     return render(request, 'hostel/hostel_form.html', {'form': form, 'title': 'Add Hostel'})
@@ -205,14 +223,18 @@ def hostel_update(request, pk):
         if form.is_valid():
             hostel = form.save(commit=False)
             hostel.updated_by = request.user
-            hostel.save()
-
-            messages.success(
-                request,
-                "Hostel updated successfully."
-            )
+            try:
+                with transaction.atomic():
+                    hostel.save()
+            except IntegrityError:
+                form.add_error('name', Hostel.SIMILAR_NAME_ERROR)
+            else:
+                messages.success(
+                    request,
+                    "Hostel updated successfully."
+                )
 
-            return redirect('hostel:dashboard')
+                return redirect('hostel:dashboard')
 
     else:
         form = HostelForm(instance=hostel)
@@ -226,7 +248,17 @@ def hostel_update(request, pk):
         }
     )
 
+def unit_detail_state(request, pk):
+    return rows_state(
+        Unit.objects.filter(pk=pk),
+        Hostel.objects.filter(pk=OuterRef('hostel_id')),
+        Bed.objects.filter(unit=OuterRef('pk')),
+        Customer.objects.filter(bed_assignment__unit=OuterRef('pk')),
+        users_shown(),
+    )
+
 @login_required(login_url='/accounts/login/')
+@conditional_page(unit_detail_state)
 def unit_detail(request, pk):
     unit = get_object_or_404(Unit, pk=pk)
     return render(request, 'hostel/unit_detail.html', {'unit': unit})
@@ -341,40 +373,28 @@ def assign_bed(request, bed_id):
 
     
     if request.method == 'POST':
+        # Read before the form copies the posted values onto the instance
+        occupied = bed.customer_id is not None
+        released_date = bed.released_date
         form = BedAssignmentForm(request.POST, instance=bed)
 
         if form.is_valid():
-            old_customer = bed.customer
-            old_assigned_date = bed.assigned_date
-            old_released_date = bed.released_date
-
-            bed = form.save(commit=False)
-
-            if form.fields['customer'].disabled:
-                customer_id = request.POST.get('customer')
-                if customer_id:
-                    bed.customer = get_object_or_404(Customer, id=customer_id)
-
-            if bed.released_date and bed.released_date <= timezone.now().date():
-                if old_customer and old_assigned_date:
-                    BedAssignmentHistory.objects.create(
-                        bed=bed,
-                        customer=old_customer,
-                        assigned_date=old_assigned_date,
-                        released_date=bed.released_date
+            try:
+                if occupied:
+                    # Occupied bed: the only change left is an overdue move-out
+                    if released_date and released_date <= timezone.now().date():
+                        release_bed(bed, released_date, user=request.user)
+                else:
+                    assign_customer_to_bed(
+                        bed,
+                        form.cleaned_data['customer'],
+                        form.cleaned_data['assigned_date'],
+                        user=request.user
                     )
-                    old_customer.status = False
-                    old_customer.save()
-
-                bed.customer = None
-                bed.assigned_date = None
-                bed.released_date = None
-
-            bed.save()
-            bed.unit.updated_by = request.user
-            bed.unit.save()
-
-            return redirect('hostel:unit_detail', bed.unit.id)
+            except OccupancyError as e:
+                form.add_error(None, e.message)
+            else:
+                return redirect('hostel:unit_detail', bed.unit_id)
     else:
         form = BedAssignmentForm(instance=bed)
 
@@ -403,14 +423,12 @@ def edit_released_date(request, bed_id):
     if request.method == 'POST':
         form = EditReleasedDateForm(request.POST, instance=bed)
         if form.is_valid():
-            bed = form.save(commit=False)
-
-            if bed.customer:
-                bed.customer.status = True
-                bed.customer.save()
-
-            bed.save()
-            return redirect('hostel:unit_detail', bed.unit.id)
+            try:
+                release_bed(bed, form.cleaned_data['released_date'], user=request.user)
+            except OccupancyError as e:
+                form.add_error(None, e.message)
+            else:
+                return redirect('hostel:unit_detail', bed.unit_id)
     else:
         form = EditReleasedDateForm(instance=bed)
 
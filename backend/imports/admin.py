@@ -0,0 +1,10 @@
+from django.contrib import admin
+from backend.admin_performance import AdminPerformanceMixin
+from .models import ImportJob
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(AdminPerformanceMixin, admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'processed_rows', 'imported_rows', 'error_rows', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('processed_rows', 'imported_rows', 'error_rows', 'error_report', 'message', 'finished_at')
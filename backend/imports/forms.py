@@ -0,0 +1,13 @@
+from django import forms
+from .models import ImportJob
+
+
+class ImportJobForm(forms.ModelForm):
+    class Meta:
+        model = ImportJob
+        fields = ['kind', 'source']
+        labels = {'source': 'CSV or XLSX file'}
+        widgets = {
+            'kind': forms.Select(attrs={'class': 'form-select form-select-sm'}),
+            'source': forms.ClearableFileInput(attrs={'class': 'form-control form-control-sm', 'accept': '.csv,.xlsx'}),
+        }
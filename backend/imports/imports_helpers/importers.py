@@ -0,0 +1,258 @@
+"""
+Row importers: turn file rows into validated, unsaved model instances.
+
+A row is parsed with the model fields' own to_python(), validators and the
+model's clean(), so imported data obeys the same rules as the forms. Per batch,
+references (customer email, hostel name) are resolved with one query and the
+model's unique constraints are checked with one set-based query. Earlier
+batches are committed by then, so that query also catches duplicates between
+batches and only the current batch's keys are held in memory. Nothing here
+writes to the database.
+"""
+from decimal import Decimal
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import models
+
+from customer.models import Customer
+from finance.models import HostelRevenue, UtilityExpense
+from hostel.models import Hostel
+
+
+def error_text(error):
+    """ValidationError -> 'field: message; ...' for the error report"""
+    if not hasattr(error, 'error_dict'):
+        return '; '.join(error.messages)
+    return '; '.join(
+        message if field == NON_FIELD_ERRORS else f"{field}: {message}"
+        for field, messages in error.message_dict.items()
+        for message in messages
+    )
+
+
+class Importer:
+    model = None
+    # File columns read straight into the model field of the same name, in template order
+    columns = ()
+    # Template columns that resolve() turns into foreign keys
+    reference_columns = ()
+
+    def __init__(self, user):
+        self.user = user
+        # Field.validate() rebuilds the choice list for every row (django-countries
+        # translates ~250 names each time); check choice fields against sets built once
+        self.choices = {
+            field.name: frozenset(value for value, _ in field.flatchoices)
+            for field in self.model._meta.fields if field.choices
+        }
+        # Foreign keys are resolved in bulk by resolve(); uniqueness is checked per batch
+        self.clean_exclude = [
+            field.name for field in self.model._meta.fields
+            if field.is_relation or isinstance(field, models.FileField) or field.name in self.choices
+        ]
+
+    @classmethod
+    def template_columns(cls):
+        return list(cls.reference_columns) + list(cls.columns)
+
+    def prepare(self, rows):
+        """Load whatever resolve() needs for this batch of rows"""
+
+    def resolve(self, instance, row, errors):
+        """Set foreign keys from reference columns, adding to errors when not found"""
+
+    def unique_keys(self, instance):
+        """[(message, key)] for each unique constraint the instance must not collide on"""
+        return []
+
+    def existing_keys(self, instances):
+        """The keys of unique_keys() that already exist in the database"""
+        return set()
+
+    def finish(self, instance):
+        """Last step before insert, for values save() would normally compute"""
+
+    def build(self, row):
+        instance = self.model(created_by=self.user, updated_by=self.user)
+        errors = {}
+        for column in self.columns:
+            value = row.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ''):
+                continue
+            field = self.model._meta.get_field(column)
+            try:
+                setattr(instance, field.attname, field.to_python(value))
+            except ValidationError as e:
+                errors[column] = e.messages
+        for name in self.choices:
+            if name not in errors:
+                self.validate_choice(instance, name, errors)
+        self.resolve(instance, row, errors)
+        try:
+            instance.full_clean(
+                exclude=self.clean_exclude + list(errors), validate_unique=False, validate_constraints=False,
+            )
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                errors.setdefault(field, []).extend(messages)
+        if errors:
+            raise ValidationError(errors)
+        self.finish(instance)
+        return instance
+
+    def validate_choice(self, instance, name, errors):
+        field = self.model._meta.get_field(name)
+        value = getattr(instance, field.attname)
+        if value in field.empty_values:
+            if not field.blank:
+                errors[name] = [field.error_messages['blank']]
+        elif value not in self.choices[name]:
+            errors[name] = [field.error_messages['invalid_choice'] % {'value': value}]
+        else:
+            try:
+                field.run_validators(value)
+            except ValidationError as e:
+                errors[name] = e.messages
+
+    def validate(self, batch):
+        """
+        Split a batch of (line, row) into ([(line, row, instance)], [(line, row, error text)]).
+        Rows that collide with the database or an earlier row of the batch are errors.
+        """
+        self.prepare([row for _, row in batch])
+        built, errors = [], []
+        for line, row in batch:
+            try:
+                built.append((line, row, self.build(row)))
+            except ValidationError as e:
+                errors.append((line, row, error_text(e)))
+
+        existing = self.existing_keys([instance for _, _, instance in built])
+        valid, seen = [], set()
+        for line, row, instance in built:
+            keys = self.unique_keys(instance)
+            duplicate = next((message for message, key in keys if key in existing or key in seen), None)
+            if duplicate:
+                errors.append((line, row, duplicate))
+                continue
+            seen.update(key for _, key in keys)
+            valid.append((line, row, instance))
+        return valid, errors
+
+
+class CustomerImporter(Importer):
+    model = Customer
+    columns = (
+        'name', 'date_of_birth', 'email', 'phone_number', 'nationality', 'home_address',
+        'parent_phone_number', 'visa_type', 'workplace_or_school_name', 'workplace_or_school_address',
+        'workplace_or_school_phone', 'zairyu_card_number', 'zairyu_card_expire_date', 'status', 'memo',
+    )
+
+    def unique_keys(self, customer):
+        return [
+            ("A customer with this email already exists.", ('email', customer.email)),
+            (
+                "A customer with this name, date of birth and status already exists.",
+                ('name_dob', customer.status, customer.name, customer.date_of_birth),
+            ),
+        ]
+
+    def existing_keys(self, customers):
+        if not customers:
+            return set()
+        emails = {customer.email for customer in customers}
+        keys = {('email', email) for email in Customer.objects.filter(email__in=emails).values_list('email', flat=True)}
+        matches = Customer.objects.filter(
+            name__in={customer.name for customer in customers},
+            date_of_birth__in={customer.date_of_birth for customer in customers},
+        ).values_list('status', 'name', 'date_of_birth')
+        keys.update(('name_dob', *match) for match in matches)
+        return keys
+
+
+class RevenueImporter(Importer):
+    model = HostelRevenue
+    reference_columns = ('customer_email',)
+    columns = (
+        'title', 'year', 'month',
+        'deposit', 'deposit_discount_percent', 'initial_fee', 'initial_fee_discount_percent',
+        'internet', 'utilities', 'rent', 'rent_discount_percent',
+        'payment_type', 'collected_amount', 'prepaid_amount', 'memo',
+    )
+
+    def prepare(self, rows):
+        emails = {str(row.get('customer_email') or '').strip() for row in rows}
+        self.customers = dict(Customer.objects.filter(email__in=emails).values_list('email', 'pk'))
+
+    def resolve(self, revenue, row, errors):
+        email = str(row.get('customer_email') or '').strip()
+        revenue.customer_id = self.customers.get(email)
+        if revenue.customer_id is None:
+            errors['customer_email'] = [f"No customer with email '{email}'."]
+
+    def unique_keys(self, revenue):
+        return [(
+            f"A {revenue.title} revenue for this customer in {revenue.year}-{revenue.month:02d} already exists.",
+            (revenue.title, revenue.customer_id, revenue.year, revenue.month),
+        )]
+
+    def existing_keys(self, revenues):
+        if not revenues:
+            return set()
+        return set(HostelRevenue.objects.filter(
+            customer_id__in={revenue.customer_id for revenue in revenues},
+            year__in={revenue.year for revenue in revenues},
+        ).values_list('title', 'customer_id', 'year', 'month'))
+
+    def finish(self, revenue):
+        # The forms always send a discount; a blank column means no discount, as it does there
+        for name in ('deposit_discount_percent', 'initial_fee_discount_percent', 'rent_discount_percent'):
+            if getattr(revenue, name) is None:
+                setattr(revenue, name, Decimal(0))
+        revenue.compute_amounts()
+
+
+class UtilityExpenseImporter(Importer):
+    model = UtilityExpense
+    reference_columns = ('hostel',)
+    columns = (
+        'expense_type', 'amount', 'billing_year', 'billing_month', 'date_from', 'date_to',
+        'paid_date', 'usage_amount', 'description',
+    )
+
+    def __init__(self, user):
+        super().__init__(user)
+        # Hostels are few; match names the way the unique normalized_name index does
+        self.hostels = dict(Hostel.objects.values_list('normalized_name', 'pk'))
+
+    def resolve(self, expense, row, errors):
+        name = str(row.get('hostel') or '')
+        expense.hostel_id = self.hostels.get(Hostel.normalize_name(name))
+        if expense.hostel_id is None:
+            errors['hostel'] = [f"No hostel named '{name.strip()}'."]
+        expense.paid_by = self.user
+        # Approval stays with superusers on the expense page, which also records approved_by
+        expense.approval_status = UtilityExpense.ApprovalStatus.PENDING
+
+    def unique_keys(self, expense):
+        return [(
+            f"A {expense.expense_type} expense for this hostel in {expense.billing_year}-{expense.billing_month:02d} already exists.",
+            (expense.hostel_id, expense.billing_year, expense.billing_month, expense.expense_type),
+        )]
+
+    def existing_keys(self, expenses):
+        if not expenses:
+            return set()
+        return set(UtilityExpense.objects.filter(
+            hostel_id__in={expense.hostel_id for expense in expenses},
+            billing_year__in={expense.billing_year for expense in expenses},
+        ).values_list('hostel_id', 'billing_year', 'billing_month', 'expense_type'))
+
+
+IMPORTERS = {
+    'customers': CustomerImporter,
+    'revenues': RevenueImporter,
+    'utility_expenses': UtilityExpenseImporter,
+}
@@ -0,0 +1,51 @@
+"""
+Streaming row readers for uploaded import files.
+
+Both readers yield one (line number, {column: value}) pair at a time and never
+hold the whole file: CSV is decoded incrementally and XLSX is opened in
+openpyxl's read-only mode, which parses the sheet XML lazily. Column headers
+are normalized ("Date of Birth" -> "date_of_birth").
+"""
+import csv
+import io
+import os
+import re
+
+import openpyxl
+
+
+def normalize_header(value):
+    return re.sub(r'[\s\-]+', '_', str(value or '').strip().lower())
+
+
+def _rows(header, rows, first_line):
+    columns = [normalize_header(value) for value in header]
+    for line, values in enumerate(rows, start=first_line):
+        if not any(value not in (None, '') for value in values):
+            continue
+        yield line, dict(zip(columns, values))
+
+
+def _csv_rows(binary_file):
+    # utf-8-sig drops the BOM Excel writes in front of "CSV UTF-8" exports
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    header = next(reader, [])
+    yield from _rows(header, reader, first_line=2)
+
+
+def _xlsx_rows(binary_file):
+    workbook = openpyxl.load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, ())
+        yield from _rows(header, rows, first_line=2)
+    finally:
+        workbook.close()
+
+
+def read_rows(binary_file, filename):
+    """(line number, row dict) for each non-blank data row of a .csv or .xlsx file"""
+    if os.path.splitext(filename)[1].lower() == '.xlsx':
+        return _xlsx_rows(binary_file)
+    return _csv_rows(binary_file)
@@ -0,0 +1,123 @@
+"""
+Run an ImportJob: stream the file, validate it in batches and bulk insert.
+
+Each batch's rows and the job's progress counters are committed in one
+transaction, so a job whose worker died (deploy, worker recycling) is resumed
+by run_imports after the last committed batch. Errors go to a CSV report that
+is appended batch by batch.
+"""
+import csv
+import itertools
+import logging
+import os
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from backend.data_versions import bump_data_version
+from imports.models import ImportJob
+from .importers import IMPORTERS
+from .readers import read_rows
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+# A running job whose counters have not moved for this long has lost its worker
+STALE_AFTER = timedelta(minutes=10)
+
+
+def claimable_jobs():
+    stale = timezone.now() - STALE_AFTER
+    return ImportJob.objects.filter(Q(status='pending') | Q(status='running', updated_at__lt=stale))
+
+
+def claim(job_id):
+    """Mark the job running; False if it is finished or another worker already has it"""
+    return claimable_jobs().filter(pk=job_id).update(status='running', updated_at=timezone.now()) == 1
+
+
+def _batches(rows, size):
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+def _insert(model, valid):
+    """
+    bulk_create the batch. If a concurrent writer took one of its unique keys
+    after validation, fall back to row by row so only the colliding rows fail.
+    """
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([instance for _, _, instance in valid])
+        return len(valid), []
+    except IntegrityError:
+        pass
+    inserted, errors = 0, []
+    for line, row, instance in valid:
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([instance])
+            inserted += 1
+        except IntegrityError as e:
+            errors.append((line, row, f"Could not be saved: {e}"))
+    return inserted, errors
+
+
+class ErrorReport:
+    """CSV of the rejected rows: line number, reasons and the original columns"""
+
+    def __init__(self, job):
+        self.job = job
+        self.columns = None
+
+    def add(self, errors):
+        if not errors:
+            return
+        if not self.job.error_report:
+            self.job.error_report.name = f"documents/imports/errors/import-{self.job.pk}-errors.csv"
+            ImportJob.objects.filter(pk=self.job.pk).update(error_report=self.job.error_report.name)
+        path = self.job.error_report.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        new_file = not os.path.exists(path)
+        if self.columns is None:
+            self.columns = list(errors[0][1])
+        with open(path, 'a', newline='', encoding='utf-8-sig' if new_file else 'utf-8') as report:
+            writer = csv.writer(report)
+            if new_file:
+                writer.writerow(['row', 'errors', *self.columns])
+            for line, row, message in errors:
+                writer.writerow([line, message, *(row.get(column, '') for column in self.columns)])
+
+
+def run_import(job_id):
+    """Import (or resume) one job. Safe to call from several workers: only one claims it."""
+    if not claim(job_id):
+        return
+    job = ImportJob.objects.select_related('created_by').get(pk=job_id)
+    importer = IMPORTERS[job.kind](job.created_by)
+    report = ErrorReport(job)
+    try:
+        with job.source.open('rb') as source:
+            rows = itertools.islice(read_rows(source, job.source.name), job.processed_rows, None)
+            for batch in _batches(rows, BATCH_SIZE):
+                valid, errors = importer.validate(batch)
+                with transaction.atomic():
+                    inserted, failed = _insert(importer.model, valid)
+                    # Written before the commit: a crash can repeat a batch's errors, never lose them
+                    report.add(sorted(errors + failed, key=lambda error: error[0]))
+                    ImportJob.objects.filter(pk=job.pk).update(
+                        processed_rows=F('processed_rows') + len(batch),
+                        imported_rows=F('imported_rows') + inserted,
+                        error_rows=F('error_rows') + len(errors) + len(failed),
+                        updated_at=timezone.now(),
+                    )
+                    # bulk_create sends no post_save, so invalidate cached fragments here
+                    bump_data_version(importer.model)
+    except Exception as e:
+        logger.error(f"Import job {job.pk} failed: {e}", exc_info=True)
+        ImportJob.objects.filter(pk=job.pk).update(status='failed', message=str(e), finished_at=timezone.now())
+        return
+    ImportJob.objects.filter(pk=job.pk).update(status='done', finished_at=timezone.now())
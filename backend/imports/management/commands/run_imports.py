@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from imports.imports_helpers.runner import claimable_jobs, run_import
+
+
+class Command(BaseCommand):
+    help = (
+        "Run pending import jobs and resume ones whose worker died. Uploads start "
+        "right away in the web process; run this periodically to pick up the rest."
+    )
+
+    def handle(self, *args, **options):
+        job_ids = list(claimable_jobs().order_by('created_at').values_list('pk', flat=True))
+        for job_id in job_ids:
+            run_import(job_id)
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(job_ids)} import job(s)."))
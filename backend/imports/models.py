@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.validators import FileExtensionValidator
+from django.db import models
+
+User = get_user_model()
+
+
+class ImportJob(models.Model):
+    """
+    One uploaded CSV/XLSX file and the progress of importing it. Files live
+    under documents/ so nginx never serves them directly (they hold customer data).
+    """
+    KIND_CHOICES = [
+        ('customers', 'Customers'),
+        ('revenues', 'Revenues'),
+        ('utility_expenses', 'Utility Expenses'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    source = models.FileField(
+        upload_to='documents/imports/',
+        validators=[FileExtensionValidator(allowed_extensions=['csv', 'xlsx'])],
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # Data rows already committed (or reported); a resumed job skips this many
+    processed_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    error_report = models.FileField(upload_to='documents/imports/errors/', blank=True)
+    message = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Touched after every batch; a running job that stops updating has died with its worker
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} import #{self.pk} ({self.status})"
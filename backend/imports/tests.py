@@ -0,0 +1,83 @@
+import datetime
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from customer.models import Customer
+from finance.models import HostelRevenue, UtilityExpense
+from hostel.models import Hostel
+from imports.imports_helpers.runner import run_import
+from imports.models import ImportJob
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImportJobTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_superuser(email='admin@fishtail.jp', password='x')
+        Customer.objects.create(
+            name='Asha', date_of_birth=datetime.date(2000, 1, 1), email='asha@example.com',
+            phone_number='09012345678', nationality='NP', home_address='-', parent_phone_number='09012345678',
+            visa_type='Student', workplace_or_school_name='-', workplace_or_school_address='-',
+            workplace_or_school_phone='-', zairyu_card_number='-', zairyu_card_expire_date=datetime.date(2030, 1, 1),
+        )
+
+    def run_csv(self, content, kind='revenues'):
+        job = ImportJob.objects.create(
+            kind=kind, created_by=self.user,
+            source=SimpleUploadedFile('revenues.csv', content.encode()),
+        )
+        run_import(job.pk)
+        job.refresh_from_db()
+        return job
+
+    def test_blank_discounts_import_undiscounted_totals(self):
+        job = self.run_csv(
+            "customer_email,title,year,month,deposit,initial_fee,internet,utilities,rent\n"
+            "asha@example.com,rent,2026,4,,,1000,2000,30000\n"
+            "asha@example.com,registration_fee,2026,4,10000,5000,,,\n"
+        )
+        self.assertEqual((job.status, job.imported_rows, job.error_rows), ('done', 2, 0))
+
+        rent = HostelRevenue.objects.get(title='rent')
+        self.assertEqual(rent.rent_after_discount, Decimal('30000'))
+        self.assertEqual(rent.total_amount, Decimal('33000'))
+        self.assertEqual(rent.collected_amount, Decimal('33000'))
+
+        registration = HostelRevenue.objects.get(title='registration_fee')
+        self.assertEqual(registration.total_amount, Decimal('15000'))
+        self.assertEqual(registration.collected_amount, Decimal('15000'))
+
+    def test_discounts_are_applied(self):
+        self.run_csv(
+            "customer_email,title,year,month,internet,utilities,rent,rent_discount_percent\n"
+            "asha@example.com,rent,2026,5,1000,2000,30000,10\n"
+        )
+        rent = HostelRevenue.objects.get()
+        self.assertEqual(rent.rent_after_discount, Decimal('27000'))
+        self.assertEqual(rent.total_amount, Decimal('30000'))
+
+    def test_utility_expenses_are_imported_pending(self):
+        Hostel.objects.create(
+            name='Alpha', hostel_type='boys', total_rooms=3, address='-',
+            deposit_fee=Decimal('10000'), initial_fee=Decimal('5000'),
+        )
+        job = self.run_csv(
+            "hostel,expense_type,amount,billing_year,billing_month,date_from,date_to,paid_date,approval_status\n"
+            "alpha,ELECTRICITY,12000,2026,4,2026-03-01,2026-03-31,2026-04-10,APPROVED\n",
+            kind='utility_expenses',
+        )
+        self.assertEqual((job.imported_rows, job.error_rows), (1, 0))
+        expense = UtilityExpense.objects.get()
+        self.assertEqual(expense.approval_status, UtilityExpense.ApprovalStatus.PENDING)
+        self.assertIsNone(expense.approved_by)
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'imports'
+
+urlpatterns = [
+    path('', views.import_list, name='import_list'),
+    path('templates/<slug:kind>.csv', views.import_template, name='import_template'),
+    path('<int:pk>/errors/', views.error_report, name='error_report'),
+]
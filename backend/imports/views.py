@@ -0,0 +1,60 @@
+import csv
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+
+from backend.background import run_in_background
+from backend.protected_media import serve_protected
+from .forms import ImportJobForm
+from .imports_helpers.importers import IMPORTERS
+from .imports_helpers.runner import run_import
+from .models import ImportJob
+
+# Recent jobs shown under the upload form
+RECENT_JOBS = 20
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required('imports.add_importjob', raise_exception=True)
+def import_list(request):
+    if request.method == 'POST':
+        form = ImportJobForm(request.POST, request.FILES)
+        if form.is_valid():
+            job = form.save(commit=False)
+            job.created_by = request.user
+            job.save()
+            run_in_background(run_import, job.pk)
+            messages.success(request, f"Import #{job.pk} started. Reload this page to follow its progress.")
+            return redirect('imports:import_list')
+    else:
+        form = ImportJobForm()
+    jobs = ImportJob.objects.select_related('created_by')[:RECENT_JOBS]
+    return render(request, 'imports/import_list.html', {
+        'form': form,
+        'jobs': jobs,
+        'templates': ImportJob.KIND_CHOICES,
+    })
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required('imports.add_importjob', raise_exception=True)
+def import_template(request, kind):
+    """Empty CSV with the columns an import of this kind reads"""
+    if kind not in IMPORTERS:
+        raise Http404("Unknown import type")
+    response = HttpResponse(content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{kind}_import_template.csv"'
+    response.write('﻿')  # BOM, so Excel opens it as UTF-8
+    csv.writer(response).writerow(IMPORTERS[kind].template_columns())
+    return response
+
+
+@login_required(login_url='/accounts/login/')
+@permission_required('imports.view_importjob', raise_exception=True)
+def error_report(request, pk):
+    job = get_object_or_404(ImportJob, pk=pk)
+    response = serve_protected(request, job.error_report)
+    response['Content-Disposition'] = response['Content-Disposition'].replace('inline', 'attachment', 1)
+    return response
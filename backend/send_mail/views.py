@@ -4,6 +4,7 @@ from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string, TemplateDoesNotExist
 from hostel.models import Hostel, Bed
+from backend.background import send_email_in_background
 import logging
 import re
 
@@ -68,10 +69,11 @@ def dashboard(request):
 
             msg.attach_alternative(html_content, "text/html")
 
-            # ✅ Send
-            msg.send(fail_silently=False)
+            # ✅ Send on a background thread so the SMTP round trip doesn't hold a worker
+            send_email_in_background(msg)
 
-            messages.success(request, f"✅ Email sent to {len(emails)} users.")
+            # Delivery happens after the response; SMTP failures are only logged
+            messages.info(request, f"📨 Sending email to {len(emails)} users in the background.")
 
         except Exception as e:
             logger.error(f"Bulk email failed: {e}", exc_info=True)
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import Target, RentalContract
+from backend.admin_performance import AdminPerformanceMixin
+from .models import Target, RentalContract, TargetProgressSnapshot
+from .target_helpers.progress import with_progress
 
 
 class RentalContractInline(admin.TabularInline):
@@ -19,7 +21,7 @@ class RentalContractInline(admin.TabularInline):
 
 
 @admin.register(Target)
-class TargetAdmin(admin.ModelAdmin):
+class TargetAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = [
         'target_to', 'target_period', 'target_amount', 'status', 
         'assigned_by', 'achievement_progress', 'created_by', 'created_at'
@@ -53,16 +55,29 @@ class TargetAdmin(admin.ModelAdmin):
     target_period.short_description = "Target Period"
 
     def achievement_progress(self, obj):
-        """Display achievement progress placeholder"""
-        return format_html('<span style="color: gray;">N/A</span>')
+        """Display achieved / target amount from the progress_amount annotation"""
+        if not obj.target_amount:
+            return format_html('<span style="color: gray;">N/A</span>')
+        percentage = float(obj.progress_amount) / float(obj.target_amount) * 100
+        if percentage >= 100:
+            color = 'green'
+        elif percentage >= 80:
+            color = 'orange'
+        else:
+            color = 'gray'
+        return format_html(
+            '<span style="color: {};" title="¥{} / ¥{}">{}%</span>',
+            color, f"{obj.progress_amount:,.0f}", f"{obj.target_amount:,.0f}", f"{percentage:.1f}"
+        )
     
     achievement_progress.short_description = "Progress"
+    achievement_progress.admin_order_field = 'progress_amount'
 
     def get_queryset(self, request):
-        """Optimize queries"""
-        return super().get_queryset(request).select_related(
+        """Optimize queries; progress comes from one correlated subquery per row"""
+        return with_progress(super().get_queryset(request).select_related(
             'target_to', 'assigned_by'
-        )
+        ))
 
     def save_model(self, request, obj, form, change):
         """Auto-assign the current user for audit trail"""
@@ -76,7 +91,7 @@ class TargetAdmin(admin.ModelAdmin):
 
 
 @admin.register(RentalContract)
-class RentalContractAdmin(admin.ModelAdmin):
+class RentalContractAdmin(AdminPerformanceMixin, admin.ModelAdmin):
     list_display = [
         'customer_name', 'target_to', 'contract_date', 'total_amount', 'ad_fee_confirmed_at', 'contract_type',
         'living_num_people', 'created_at'
@@ -87,6 +102,7 @@ class RentalContractAdmin(admin.ModelAdmin):
     search_fields = [
         'customer_name', 'customer_number', 'building_address', 'target_to__target_to__email'
     ]
+    list_select_related_extra = ('target_to__target_to',)  # Target.__str__ prints the user
     readonly_fields = ('total_amount', 'ad_fee_confirmed_by', 'ad_fee_confirmed_at', 'created_at', 'updated_at', 'created_by', 'updated_by')
     
     fieldsets = (
@@ -132,3 +148,19 @@ class RentalContractAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Optimize queries"""
         return super().get_queryset(request).select_related('target_to', 'created_by', 'updated_by')
+
+
+@admin.register(TargetProgressSnapshot)
+class TargetProgressSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['target', 'achieved_amount', 'progress_percentage', 'closed_at']
+    list_filter = ['target__target_year', 'target__target_month']
+    search_fields = ['target__target_to__email', 'target__target_to__first_name']
+    readonly_fields = ('target', 'achieved_amount', 'progress_percentage', 'closed_at')
+
+    def has_add_permission(self, request):
+        """Snapshots are only written by the close_targets command"""
+        return False
+
+    def get_queryset(self, request):
+        """Optimize queries"""
+        return super().get_queryset(request).select_related('target__target_to')
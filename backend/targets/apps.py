@@ -8,7 +8,9 @@ class TargetsConfig(AppConfig):
 
     def ready(self):
         """Import signals when app is ready"""
+        from backend.data_versions import track_data_versions
+        track_data_versions(self)
         try:
             import targets.signals  # noqa F401
         except ImportError:
-            pass
\ No newline at end of file
+            pass
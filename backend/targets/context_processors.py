@@ -1,5 +1,5 @@
 from django.utils import timezone
-from .models import Target, RentalContract
+from .target_helpers.profile_stats import get_current_target, get_progress_percentage
 
 
 def current_target_context(request):
@@ -17,37 +17,13 @@ def current_target_context(request):
     if request.user.is_authenticated and not request.user.is_superuser:
         today = timezone.now().date()
         
-        try:
-            current_target = Target.objects.select_related('assigned_by').get(
-                target_to=request.user,
-                target_month=today.month,
-                target_year=today.year
-            )
-            
-            # Calculate current month achievements (rental contracts for current month target)
-            current_month_achievements = RentalContract.objects.filter(
-                target_to__target_to=request.user,
-                target_to__target_year=today.year,
-                target_to__target_month=today.month
-            )
-            
-            # Calculate current month achievement total
-            current_month_achievement_total = sum(
-                achievement.agent_fee + achievement.ad_fee for achievement in current_month_achievements
-            )
-            
-            # Calculate progress percentage
-            if current_target.target_amount > 0:
-                progress_percentage = (current_month_achievement_total / current_target.target_amount) * 100
-            else:
-                progress_percentage = 0
-            
+        # Current target and its achieved total in a single query
+        current_target = get_current_target(request.user, today)
+        
+        if current_target:
             context['current_target'] = current_target
             context['has_current_target'] = True
-            context['current_target_progress'] = round(progress_percentage, 1)
-            context['current_target_achieved'] = current_month_achievement_total
-            
-        except Target.DoesNotExist:
-            pass
+            context['current_target_progress'] = get_progress_percentage(current_target)
+            context['current_target_achieved'] = current_target.progress_amount
     
-    return context
\ No newline at end of file
+    return context
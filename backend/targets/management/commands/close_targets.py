@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from targets.target_helpers.closing import close_month, months_to_close
+
+
+class Command(BaseCommand):
+    help = "Close past target months: mark active targets completed/overdue and freeze their progress snapshots"
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        periods = months_to_close(today)
+
+        if not periods:
+            self.stdout.write("No target months to close.")
+            return
+
+        for year, month in periods:
+            completed, overdue, snapshots = close_month(year, month)
+            self.stdout.write(
+                f"{year}/{month:02d}: {completed} completed, {overdue} overdue, {snapshots} snapshots"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Closed {len(periods)} target month(s)."))
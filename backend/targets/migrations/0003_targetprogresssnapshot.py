@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-19 14:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('targets', '0002_rentalcontract_ad_fee_receipt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TargetProgressSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('achieved_amount', models.DecimalField(decimal_places=2, help_text='Agent fee + AD fee total at month close', max_digits=14)),
+                ('progress_percentage', models.DecimalField(decimal_places=2, help_text='Achieved amount as a percentage of the target amount', max_digits=7)),
+                ('closed_at', models.DateTimeField(auto_now_add=True)),
+                ('target', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress_snapshot', to='targets.target')),
+            ],
+            options={
+                'verbose_name': 'Target Progress Snapshot',
+                'verbose_name_plural': 'Target Progress Snapshots',
+                'ordering': ['-target__target_year', '-target__target_month'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('targets', '0003_targetprogresssnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rentalcontract',
+            index=models.Index(fields=['updated_at', 'id'], name='contract_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-19 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('targets', '0004_rentalcontract_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='targetprogresssnapshot',
+            name='progress_percentage',
+            field=models.DecimalField(decimal_places=2, help_text='Achieved amount as a percentage of the target amount', max_digits=20),
+        ),
+    ]
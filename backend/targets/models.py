@@ -172,6 +172,8 @@ class RentalContract(TimeStampedUserModel):
         verbose_name = "Rental Contract"
         verbose_name_plural = "Rental Contracts"
         ordering = ['-created_at']
+        # Keyset order of the sync API (api/)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='contract_updated_idx')]
 
     def __str__(self):
         return f"{self.customer_name} - {self.contract_date} - ¥{self.total_amount}"
@@ -213,3 +215,21 @@ class RentalContract(TimeStampedUserModel):
         if kwargs.pop('validate', False):
             self.full_clean()
         super().save(*args, **kwargs)
+
+
+class TargetProgressSnapshot(models.Model):
+    """Frozen achievement totals for a target whose month has been closed by `close_targets`"""
+
+    target = models.OneToOneField(Target, on_delete=models.CASCADE, related_name='progress_snapshot')
+    achieved_amount = models.DecimalField(max_digits=14, decimal_places=2, help_text="Agent fee + AD fee total at month close")
+    # Wide enough for any achieved amount over the smallest target (¥0.01), so close_month never overflows
+    progress_percentage = models.DecimalField(max_digits=20, decimal_places=2, help_text="Achieved amount as a percentage of the target amount")
+    closed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-target__target_year', '-target__target_month']
+        verbose_name = "Target Progress Snapshot"
+        verbose_name_plural = "Target Progress Snapshots"
+
+    def __str__(self):
+        return f"{self.target} - ¥{self.achieved_amount} ({self.progress_percentage}%)"
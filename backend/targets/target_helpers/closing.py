@@ -0,0 +1,49 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import F, Q
+from backend.data_versions import bump_data_version
+from targets.models import Target, TargetProgressSnapshot
+from targets.target_helpers.progress import achieved_amount_subquery
+
+
+def months_to_close(today):
+    """(year, month) pairs before the current month that still have targets without a snapshot"""
+    return list(
+        Target.objects.filter(progress_snapshot__isnull=True).filter(
+            Q(target_year__lt=today.year) | Q(target_year=today.year, target_month__lt=today.month)
+        ).order_by('target_year', 'target_month').values_list('target_year', 'target_month').distinct()
+    )
+
+
+@transaction.atomic
+def close_month(year, month):
+    """
+    Sweep statuses for one past month and freeze its progress.
+    Open targets (active, or already flagged overdue by save()) that reached their
+    amount become 'completed', remaining active ones 'overdue'; each is a single UPDATE.
+    Returns (completed, overdue, snapshots) counts.
+    """
+    month_targets = Target.objects.filter(target_year=year, target_month=month)
+    open_targets = month_targets.filter(status__in=['active', 'overdue']).annotate(
+        progress_amount=achieved_amount_subquery()
+    )
+
+    completed = open_targets.filter(progress_amount__gte=F('target_amount')).update(status='completed')
+    overdue = month_targets.filter(status='active').update(status='overdue')
+
+    pending = month_targets.filter(progress_snapshot__isnull=True).annotate(
+        progress_amount=achieved_amount_subquery()
+    ).values_list('pk', 'target_amount', 'progress_amount')
+
+    snapshots = []
+    for target_id, target_amount, progress_amount in pending:
+        percentage = (progress_amount / target_amount * 100) if target_amount else Decimal('0')
+        snapshots.append(TargetProgressSnapshot(
+            target_id=target_id,
+            achieved_amount=progress_amount,
+            progress_percentage=percentage.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+        ))
+    TargetProgressSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+    bump_data_version(Target, TargetProgressSnapshot)
+
+    return completed, overdue, len(snapshots)
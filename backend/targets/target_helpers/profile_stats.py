@@ -0,0 +1,83 @@
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from targets.models import Target, RentalContract
+from targets.target_helpers.progress import with_progress
+
+
+def get_current_target(user, today):
+    """Return the user's target for today's month annotated with progress_amount, or None"""
+    return with_progress(
+        Target.objects.select_related('assigned_by').filter(
+            target_to=user,
+            target_month=today.month,
+            target_year=today.year
+        )
+    ).first()
+
+
+def get_progress_percentage(target):
+    """Progress of an annotated target as a percentage rounded to one decimal"""
+    if target is None or target.target_amount <= 0:
+        return 0
+    return round((target.progress_amount / target.target_amount) * 100, 1)
+
+
+def get_profile_stats(user, today):
+    """
+    Every counter on the profile page in a single aggregate round trip:
+    overall/completed totals, this month's active/overdue targets and
+    this month's contract count and fee total.
+    """
+    this_month = Q(target_month=today.month, target_year=today.year)
+
+    stats = Target.objects.filter(target_to=user).aggregate(
+        total_targets=Count('id', distinct=True),
+        completed_targets=Count('id', filter=Q(status='completed'), distinct=True),
+        active_targets=Count('id', filter=this_month & Q(status='active'), distinct=True),
+        overdue_targets=Count('id', filter=this_month & Q(status='overdue'), distinct=True),
+        current_month_contracts=Count('rental_contracts', filter=this_month),
+        current_month_agent_fee=Sum('rental_contracts__agent_fee', filter=this_month),
+        current_month_ad_fee=Sum('rental_contracts__ad_fee', filter=this_month),
+    )
+
+    stats['current_month_achievement_total'] = (
+        (stats.pop('current_month_agent_fee') or Decimal('0')) +
+        (stats.pop('current_month_ad_fee') or Decimal('0'))
+    )
+    stats['completion_rate'] = 0
+    if stats['total_targets'] > 0:
+        stats['completion_rate'] = (stats['completed_targets'] / stats['total_targets']) * 100
+
+    return stats
+
+
+def get_achievements_by_period(targets):
+    """Achieved totals per target period from one grouped query (snapshots for closed months)"""
+    return [
+        {
+            'year': achievement['target_year'],
+            'month': achievement['target_month'],
+            'total_achieved': achievement['progress_amount']
+        }
+        for achievement in with_progress(targets).values('target_year', 'target_month', 'progress_amount')
+    ]
+
+
+def get_period_totals(user, year, month):
+    """Agent fee, AD fee and combined totals of the user's contracts for one target period"""
+    totals = RentalContract.objects.filter(
+        target_to__target_to=user,
+        target_to__target_year=year,
+        target_to__target_month=month
+    ).aggregate(
+        total_agent_fee=Sum('agent_fee'),
+        total_ad_fee=Sum('ad_fee')
+    )
+
+    total_agent_fee = totals['total_agent_fee'] or Decimal('0')
+    total_ad_fee = totals['total_ad_fee'] or Decimal('0')
+    return {
+        'total_agent_fee': total_agent_fee,
+        'total_ad_fee': total_ad_fee,
+        'total_amount': total_agent_fee + total_ad_fee,
+    }
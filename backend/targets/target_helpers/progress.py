@@ -0,0 +1,43 @@
+from decimal import Decimal
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from targets.models import RentalContract
+
+
+def achieved_amount_subquery():
+    """Correlated subquery returning agent + AD fee totals for the outer Target row"""
+    totals = RentalContract.objects.filter(
+        target_to=OuterRef('pk')
+    ).order_by().values('target_to').annotate(
+        total_achieved=Sum('agent_fee') + Sum('ad_fee')
+    ).values('total_achieved')
+
+    return Coalesce(
+        Subquery(totals, output_field=DecimalField(max_digits=14, decimal_places=2)),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def with_progress(targets):
+    """
+    Annotate a Target queryset with progress_amount, computed per row in the database.
+    Closed months read the frozen snapshot; only open months sum their contracts.
+    """
+    return targets.annotate(
+        progress_amount=Coalesce(
+            F('progress_snapshot__achieved_amount'),
+            achieved_amount_subquery(),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+    )
+
+
+def set_progress_percentage(targets):
+    """Attach progress_percentage to each (already annotated) target"""
+    for target in targets:
+        if target.progress_amount > 0 and target.target_amount > 0:
+            target.progress_percentage = (float(target.progress_amount) / float(target.target_amount)) * 100
+        else:
+            target.progress_percentage = 0
+    return targets
@@ -1,3 +1,49 @@
+import datetime
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import CustomUser
+from targets.models import RentalContract, Target
+from targets.target_helpers.closing import close_month
+
+
+class CloseMonthTests(TestCase):
+    def setUp(self):
+        self.agent = CustomUser.objects.create_superuser(email='agent@fishtail.jp', password='x')
+
+    def make_target(self, amount, year=2025, month=1):
+        return Target.objects.create(
+            target_to=self.agent, assigned_by=self.agent, target_amount=amount, target_year=year, target_month=month,
+        )
+
+    def add_contract(self, target, agent_fee, ad_fee=Decimal('0')):
+        RentalContract.objects.create(
+            target_to=target, customer_name='Asha', customer_number='09012345678', building_address='-',
+            contract_date=datetime.date(target.target_year, target.target_month, 10), agent_fee=agent_fee, ad_fee=ad_fee,
+            support_phone='0312345678', contract_type=RentalContract.CONTRACT_TYPE_CHOICES[0][0],
+            cancellation_notice_period='-', cancellation_period='-', cancellation_charge='-', deposit_fee='-',
+            emergency_contact_person='-', emergency_phone='0312345678', renew_fee='-', living_num_people=1,
+            rent_payment_date='-', management_company_name='-', management_company_phone_number='0312345678',
+        )
+
+    def test_snapshot_freezes_progress(self):
+        target = self.make_target(Decimal('100000'))
+        self.add_contract(target, Decimal('60000'), Decimal('20000'))
+
+        # save() already flagged the past month overdue, so the sweep has nothing to update
+        self.assertEqual(close_month(2025, 1), (0, 0, 1))
+        target.refresh_from_db()
+        self.assertEqual(target.status, 'overdue')
+        self.assertEqual(target.progress_snapshot.achieved_amount, Decimal('80000'))
+        self.assertEqual(target.progress_snapshot.progress_percentage, Decimal('80.00'))
+
+    def test_large_overachievement_is_stored(self):
+        # Far beyond the original max_digits=7, which aborted the whole month close on PostgreSQL
+        target = self.make_target(Decimal('0.01'))
+        self.add_contract(target, Decimal('999999999.99'), Decimal('999999999.99'))
+
+        self.assertEqual(close_month(2025, 1), (1, 0, 1))
+        target.refresh_from_db()
+        self.assertEqual(target.status, 'completed')
+        self.assertEqual(target.progress_snapshot.progress_percentage, Decimal('19999999999800.00'))
@@ -7,9 +7,16 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.http import HttpResponse
 from django.db.models import F
+from backend.conditional import conditional_page, merge_states, rows_state
+from backend.db_routing import replica_reads
 from .models import Target, RentalContract
 from .forms import TargetForm, TargetAssignmentForm, RentalContractForm
+from .target_helpers.progress import with_progress, set_progress_percentage
+from .target_helpers.profile_stats import (
+    get_current_target, get_profile_stats, get_achievements_by_period, get_period_totals
+)
 import datetime
+import functools
 from decimal import Decimal
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -63,35 +70,14 @@ def target_management(request):
     if status_filter and status_filter.strip():
         targets = targets.filter(status=status_filter)
     
-    # Pagination
-    paginator = Paginator(targets, 20)
+    # Pagination - progress is a correlated subquery, so only the visible page's
+    # contracts are summed instead of every contract in history.
+    # The page and statistics are memoized callables, which templates call on first use:
+    # they sit in versioned_cache fragments, so the queries only run when one is re-rendered.
+    paginator = Paginator(with_progress(targets), 20)
     page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Get all achievements (rental contracts) for progress calculation
-    all_achievements = RentalContract.objects.values(
-        'target_to__target_to', 'target_to__target_year', 'target_to__target_month'
-    ).annotate(
-        total_achieved=Sum('agent_fee') + Sum('ad_fee')
-    )
-    
-    # Create a dictionary for easier lookup by user, year, and month
-    achievements_by_user_period = {}
-    for achievement in all_achievements:
-        key = (achievement['target_to__target_to'], achievement['target_to__target_year'], achievement['target_to__target_month'])
-        achievements_by_user_period[key] = achievement['total_achieved']
-    
-    # Add progress data to each target for easier template access
-    for target in page_obj:
-        key = (target.target_to.id, target.target_year, target.target_month)
-        target.progress_amount = achievements_by_user_period.get(key, 0)
-        if target.progress_amount > 0:
-            # Convert Decimal to float for calculations
-            progress_amount = float(target.progress_amount)
-            target_amount = float(target.target_amount)
-            target.progress_percentage = (progress_amount / target_amount) * 100
-        else:
-            target.progress_percentage = 0
+    # Add progress percentage to each target for easier template access
+    page_obj = functools.cache(lambda: set_progress_percentage(paginator.get_page(page_number)))
     
     # Get filter options (exclude superusers from user filter)
     users = User.objects.filter(is_active=True, is_superuser=False).order_by('email')
@@ -106,20 +92,23 @@ def target_management(request):
     current_month_name = dict(months)[current_month]
     
     # Calculate statistics for the filtered targets
-    total_targets = targets.count()
-    completed_targets = targets.filter(status='completed').count()
-    active_targets = targets.filter(status='active').count()
-    overdue_targets = targets.filter(status='overdue').count()
+    total_targets = functools.cache(targets.count)
+    completed_targets = functools.cache(targets.filter(status='completed').count)
+    active_targets = functools.cache(targets.filter(status='active').count)
+    overdue_targets = functools.cache(targets.filter(status='overdue').count)
     
     # Calculate overall achievement percentage
-    overall_achievement_percentage = 0
-    if total_targets > 0:
-        # Calculate total target amount and total achieved amount
-        total_target_amount = sum(float(target.target_amount) for target in targets)
-        total_achieved_amount = sum(float(target.progress_amount) for target in page_obj)
-        
-        if total_target_amount > 0:
-            overall_achievement_percentage = (total_achieved_amount / total_target_amount) * 100
+    @functools.cache
+    def achievement_percentage():
+        overall_achievement_percentage = 0
+        if total_targets() > 0:
+            # Calculate total target amount and total achieved amount
+            total_target_amount = float(targets.aggregate(total=Sum('target_amount'))['total'] or 0)
+            total_achieved_amount = sum(float(target.progress_amount) for target in page_obj())
+            
+            if total_target_amount > 0:
+                overall_achievement_percentage = (total_achieved_amount / total_target_amount) * 100
+        return round(overall_achievement_percentage, 1)
     
     context = {
         'page_obj': page_obj,
@@ -133,8 +122,7 @@ def target_management(request):
         'completed_targets': completed_targets,
         'active_targets': active_targets,
         'overdue_targets': overdue_targets,
-        'overall_achievement_percentage': round(overall_achievement_percentage, 1),
-        'achievements_by_user_period': achievements_by_user_period,
+        'overall_achievement_percentage': achievement_percentage,
         'selected_month': int(month_filter) if month_filter and month_filter.strip() else None,
         'selected_year': int(year_filter) if year_filter and year_filter.strip() else None,
         'selected_user': int(user_filter) if user_filter and user_filter.strip() else None,
@@ -146,6 +134,7 @@ def target_management(request):
 
 @login_required
 @user_passes_test(is_superuser)
+@replica_reads
 def export_targets_excel(request):
     """Export targets data to Excel file with progress information"""
     
@@ -182,29 +171,9 @@ def export_targets_excel(request):
     if status_filter and status_filter.strip():
         targets = targets.filter(status=status_filter)
     
-    # Get all achievements for progress calculation
-    all_achievements = RentalContract.objects.values(
-        'target_to__target_to', 'target_to__target_year', 'target_to__target_month'
-    ).annotate(
-        total_achieved=Sum('agent_fee') + Sum('ad_fee')
-    )
-    
-    # Create a dictionary for easier lookup
-    achievements_by_user_period = {}
-    for achievement in all_achievements:
-        key = (achievement['target_to__target_to'], achievement['target_to__target_year'], achievement['target_to__target_month'])
-        achievements_by_user_period[key] = achievement['total_achieved']
-    
-    # Add progress data to each target
-    for target in targets:
-        key = (target.target_to.id, target.target_year, target.target_month)
-        target.progress_amount = achievements_by_user_period.get(key, 0)
-        if target.progress_amount > 0:
-            progress_amount = float(target.progress_amount)
-            target_amount = float(target.target_amount)
-            target.progress_percentage = (progress_amount / target_amount) * 100
-        else:
-            target.progress_percentage = 0
+    # Add progress data to each target, summing only the exported targets' contracts
+    targets = with_progress(targets)
+    set_progress_percentage(targets)
     
     # Create Excel workbook
     wb = Workbook()
@@ -473,42 +442,17 @@ def user_profile(request):
         period_order=F('target_year') * 100 + F('target_month')
     ).order_by('-period_order')
     
-    # Get all achievements (rental contracts) for this user
-    user_achievements = RentalContract.objects.filter(
-        target_to__target_to=user
-    ).values('target_to__target_year', 'target_to__target_month').annotate(
-        total_achieved=Sum('agent_fee') + Sum('ad_fee')
-    )
-    
-    # Create a list for easier template iteration
-    achievements_by_period = []
-    for achievement in user_achievements:
-        achievements_by_period.append({
-            'year': achievement['target_to__target_year'],
-            'month': achievement['target_to__target_month'],
-            'total_achieved': achievement['total_achieved']
-        })
+    # Get achievements per target period from one grouped query
+    achievements_by_period = get_achievements_by_period(user_targets)
     
     # Get current month target
-    current_target = user_targets.filter(
-        target_month=today.month,
-        target_year=today.year
-    ).first()
+    current_target = get_current_target(user, today)
     
     # Check if user can add achievements (only if they have an active target)
     can_add_achievements = current_target and current_target.status == 'active'
     
-    # Get current month achievements (rental contracts for current month targets)
-    current_month_achievements = RentalContract.objects.filter(
-        target_to__target_to=user,
-        target_to__target_month=today.month,
-        target_to__target_year=today.year
-    ).order_by('-created_at')
-    
-    # Calculate current month achievement total
-    current_month_achievement_total = sum(
-        achievement.agent_fee + achievement.ad_fee for achievement in current_month_achievements
-    )
+    # All profile counters, including current month contract totals, in one aggregate
+    stats = get_profile_stats(user, today)
     
     # Filter targets based on search parameters
     month_filter = request.GET.get('month')
@@ -532,22 +476,6 @@ def user_profile(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Calculate statistics for filtered results
-    total_targets = user_targets.count()
-    completed_targets = user_targets.filter(status='completed').count()
-    
-    completion_rate = 0
-    if total_targets > 0:
-        completion_rate = (completed_targets / total_targets) * 100
-    
-    # Get active and overdue counts for current month
-    current_month_targets = user_targets.filter(
-        target_month=today.month,
-        target_year=today.year
-    )
-    active_targets = current_month_targets.filter(status='active').count()
-    overdue_targets = current_month_targets.filter(status='overdue').count()
-    
     # Years and months for filter dropdown
     years = range(today.year - 2, today.year + 2)
     months = [
@@ -563,15 +491,15 @@ def user_profile(request):
         'user': user,
         'current_target': current_target,
         'can_add_achievements': can_add_achievements,
-        'current_month_achievements': current_month_achievements,
-        'current_month_achievement_total': current_month_achievement_total,
+        'current_month_contracts': stats['current_month_contracts'],
+        'current_month_achievement_total': stats['current_month_achievement_total'],
         'achievements_by_period': achievements_by_period,
         'page_obj': page_obj,
-        'total_targets': total_targets,
-        'completed_targets': completed_targets,
-        'active_targets': active_targets,
-        'overdue_targets': overdue_targets,
-        'completion_rate': completion_rate,
+        'total_targets': stats['total_targets'],
+        'completed_targets': stats['completed_targets'],
+        'active_targets': stats['active_targets'],
+        'overdue_targets': stats['overdue_targets'],
+        'completion_rate': stats['completion_rate'],
         'years': years,
         'months': months,
         'current_month': today.month,
@@ -606,9 +534,7 @@ def achievement_details(request, year, month):
     month_name = month_names[month - 1]
     
     # Calculate fee totals for the selected period
-    total_agent_fee = sum((achievement.agent_fee for achievement in achievements), Decimal('0'))
-    total_ad_fee = sum((achievement.ad_fee for achievement in achievements), Decimal('0'))
-    total_amount = total_agent_fee + total_ad_fee
+    totals = get_period_totals(user, year, month)
     
     context = {
         'user': user,
@@ -616,9 +542,9 @@ def achievement_details(request, year, month):
         'year': year,
         'month': month,
         'month_name': month_name,
-        'total_agent_fee': total_agent_fee,
-        'total_ad_fee': total_ad_fee,
-        'total_amount': total_amount,
+        'total_agent_fee': totals['total_agent_fee'],
+        'total_ad_fee': totals['total_ad_fee'],
+        'total_amount': totals['total_amount'],
     }
     
     return render(request, 'targets/achievement_details.html', context)
@@ -766,6 +692,7 @@ def target_achievements(request, target_id):
 
 
 @login_required
+@replica_reads
 def export_contracts_excel(request):
     """Export contracts to Excel file"""
     
@@ -898,7 +825,17 @@ def export_contracts_excel(request):
     return response
 
 
+def contracts_list_state(request):
+    # Any contract change (including ones outside the current filter) refreshes the page;
+    # the year dropdown is built from all contracts, the "Created By" one from the active users
+    return merge_states(
+        rows_state(RentalContract.objects.all()),
+        rows_state(User.objects.filter(is_active=True, is_superuser=False)),
+    )
+
+
 @login_required
+@conditional_page(contracts_list_state)
 def contracts_list(request):
     """Display all rental contracts with filtering options"""
     
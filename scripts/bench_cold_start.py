@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Measure backend cold start: time from launching the container command until
+the first HTTP response.
+
+Compares the previous production boot (makemigrations + migrate + collectstatic
+before gunicorn) with the release/boot split, where the web service only starts
+gunicorn. Runs locally against a throwaway SQLite database that is migrated up
+front, i.e. the common case of restarting with no pending migrations. Pass
+--database-url to use an existing, already migrated database instead.
+
+    python scripts/bench_cold_start.py --runs 5
+    python scripts/bench_cold_start.py --mode boot --env GUNICORN_PRELOAD=False
+"""
+import argparse
+import http.client
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+GUNICORN = "gunicorn backend.wsgi:application -c gunicorn.conf.py --access-logfile /dev/null"
+MODES = {
+    # --dry-run so the benchmark never writes migration files into the tree
+    'legacy': (
+        "python manage.py makemigrations --dry-run && python manage.py migrate && "
+        "python manage.py collectstatic --noinput && " + GUNICORN
+    ),
+    'boot': GUNICORN,
+}
+
+
+def wait_until_up(port, path, process, timeout):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode} before answering")
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+        try:
+            # Any HTTP status (redirect to HTTPS/login included) means Django is serving
+            connection.request('GET', path)
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.05)
+        finally:
+            connection.close()
+    raise RuntimeError(f"no response on port {port} within {timeout}s")
+
+
+def port_in_use(port):
+    with socket.socket() as sock:
+        return sock.connect_ex(('127.0.0.1', port)) == 0
+
+
+def cold_start(command, env, port, path, timeout):
+    if port_in_use(port):
+        raise RuntimeError(f"port {port} is already in use; stop the old server or pass --port")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, shell=True, cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+    try:
+        wait_until_up(port, path, process, timeout)
+        return time.perf_counter() - started
+    finally:
+        # Kill the whole group: the shell may exit before gunicorn has released the port
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+        while port_in_use(port):
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=sorted(MODES), action='append', help="default: all modes")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--path', default='/accounts/login/')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--database-url', help="already migrated database (default: fresh temporary SQLite)")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help="extra environment for the server")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='cold-start-')
+    env = dict(
+        os.environ,
+        DJANGO_DEBUG='False',
+        DJANGO_SECRET_KEY='cold-start-benchmark',
+        DJANGO_ALLOWED_HOSTS='127.0.0.1',
+        DATABASE_URL=args.database_url or f"sqlite:///{os.path.join(workdir, 'db.sqlite3')}",
+        GUNICORN_BIND=f"127.0.0.1:{args.port}",
+    )
+    env.update(item.split('=', 1) for item in args.env)
+    try:
+        # Bring the database and STATIC_ROOT up to date once, as a release would
+        setup = "python manage.py collectstatic --noinput -v 0"
+        if not args.database_url:
+            setup = "python manage.py migrate --noinput -v 0 && " + setup
+        subprocess.run(setup, shell=True, cwd=BACKEND_DIR, env=env, check=True)
+        for mode in args.mode or sorted(MODES):
+            samples = [cold_start(MODES[mode], env, args.port, args.path, args.timeout) for _ in range(args.runs)]
+            print(
+                f"{mode:<8} median {statistics.median(samples):6.2f}s  "
+                f"min {min(samples):6.2f}s  max {max(samples):6.2f}s  ({args.runs} runs)"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Simple HTTP latency benchmark (standard library only).
+
+Fires REQUESTS requests at each URL with CONCURRENCY threads and prints
+p50/p95/p99 latency and throughput. Run it before and after a settings
+change (e.g. DJANGO_DB_POOL_MODE=none vs persistent) and compare.
+
+    python scripts/bench_http.py http://localhost:8000/accounts/login/ -n 500 -c 3
+    python scripts/bench_http.py http://localhost:8000/targets/profile/ --cookie "sessionid=..."
+"""
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch(url, cookie, timeout):
+    request = urllib.request.Request(url)
+    if cookie:
+        request.add_header('Cookie', cookie)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, TimeoutError):
+        status = None
+    return time.perf_counter() - started, status
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(url, requests, concurrency, cookie, timeout, warmup):
+    for _ in range(warmup):
+        fetch(url, cookie, timeout)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, cookie, timeout), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for latency, status in results if status and status < 500]
+    errors = len(results) - len(latencies)
+    return {
+        'url': url,
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'rps': len(results) / elapsed if elapsed else 0,
+        'p50': percentile(latencies, 50) if latencies else 0,
+        'p95': percentile(latencies, 95) if latencies else 0,
+        'p99': percentile(latencies, 99) if latencies else 0,
+        'mean': statistics.mean(latencies) if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('-n', '--requests', type=int, default=200)
+    parser.add_argument('-c', '--concurrency', type=int, default=3)
+    parser.add_argument('--cookie', default='', help="Cookie header, e.g. 'sessionid=...'")
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--warmup', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'url':50} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for url in args.urls:
+        result = run(url, args.requests, args.concurrency, args.cookie, args.timeout, args.warmup)
+        print(f"{result['url'][:50]:50} {result['rps']:8.1f} {result['p50']:8.1f} "
+              f"{result['p95']:8.1f} {result['p99']:8.1f} {result['errors']:7d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Count django_session writes per request for the old and new session setup.
+
+Builds a throwaway SQLite test database, logs a regular user in and requests
+a page N times under each configuration, counting INSERT/UPDATE statements
+against django_session.
+
+    python scripts/bench_session_writes.py -n 100 --path /targets/profile/
+"""
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+os.environ['DJANGO_DEBUG'] = 'True'
+os.environ.pop('DATABASE_URL', None)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_databases, setup_test_environment  # noqa: E402
+
+CONFIGURATIONS = {
+    'before (db, save every request)': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'SESSION_SAVE_EVERY_REQUEST': True,
+        'SESSION_ACTIVITY_WRITE_INTERVAL': 0,
+    },
+    'after (cached_db, coarse activity)': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'SESSION_SAVE_EVERY_REQUEST': False,
+        'SESSION_ACTIVITY_WRITE_INTERVAL': 60,
+    },
+}
+
+
+def count_session_writes(path, requests, email):
+    from accounts.models import CustomUser
+
+    client = Client()
+    client.force_login(CustomUser.objects.get(email=email))
+    client.get(path)  # first request records last_activity
+
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(requests):
+            client.get(path)
+
+    return sum(
+        1 for query in queries.captured_queries
+        if 'django_session' in query['sql'] and query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--requests', type=int, default=100)
+    parser.add_argument('--path', default='/targets/profile/')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = ['*']
+    settings.DATABASES['default']['TEST'].update(MIGRATE=False)
+    setup_databases(verbosity=0, interactive=False)
+
+    from accounts.models import CustomUser
+    email = 'bench@fishtail.jp'
+    CustomUser.objects.create_user(email=email, password='bench-password')
+
+    print(f"{'configuration':40} {'writes':>7} {'per request':>12}")
+    for name, overrides in CONFIGURATIONS.items():
+        with override_settings(**overrides):
+            writes = count_session_writes(args.path, args.requests, email)
+        print(f"{name:40} {writes:7d} {writes / args.requests:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark transaction code allocation against a table of existing codes.
+
+Fills a throwaway SQLite database with EXISTING HostelExpense rows carrying
+legacy random 6-character codes, then compares:
+  - legacy: random code + .exists() check per code
+  - counter, one at a time: allocate_codes(model, 1) per code
+  - counter, bulk: allocate_codes(model, N) once
+
+    python scripts/bench_transaction_codes.py --existing 1000000 --codes 1000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+os.environ['DJANGO_DEBUG'] = 'True'
+os.environ.pop('DATABASE_URL', None)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_databases, setup_test_environment  # noqa: E402
+
+LEGACY_CHARS = string.ascii_uppercase + string.digits
+
+
+def legacy_generate(model):
+    while True:
+        code = ''.join(random.choices(LEGACY_CHARS, k=6))
+        if not model.objects.filter(transaction_code=code).exists():
+            return code
+
+
+def seed(model, existing):
+    import datetime
+    from decimal import Decimal
+
+    codes = set()
+    batch = []
+    today = datetime.date.today()
+    while len(codes) < existing:
+        code = ''.join(random.choices(LEGACY_CHARS, k=6))
+        if code in codes:
+            continue
+        codes.add(code)
+        batch.append(model(purchased_date=today, purchased_by='bench', memo='-', amount=Decimal('1'), transaction_code=code))
+        if len(batch) == 20000:
+            model.objects.bulk_create(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+
+
+def timed(label, codes, func):
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+    print(f"{label:32} {elapsed * 1000:10.1f} ms {elapsed * 1e6 / codes:10.1f} us/code {len(queries.captured_queries):8d} queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--existing', type=int, default=1000000)
+    parser.add_argument('--codes', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    settings.DATABASES['default']['TEST'].update(NAME=os.path.join(tempfile.mkdtemp(), 'codes.sqlite3'), MIGRATE=False)
+    setup_databases(verbosity=0, interactive=False)
+
+    from finance.models import HostelExpense
+    from finance.finance_helpers.transaction_codes import allocate_codes
+
+    started = time.perf_counter()
+    seed(HostelExpense, args.existing)
+    print(f"seeded {args.existing} legacy codes in {time.perf_counter() - started:.1f}s\n")
+
+    timed('legacy random + exists()', args.codes, lambda: [legacy_generate(HostelExpense) for _ in range(args.codes)])
+    timed('counter, one at a time', args.codes, lambda: [allocate_codes(HostelExpense, 1) for _ in range(args.codes)])
+    timed('counter, bulk', args.codes, lambda: allocate_codes(HostelExpense, args.codes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+#!/bin/sh
+# Compare gunicorn throughput for the sync and gthread worker classes.
+#
+# Starts the backend locally once per worker class and runs scripts/bench_http.py
+# against the given URL paths. Uses whatever database the environment points at
+# (SQLite when DJANGO_DEBUG=True and no DATABASE_URL is set).
+#
+#   DJANGO_DEBUG=True sh scripts/compare_workers.sh /accounts/login/ /finance/revenues/
+#
+# Pass COOKIE="sessionid=..." to benchmark pages behind login.
+set -e
+
+ROOT=$(cd "$(dirname "$0")/.." && pwd)
+PORT=${PORT:-8765}
+REQUESTS=${REQUESTS:-300}
+CONCURRENCY=${CONCURRENCY:-12}
+PATHS=${*:-/accounts/login/}
+
+for WORKER_CLASS in sync gthread; do
+    echo "== $WORKER_CLASS (workers=${GUNICORN_WORKERS:-3}) =="
+    (cd "$ROOT/backend" && GUNICORN_WORKER_CLASS=$WORKER_CLASS GUNICORN_BIND=127.0.0.1:$PORT \
+        gunicorn backend.wsgi:application -c gunicorn.conf.py --access-logfile /dev/null --error-logfile /dev/null) &
+    PID=$!
+    sleep 3
+
+    URLS=""
+    for P in $PATHS; do URLS="$URLS http://127.0.0.1:$PORT$P"; done
+    python "$ROOT/scripts/bench_http.py" $URLS -n "$REQUESTS" -c "$CONCURRENCY" --cookie "${COOKIE:-}" || true
+
+    kill $PID
+    wait $PID 2>/dev/null || true
+done